@@ -9,6 +9,14 @@ from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# "segment" decodes each diarization turn; "full" decodes the recording once
+# and assigns the words to speakers afterwards
+AsrMode = Literal["segment", "full"]
+
+# How RAG indexes store vectors: exact float32, half precision, 8-bit scalar
+# quantization, or product quantization
+RagIndexType = Literal["flat", "fp16", "sq8", "pq"]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -45,19 +53,190 @@ class Settings(BaseSettings):
         "sentence-transformers/all-MiniLM-L6-v2", description="Embedding model for RAG"
     )
 
+    # Diarization Settings
+    diarization_mode: Literal["full", "windowed"] = Field(
+        "full", description="Diarize in one pass, or in overlapping windows for long recordings"
+    )
+    diarization_window: float = Field(
+        600.0, description="Window length in seconds for windowed diarization", gt=0
+    )
+    diarization_window_overlap: float = Field(
+        30.0, description="Overlap in seconds between diarization windows", ge=0
+    )
+    diarization_stitch_threshold: float = Field(
+        0.5,
+        description="Cosine similarity needed to join speakers across diarization windows",
+        ge=-1,
+        le=1,
+    )
+
+    # ASR Settings
+    asr_mode: AsrMode = Field("segment", description="ASR strategy: per-segment or full-audio")
+    asr_backend: Literal["pytorch", "pytorch-int8", "onnxruntime"] = Field(
+        "pytorch", description="ASR inference backend"
+    )
+    asr_batch_size: int = Field(8, description="Segments per batched Whisper forward pass", ge=1)
+    asr_pack_segments: bool = Field(
+        True, description="Pack short consecutive turns into shared Whisper windows"
+    )
+    asr_pack_max_window: float = Field(
+        30.0, description="Maximum seconds of audio per packed window", gt=0, le=30.0
+    )
+    asr_pack_max_gap: float = Field(
+        1.0, description="Maximum gap in seconds between turns packed together", ge=0
+    )
+    asr_pack_across_speakers: bool = Field(
+        False, description="Also pack turns from different speakers into one window"
+    )
+    asr_language_pinning: Literal["off", "meeting", "speaker"] = Field(
+        "off",
+        description="Detect the language on a sample, then force it per meeting or per speaker",
+    )
+    asr_language_sample_size: int = Field(
+        8, description="Windows sampled per group for language identification", ge=1
+    )
+    asr_language_min_probability: float = Field(
+        0.8, description="Minimum language probability needed to pin a language", ge=0, le=1
+    )
+    asr_cache_enabled: bool = Field(
+        True, description="Cache transcriptions on disk so reprocessing skips ASR"
+    )
+    asr_cache_max_mb: int = Field(512, description="Maximum ASR cache size in MB", ge=1)
+    asr_workers: int = Field(1, description="ASR worker processes (1 = decode in-process)", ge=1)
+    asr_worker_threads: int | None = Field(
+        None, description="Torch threads per ASR worker (default: CPU cores / workers)", ge=1
+    )
+    asr_worker_start_method: Literal["spawn", "fork", "forkserver"] = Field(
+        "spawn", description="How ASR workers start; 'fork' shares loaded weights copy-on-write"
+    )
+
+    # VAD Settings
+    vad_enabled: bool = Field(True, description="Trim segments to voiced regions before ASR")
+    vad_margin_db: float = Field(
+        12.0, description="Energy above the noise floor (dB) that counts as speech", ge=0
+    )
+    vad_min_speech: float = Field(0.25, description="Shortest voiced region kept (s)", ge=0)
+    vad_min_silence: float = Field(0.5, description="Shortest pause that splits a segment (s)")
+    vad_padding: float = Field(0.15, description="Context kept around voiced regions (s)", ge=0)
+
+    # Pipeline Settings
+    pipeline_streaming: bool = Field(
+        False, description="Overlap diarization, ASR and embedding (segment ASR mode only)"
+    )
+    pipeline_queue_size: int = Field(
+        256, description="Maximum items buffered between streaming pipeline stages", ge=1
+    )
+    pipeline_asr_seconds: float = Field(
+        120.0,
+        description="Minimum seconds of speech per ASR batch when streaming or checkpointing",
+        gt=0,
+    )
+    pipeline_checkpointing: bool = Field(
+        True, description="Save each stage's output so reruns of a meeting ID resume"
+    )
+
+    # Summary Settings
+    summary_hierarchical: bool = Field(
+        True, description="Summarize long meetings in windows, then merge the window notes"
+    )
+    summary_window_tokens: int = Field(
+        6000, description="Approximate transcript tokens per summary window", ge=500
+    )
+    summary_window_gap: float = Field(
+        20.0, description="Pause (seconds) treated as a topic boundary between windows", ge=0
+    )
+    summary_concurrency: int = Field(
+        4, description="Maximum concurrent LLM calls per meeting summary", ge=1
+    )
+
+    # Job Queue Settings
+    job_concurrency: int = Field(1, description="Meetings processed at the same time", ge=1)
+    job_max_queued: int = Field(
+        10, description="Maximum uploads waiting to be processed before rejecting new ones", ge=1
+    )
+    job_retention_seconds: float = Field(
+        86400.0, description="Seconds a finished job stays available for polling", ge=0
+    )
+    job_max_finished: int = Field(
+        1000, description="Finished jobs kept in memory; the oldest are forgotten first", ge=0
+    )
+
+    # Executor Settings (threads per blocking stage)
+    executor_diarization_threads: int = Field(
+        1, description="Threads for audio decoding and diarization", ge=1
+    )
+    executor_asr_threads: int = Field(1, description="Threads for ASR calls", ge=1)
+    executor_embedding_threads: int = Field(
+        1, description="Threads for chunk embedding and index building", ge=1
+    )
+    executor_query_threads: int = Field(
+        2, description="Threads for Q&A retrieval and loading saved meetings", ge=1
+    )
+
+    # Startup Settings
+    model_warmup: bool = Field(
+        True,
+        description="Load and warm up models in the background at startup instead of on first use",
+    )
+
+    # Search Settings (global index across meetings)
+    search_enabled: bool = Field(
+        True, description="Index every saved meeting for cross-meeting search"
+    )
+    search_hnsw_threshold: int = Field(
+        20000, description="Chunks at which the global index switches from exact to HNSW", ge=1
+    )
+    search_hnsw_m: int = Field(32, description="HNSW graph neighbours per node", ge=4)
+    search_hnsw_ef_search: int = Field(
+        64, description="HNSW candidates explored per query (recall vs latency)", ge=1
+    )
+
     # Storage
     upload_dir: Path = Field(Path("./data/uploads"), description="Directory for uploaded files")
     storage_dir: Path = Field(
         Path("./data/storage"), description="Directory for processed data"
     )
+    storage_cached_indexes: int = Field(
+        32, description="RAG indexes kept in memory (least recently used are reloaded)", ge=1
+    )
 
     # Server
     host: str = Field("0.0.0.0", description="Server host")
     port: int = Field(8000, description="Server port")
 
     # RAG Settings
-    rag_chunk_max_tokens: int = Field(500, description="Max tokens per RAG chunk")
+    rag_chunk_max_tokens: int = Field(
+        500,
+        description="Max tokens per retrieval window (capped at the embedding model's input)",
+        ge=1,
+    )
+    rag_chunk_overlap_tokens: int = Field(
+        64, description="Tokens of trailing turns repeated in the next retrieval window", ge=0
+    )
+    rag_chunk_min_tokens: int = Field(
+        3, description="Turns shorter than this are not embedded on their own", ge=0
+    )
     rag_top_k: int = Field(5, description="Number of chunks to retrieve for RAG")
+    rag_index_type: RagIndexType = Field(
+        "flat", description="Vector storage of RAG and search indexes (flat, fp16, sq8, pq)"
+    )
+    rag_pq_bytes: int = Field(
+        48, description="Bytes per vector with product quantization (rag_index_type=pq)", ge=1
+    )
+    rag_rerank_factor: int = Field(
+        4,
+        description="Candidates per result re-ranked exactly with compressed indexes (1 disables)",
+        ge=1,
+    )
+    query_cache_size: int = Field(
+        1024, description="Question embeddings kept in an LRU cache (0 disables)", ge=0
+    )
+    query_batch_wait_ms: float = Field(
+        5.0, description="How long to collect questions into one encoder call", ge=0
+    )
+    query_batch_max_size: int = Field(
+        32, description="Questions per encoder call; a full batch is sent immediately", ge=1
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -3,14 +3,22 @@ FastAPI application entry point.
 Main application setup with routes and middleware.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import settings
-from app.routes import meeting
+from app.models.schemas import ReadinessResponse
+from app.routes import jobs, meeting, search
+from app.services.executors import shutdown_executors
+from app.services.jobs import get_job_queue
+from app.services.metrics import render_metrics
+from app.services.search import sync_search_index
+from app.services.warmup import get_model_warmup
 
 # Configure logging
 logging.basicConfig(
@@ -34,10 +42,26 @@ async def lifespan(app: FastAPI):
     logger.info(f"Storage directory: {settings.storage_dir}")
     logger.info(f"Device: {settings.device}")
 
+    job_queue = get_job_queue()
+    job_queue.start()
+
+    # Load models in the background; /ready reports when they are loaded
+    model_warmup = get_model_warmup()
+    model_warmup.start()
+
+    # Add meetings saved while the server was down (or before search existed) to the search index
+    search_sync = asyncio.create_task(sync_search_index()) if settings.search_enabled else None
+
     yield
 
     # Shutdown
     logger.info("Shutting down Meeting Minutes API...")
+    await model_warmup.shutdown()
+    if search_sync is not None:
+        search_sync.cancel()
+        await asyncio.gather(search_sync, return_exceptions=True)
+    await job_queue.shutdown()
+    shutdown_executors()
 
 
 # Create FastAPI app
@@ -62,6 +86,8 @@ app.add_middleware(
 
 # Include routers
 app.include_router(meeting.router)
+app.include_router(jobs.router)
+app.include_router(search.router)
 
 
 @app.get("/")
@@ -76,6 +102,11 @@ async def root():
             "qa": "/meetings/qa/{meeting_id}",
             "get_meeting": "/meetings/{meeting_id}",
             "list_meetings": "/meetings/",
+            "get_job": "/jobs/{job_id}",
+            "list_jobs": "/jobs/",
+            "search": "/search",
+            "ready": "/ready",
+            "metrics": "/metrics",
         },
     }
 
@@ -86,6 +117,25 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check():
+    """
+    Readiness endpoint.
+    Returns 503 until every model is loaded and warmed up, with per-model state.
+    """
+    readiness = get_model_warmup().readiness()
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=readiness.model_dump(mode="json"))
+    return readiness
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Pipeline metrics in Prometheus text format."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -4,7 +4,7 @@ All data structures used across services and API endpoints.
 """
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -31,6 +31,9 @@ class TranscriptChunk(BaseModel):
     end_time: float = Field(..., description="End time in seconds")
     text: str = Field(..., description="Transcribed text")
     language: str | None = Field(None, description="Detected language code (e.g., 'zh', 'en')")
+    language_probability: float | None = Field(
+        None, description="Whisper language identification probability for `language`"
+    )
     confidence: float | None = Field(None, description="Transcription confidence score")
 
     def to_context_string(self) -> str:
@@ -101,11 +104,83 @@ class QAResponse(BaseModel):
     confidence: str | None = Field(None, description="Confidence level of the answer")
 
 
+class SearchRequest(BaseModel):
+    """Request for semantic search across all meetings."""
+
+    query: str = Field(..., description="Text to search for", min_length=1)
+    top_k: int = Field(10, description="Number of chunks to return", ge=1, le=100)
+    meeting_ids: list[str] | None = Field(
+        None, description="Only search these meetings (all meetings if omitted)"
+    )
+
+
+class SearchResult(BaseModel):
+    """A transcript chunk matching a search, with the meeting it came from."""
+
+    meeting_id: str = Field(..., description="Meeting the chunk belongs to")
+    chunk: TranscriptChunk = Field(..., description="Matching chunk with speaker and time")
+    distance: float = Field(..., description="L2 distance to the query (lower is closer)")
+
+
+class SearchResponse(BaseModel):
+    """Ranked chunks across meetings."""
+
+    query: str = Field(..., description="Original query")
+    results: list[SearchResult] = Field(default_factory=list, description="Closest first")
+    total_chunks: int = Field(..., description="Chunks in the searched index")
+
+
 class UploadResponse(BaseModel):
-    """Response after uploading and processing a meeting."""
+    """Response after uploading a meeting for processing."""
 
     meeting_id: str
     message: str
+    job_id: str | None = None
     transcript_preview: str | None = None
     summary: SummaryResponse | None = None
 
+
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+
+class JobStage(BaseModel):
+    """Progress of one pipeline stage within a processing job."""
+
+    name: str = Field(..., description="Stage name (e.g., diarization, transcription)")
+    status: Literal["pending", "running", "completed"] = Field("pending")
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+
+class JobInfo(BaseModel):
+    """State of a background meeting processing job."""
+
+    job_id: str = Field(..., description="Unique job identifier")
+    meeting_id: str = Field(..., description="Meeting the job will produce")
+    filename: str = Field(..., description="Original upload filename")
+    status: JobStatus = Field("queued", description="Job lifecycle state")
+    stages: list[JobStage] = Field(default_factory=list, description="Per-stage progress")
+    progress: float = Field(0.0, description="Fraction of stages completed (0-1)")
+    error: str | None = Field(None, description="Error message if the job failed")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+
+ModelStatus = Literal["lazy", "pending", "loading", "ready", "failed"]
+
+
+class ModelReadiness(BaseModel):
+    """Load state of one model warmed up at startup."""
+
+    name: str = Field(..., description="Model name (diarization, asr, embedding, llm)")
+    status: ModelStatus = Field("pending", description="Load state")
+    load_seconds: float | None = Field(None, description="Time to load and warm up the model")
+    error: str | None = Field(None, description="Error message if loading failed")
+
+
+class ReadinessResponse(BaseModel):
+    """Whether the API can process meetings without loading models first."""
+
+    ready: bool = Field(..., description="True when every model is loaded (or loading is lazy)")
+    models: list[ModelReadiness] = Field(default_factory=list, description="Per-model state")
@@ -0,0 +1,41 @@
+"""
+API routes for background processing jobs.
+"""
+
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models.schemas import JobInfo
+from app.services.jobs import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/", response_model=list[JobInfo])
+async def list_jobs(
+    include_finished: Annotated[
+        bool, Query(description="Also list completed and failed jobs")
+    ] = False,
+):
+    """
+    List queued and running processing jobs, oldest first.
+    """
+    return get_job_queue().list_jobs(include_finished=include_finished)
+
+
+@router.get("/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str):
+    """
+    Get the status and per-stage progress of a processing job.
+
+    When the job has completed, the meeting is available at
+    `/meetings/{meeting_id}`.
+    """
+    job = get_job_queue().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
@@ -2,38 +2,57 @@
 API routes for meeting upload and question answering.
 """
 
+import asyncio
 import logging
 import shutil
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 
-from app.config import settings
+from app.config import AsrMode, settings
 from app.models.schemas import QARequest, QAResponse, UploadResponse
-from app.services.pipeline import get_pipeline
+from app.services.executors import run_in_stage
+from app.services.jobs import QueueFullError, get_job_queue
+from app.services.pipeline import generate_meeting_id, get_pipeline
 from app.storage import get_storage
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
+QUEUE_FULL_DETAIL = "Processing queue is full, please retry later"
 
-@router.post("/upload", response_model=UploadResponse)
+
+@router.post("/upload", response_model=UploadResponse, status_code=202)
 async def upload_meeting(
     file: Annotated[UploadFile, File(description="Meeting audio file")],
+    asr_mode: Annotated[
+        AsrMode | None,
+        Query(description="ASR strategy: 'segment' (per speaker turn) or 'full' (single pass)"),
+    ] = None,
+    meeting_id: Annotated[
+        str | None,
+        Query(
+            pattern=r"^meeting_[0-9a-f]{12}$",
+            description="Resume an interrupted meeting from its checkpoint",
+        ),
+    ] = None,
 ):
     """
-    Upload and process a meeting audio file.
+    Upload a meeting audio file and queue it for processing.
+
+    The file is saved and a background job then:
+    1. Runs diarization to identify speakers
+    2. Transcribes each segment with language detection (Cantonese/English)
+    3. Builds a RAG index over the transcript
+    4. Generates an AI summary with action items and key decisions
 
-    This endpoint:
-    1. Saves the uploaded audio file
-    2. Runs diarization to identify speakers
-    3. Transcribes each segment with language detection (Cantonese/English)
-    4. Builds a RAG index over the transcript
-    5. Generates an AI summary with action items and key decisions
+    Returns 202 with the meeting ID and a job ID; poll `/jobs/{job_id}` for
+    progress. Returns 503 when the processing queue is full.
 
-    Returns the meeting ID, transcript preview, and summary.
+    Passing the `meeting_id` of an interrupted run together with the same
+    recording resumes from its last completed stage.
     """
     logger.info(f"Received upload: {file.filename}")
 
@@ -41,9 +60,21 @@ async def upload_meeting(
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename is required")
 
-    # Save uploaded file
+    # Reject before saving so a full queue doesn't cost a large write
+    job_queue = get_job_queue()
+    if job_queue.is_full():
+        raise HTTPException(status_code=503, detail=QUEUE_FULL_DETAIL)
+
+    # Two runs of one meeting would write to the same checkpoint
+    if meeting_id and any(job.meeting_id == meeting_id for job in job_queue.list_jobs()):
+        raise HTTPException(
+            status_code=409, detail=f"Meeting {meeting_id} is already being processed"
+        )
+
+    # Save uploaded file; the meeting ID prefix keeps queued uploads from colliding
+    meeting_id = meeting_id or generate_meeting_id()
     try:
-        upload_path = settings.upload_dir / file.filename
+        upload_path = settings.upload_dir / f"{meeting_id}_{Path(file.filename).name}"
         with open(upload_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
@@ -53,36 +84,18 @@ async def upload_meeting(
         logger.error(f"Failed to save upload: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
-    # Process the meeting
+    # Queue the meeting for processing
     try:
-        pipeline = get_pipeline()
-        result, rag_index = await pipeline.process_meeting_audio(upload_path)
-
-        # Store in memory
-        storage = get_storage()
-        storage.store_meeting(result.meeting_id, result, rag_index)
-
-        # Also save to disk
-        pipeline.save_meeting_data(result.meeting_id, result, rag_index)
-
-        # Generate preview (first 3 chunks)
-        preview_chunks = result.transcript.chunks[:3]
-        preview = "\n".join(chunk.to_context_string() for chunk in preview_chunks)
-        if len(result.transcript.chunks) > 3:
-            preview += f"\n... ({len(result.transcript.chunks) - 3} more chunks)"
-
-        return UploadResponse(
-            meeting_id=result.meeting_id,
-            message="Meeting processed successfully",
-            transcript_preview=preview,
-            summary=result.summary,
-        )
+        job = job_queue.submit(upload_path, file.filename, meeting_id, asr_mode=asr_mode)
+    except QueueFullError:
+        upload_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=503, detail=QUEUE_FULL_DETAIL)
 
-    except Exception as e:
-        logger.error(f"Failed to process meeting: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500, detail=f"Failed to process meeting: {str(e)}"
-        )
+    return UploadResponse(
+        meeting_id=meeting_id,
+        job_id=job.job_id,
+        message="Meeting queued for processing",
+    )
 
 
 @router.post("/qa/{meeting_id}", response_model=QAResponse)
@@ -108,8 +121,10 @@ async def ask_question(meeting_id: str, request: QARequest):
     # If not in memory, try loading from disk
     if meeting is None or rag_index is None:
         try:
-            pipeline = get_pipeline()
-            meeting, rag_index = pipeline.load_meeting_data(meeting_id)
+            pipeline = await asyncio.to_thread(get_pipeline)
+            meeting, rag_index = await run_in_stage(
+                "query", pipeline.load_meeting_data, meeting_id
+            )
             # Store in memory for future queries
             storage.store_meeting(meeting_id, meeting, rag_index)
         except FileNotFoundError:
@@ -120,7 +135,7 @@ async def ask_question(meeting_id: str, request: QARequest):
 
     # Answer the question
     try:
-        pipeline = get_pipeline()
+        pipeline = await asyncio.to_thread(get_pipeline)
         top_k = request.top_k or settings.rag_top_k
 
         answer, context_chunks = await pipeline.answer_question(
@@ -149,8 +164,10 @@ async def get_meeting(meeting_id: str):
     if meeting is None:
         # Try loading from disk
         try:
-            pipeline = get_pipeline()
-            meeting, rag_index = pipeline.load_meeting_data(meeting_id)
+            pipeline = await asyncio.to_thread(get_pipeline)
+            meeting, rag_index = await run_in_stage(
+                "query", pipeline.load_meeting_data, meeting_id
+            )
             storage.store_meeting(meeting_id, meeting, rag_index)
         except FileNotFoundError:
             raise HTTPException(status_code=404, detail=f"Meeting {meeting_id} not found")
@@ -175,9 +192,11 @@ async def list_meetings():
     disk_meetings = []
     if settings.storage_dir.exists():
         for meeting_dir in settings.storage_dir.iterdir():
-            if meeting_dir.is_dir() and meeting_dir.name.startswith("meeting_"):
-                if meeting_dir.name not in meeting_ids:
-                    disk_meetings.append(meeting_dir.name)
+            # Interrupted runs leave only a checkpoint behind until they finish
+            if not meeting_dir.name.startswith("meeting_"):
+                continue
+            if (meeting_dir / "transcript.json").exists() and meeting_dir.name not in meeting_ids:
+                disk_meetings.append(meeting_dir.name)
 
     all_meetings = meeting_ids + disk_meetings
 
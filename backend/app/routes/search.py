@@ -0,0 +1,48 @@
+"""
+API routes for semantic search across meetings.
+"""
+
+import asyncio
+import logging
+
+from fastapi import APIRouter, HTTPException
+
+from app.config import settings
+from app.models.schemas import SearchRequest, SearchResponse
+from app.services.executors import run_in_stage
+from app.services.query_encoder import get_query_encoder
+from app.services.search import get_search_index
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.post("", response_model=SearchResponse)
+async def search_meetings(request: SearchRequest):
+    """
+    Find the transcript chunks closest to a query across all saved meetings.
+
+    Results are ranked by embedding distance and carry the meeting ID,
+    speaker and time of each chunk. Pass `meeting_ids` to search only some
+    meetings (e.g. one quarter's).
+    """
+    if not settings.search_enabled:
+        raise HTTPException(status_code=404, detail="Cross-meeting search is disabled")
+
+    logger.info(f"Search across meetings: {request.query[:50]}")
+    try:
+        # Index loading blocks, so do it off the event loop
+        search_index = await asyncio.to_thread(get_search_index)
+
+        query_embedding = await get_query_encoder().encode(request.query)
+        results = await run_in_stage(
+            "query", search_index.search, query_embedding, request.top_k, request.meeting_ids
+        )
+    except Exception as e:
+        logger.error(f"Search failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+    return SearchResponse(
+        query=request.query, results=results, total_chunks=search_index.num_chunks
+    )
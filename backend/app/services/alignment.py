@@ -0,0 +1,92 @@
+"""
+Speaker alignment for full-audio transcription.
+Assigns timestamped words or phrases to diarization turns by overlap.
+"""
+
+import bisect
+import logging
+
+from app.models.schemas import SpeakerSegment
+
+logger = logging.getLogger(__name__)
+
+# Duration given to pieces whose end timestamp Whisper left open
+OPEN_END_DURATION = 0.5
+
+
+def align_to_speakers(
+    pieces: list[tuple[str, float, float | None]],
+    speaker_segments: list[SpeakerSegment],
+) -> list[tuple[int, str]]:
+    """
+    Group timestamped transcript pieces by the speaker turn they fall in.
+
+    Each piece goes to the turn it overlaps most; pieces that fall in a gap
+    between turns go to the nearest turn. Consecutive pieces assigned to the
+    same turn are joined into one text.
+
+    Args:
+        pieces: (text, start, end) tuples in time order
+        speaker_segments: Diarization segments sorted by start time
+
+    Returns:
+        List of (segment_index, text) tuples in time order
+    """
+    if not speaker_segments:
+        return []
+
+    starts = [segment.start_time for segment in speaker_segments]
+    max_duration = max(segment.duration for segment in speaker_segments)
+
+    groups: list[tuple[int, list[str]]] = []
+    for text, start, end in pieces:
+        if end is None or end <= start:
+            end = start + OPEN_END_DURATION
+
+        turn = _best_overlap(speaker_segments, starts, max_duration, start, end)
+        if turn is None:
+            turn = _nearest(speaker_segments, starts, start, end)
+
+        if groups and groups[-1][0] == turn:
+            groups[-1][1].append(text)
+        else:
+            groups.append((turn, [text]))
+
+    aligned = [(turn, "".join(parts).strip()) for turn, parts in groups]
+    aligned = [(turn, text) for turn, text in aligned if text]
+    logger.info(f"Aligned {len(pieces)} transcript pieces into {len(aligned)} speaker turns")
+    return aligned
+
+
+def _best_overlap(
+    segments: list[SpeakerSegment],
+    starts: list[float],
+    max_duration: float,
+    start: float,
+    end: float,
+) -> int | None:
+    """Index of the segment overlapping [start, end] the most, if any."""
+    best, best_overlap = None, 0.0
+    idx = bisect.bisect_left(starts, end) - 1
+
+    # Only segments starting within max_duration before the piece can reach it
+    while idx >= 0 and starts[idx] > start - max_duration:
+        segment = segments[idx]
+        overlap = min(end, segment.end_time) - max(start, segment.start_time)
+        if overlap > best_overlap:
+            best, best_overlap = idx, overlap
+        idx -= 1
+
+    return best
+
+
+def _nearest(segments: list[SpeakerSegment], starts: list[float], start: float, end: float) -> int:
+    """Index of the segment closest in time to [start, end]."""
+    idx = bisect.bisect_left(starts, start)
+    candidates = [i for i in (idx - 1, idx) if 0 <= i < len(segments)]
+
+    def distance(i: int) -> float:
+        segment = segments[i]
+        return max(segment.start_time - end, start - segment.end_time, 0.0)
+
+    return min(candidates, key=distance)
@@ -3,18 +3,28 @@ Automatic Speech Recognition (ASR) service using Whisper.
 Supports multi-language transcription with Cantonese and English code-switching.
 """
 
+import bisect
 import logging
+import threading
+from collections import Counter
 from pathlib import Path
+from typing import Callable
 
-import librosa
-import soundfile as sf
-import torch
-from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+import numpy as np
 
 from app.config import settings
+from app.models.schemas import SpeakerSegment
+from app.services.alignment import align_to_speakers
+from app.services.asr_backends import ASRBackend, get_asr_backend
+from app.services.audio import TARGET_SAMPLE_RATE, DecodedAudio
+from app.services.metrics import observe_asr
+from app.services.packing import PackedWindow
 
 logger = logging.getLogger(__name__)
 
+# Window length for chunked long-form decoding (Whisper's native input size)
+FULL_AUDIO_CHUNK_LENGTH = 30
+
 
 class ASRService:
     """
@@ -22,10 +32,18 @@ class ASRService:
     Handles Cantonese + English code-switching with automatic language detection.
     """
 
-    def __init__(self):
+    def __init__(self, backend: ASRBackend | None = None):
+        """
+        Initialize the ASR service.
+
+        Args:
+            backend: Inference backend (defaults to settings.asr_backend)
+        """
+        self.backend = backend or get_asr_backend()
         self.model = None
         self.processor = None
         self.pipe = None
+        self.torch_dtype = None
         self._initialized = False
 
     def initialize(self):
@@ -33,20 +51,15 @@ class ASRService:
         if self._initialized:
             return
 
-        logger.info(f"Loading ASR model: {settings.asr_model}")
+        logger.info(f"Loading ASR model: {settings.asr_model} ({self.backend.name} backend)")
         try:
+            from transformers import AutoProcessor, pipeline
+
             device = settings.torch_device
-            torch_dtype = torch.float16 if "cuda" in device else torch.float32
+            self.torch_dtype = self.backend.torch_dtype(device)
 
             # Load model and processor
-            self.model = AutoModelForSpeechSeq2Seq.from_pretrained(
-                settings.asr_model,
-                torch_dtype=torch_dtype,
-                low_cpu_mem_usage=True,
-                use_safetensors=True,
-                token=settings.huggingface_token,
-            )
-            self.model.to(device)
+            self.model = self.backend.load_model(settings.asr_model, device)
 
             self.processor = AutoProcessor.from_pretrained(
                 settings.asr_model, token=settings.huggingface_token
@@ -58,8 +71,8 @@ class ASRService:
                 model=self.model,
                 tokenizer=self.processor.tokenizer,
                 feature_extractor=self.processor.feature_extractor,
-                torch_dtype=torch_dtype,
-                device=device,
+                torch_dtype=self.torch_dtype,
+                device=self.model.device,
                 return_timestamps=True,
             )
 
@@ -69,47 +82,328 @@ class ASRService:
             logger.error(f"Failed to load ASR pipeline: {e}")
             raise
 
-    def _extract_audio_segment(
-        self, audio_path: str | Path, start: float, end: float, temp_dir: Path
-    ) -> Path:
+    def transcribe_audio(
+        self, samples: np.ndarray, sampling_rate: int = TARGET_SAMPLE_RATE
+    ) -> tuple[str, str]:
         """
-        Extract a time segment from an audio file.
+        Transcribe an in-memory waveform.
+        Supports automatic language detection for Cantonese/English code-switching.
 
         Args:
-            audio_path: Path to the full audio file
-            start: Start time in seconds
-            end: End time in seconds
-            temp_dir: Directory to save temporary segment file
+            samples: 1-D float32 array of audio samples
+            sampling_rate: Sample rate of the samples in Hz
+
+        Returns:
+            Tuple of (transcribed_text, detected_language_code)
+        """
+        if not self._initialized:
+            self.initialize()
+
+        return self._to_text_result(self._run_pipeline([samples], sampling_rate)[0])
+
+    def transcribe_segments(
+        self,
+        audio: DecodedAudio,
+        segments: list[SpeakerSegment],
+        batch_size: int | None = None,
+        languages: list[str | None] | None = None,
+    ) -> list[tuple[str, str] | None]:
+        """
+        Transcribe many segments of a recording with batched inference.
+
+        Segments are grouped by length so each batch decodes utterances of
+        similar size, then results are returned in the order of `segments`.
+        If a batch fails, its segments are retried one at a time so a single
+        bad segment cannot take down its neighbours.
+
+        Args:
+            audio: Decoded audio for the whole recording
+            segments: Speaker segments to transcribe
+            batch_size: Segments per forward pass (defaults to settings)
+            languages: Optional Whisper language code per segment; forcing the
+                language skips Whisper's detection pass (None = auto-detect)
+
+        Returns:
+            List aligned with `segments` of (text, language_code) tuples,
+            or None where transcription failed
+        """
+        if not self._initialized:
+            self.initialize()
+
+        clips = [audio.slice(segment.start_time, segment.end_time) for segment in segments]
+        outputs = self._run_batches(
+            [len(clip) for clip in clips],
+            lambda idx: clips[idx],
+            audio.sample_rate,
+            batch_size or settings.asr_batch_size,
+            languages=languages,
+        )
+
+        languages = languages or [None] * len(segments)
+        results: list[tuple[str, str] | None] = []
+        for idx, (segment, output) in enumerate(zip(segments, outputs)):
+            if output is None:
+                logger.warning(
+                    f"Failed to transcribe segment {idx} "
+                    f"[{segment.start_time:.1f}s - {segment.end_time:.1f}s]"
+                )
+                results.append(None)
+            else:
+                results.append(self._to_text_result(output, languages[idx]))
+
+        return results
+
+    def transcribe_windows(
+        self,
+        audio: DecodedAudio,
+        windows: list[PackedWindow],
+        batch_size: int | None = None,
+        languages: list[str | None] | None = None,
+    ) -> list[list[tuple[str, str] | None]]:
+        """
+        Transcribe packed windows and split the text back into speaker turns.
+
+        Windows holding several turns are decoded with word timestamps so each
+        word can be attributed to its turn. If word-level decoding fails for a
+        window, its turns are transcribed individually instead.
+
+        Args:
+            audio: Decoded audio for the whole recording
+            windows: Packed windows from `pack_segments`
+            batch_size: Windows per forward pass (defaults to settings)
+            languages: Optional Whisper language code per window (None = auto-detect)
+
+        Returns:
+            For each window, a list aligned with its segments of
+            (text, language_code) tuples, or None where transcription failed
+        """
+        if not self._initialized:
+            self.initialize()
+
+        batch_size = batch_size or settings.asr_batch_size
+        languages = languages or [None] * len(windows)
+        results: list[list[tuple[str, str] | None]] = [
+            [None] * len(window.segments) for window in windows
+        ]
+
+        # Single-turn windows need no word alignment
+        multi = [idx for idx, window in enumerate(windows) if len(window.segments) > 1]
+        retry = [(idx, 0) for idx, window in enumerate(windows) if len(window.segments) == 1]
+
+        outputs = self._run_batches(
+            [int(windows[idx].duration * audio.sample_rate) for idx in multi],
+            lambda idx: windows[multi[idx]].build_clip(audio),
+            audio.sample_rate,
+            batch_size,
+            return_timestamps="word",
+            languages=[languages[idx] for idx in multi],
+        )
+        for window_idx, output in zip(multi, outputs):
+            window = windows[window_idx]
+            if output is None:
+                retry.extend((window_idx, turn) for turn in range(len(window.segments)))
+                continue
+
+            words = [
+                (word["text"], word["timestamp"][0], word["timestamp"][1])
+                for word in output.get("chunks", [])
+            ]
+            language = languages[window_idx] or self._output_language(output)
+            for turn, text in enumerate(window.split_words(words)):
+                results[window_idx][turn] = self._to_text_result(text, language)
+
+        retry.sort()
+        retried = self.transcribe_segments(
+            audio,
+            [windows[window_idx].segments[turn] for window_idx, turn in retry],
+            batch_size,
+            languages=[languages[window_idx] for window_idx, _ in retry],
+        )
+        for (window_idx, turn), result in zip(retry, retried):
+            results[window_idx][turn] = result
+
+        return results
+
+    def _run_batches(
+        self,
+        lengths: list[int],
+        load_clip: Callable[[int], np.ndarray],
+        sampling_rate: int,
+        batch_size: int,
+        return_timestamps: bool | str = False,
+        languages: list[str | None] | None = None,
+    ) -> list[dict | None]:
+        """
+        Run the pipeline over many clips in length-sorted batches.
+
+        Args:
+            lengths: Number of samples in each clip
+            load_clip: Returns the samples for a clip index, called lazily per batch
+            sampling_rate: Sample rate shared by all clips
+            batch_size: Clips per forward pass
+            return_timestamps: Passed through to the pipeline
+            languages: Optional forced language per clip (None = auto-detect)
+
+        Returns:
+            Raw pipeline outputs in clip order, or None where a clip failed
+        """
+        outputs: list[dict | None] = [None] * len(lengths)
+        languages = languages or [None] * len(lengths)
+
+        # The language is a per-call generate argument, so batch each language
+        # separately; within it, sort by length to minimise wasted decoder steps
+        groups: dict[str | None, list[int]] = {}
+        for idx, length in enumerate(lengths):
+            if length > 0:
+                groups.setdefault(languages[idx], []).append(idx)
+
+        batches = []
+        for language, indices in groups.items():
+            indices.sort(key=lambda idx: lengths[idx])
+            for batch_start in range(0, len(indices), batch_size):
+                batches.append((language, indices[batch_start : batch_start + batch_size]))
+
+        done, total = 0, sum(len(indices) for indices in groups.values())
+        for language, batch in batches:
+            clips = [load_clip(idx) for idx in batch]
+            try:
+                batch_outputs = self._run_pipeline(
+                    clips, sampling_rate, return_timestamps, language
+                )
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} clips failed, retrying singly: {e}")
+                batch_outputs = []
+                for clip in clips:
+                    try:
+                        batch_outputs.extend(
+                            self._run_pipeline([clip], sampling_rate, return_timestamps, language)
+                        )
+                    except Exception as clip_error:
+                        logger.debug(f"Clip transcription failed: {clip_error}")
+                        batch_outputs.append(None)
+
+            for idx, output in zip(batch, batch_outputs):
+                outputs[idx] = output
+
+            done += len(batch)
+            logger.info(f"Transcribed {done}/{total} clips")
+
+        return outputs
+
+    def _run_pipeline(
+        self,
+        clips: list[np.ndarray],
+        sampling_rate: int,
+        return_timestamps: bool | str = False,
+        language: str | None = None,
+    ) -> list[dict]:
+        """
+        Run a single batched pipeline call over in-memory clips.
+
+        Args:
+            clips: Audio sample arrays to transcribe together
+            sampling_rate: Sample rate shared by all clips
+            return_timestamps: Passed through to the pipeline
+            language: Whisper language code to force, or None to auto-detect
 
         Returns:
-            Path to the extracted segment
+            Raw pipeline outputs in the order of `clips`
         """
-        audio_path = Path(audio_path)
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        if any(len(clip) == 0 for clip in clips):
+            raise ValueError("Cannot transcribe an empty audio segment")
+
+        # Setting language=None enables Whisper's automatic detection, and the
+        # detected language is returned with the text; a forced language
+        # token skips that extra decoder pass
+        audio_seconds = sum(len(clip) for clip in clips) / sampling_rate
+        with observe_asr("segment", audio_seconds, len(clips)):
+            return self.pipe(
+                [{"raw": clip, "sampling_rate": sampling_rate} for clip in clips],
+                batch_size=len(clips),
+                generate_kwargs={
+                    "task": "transcribe",
+                    "language": language,
+                },
+                return_timestamps=return_timestamps,
+                return_language=language is None,
+            )
 
-        # Load audio with librosa
-        y, sr = librosa.load(str(audio_path), sr=16000, mono=True)
+    def _to_text_result(
+        self, result: dict | str, language: str | None = None
+    ) -> tuple[str, str]:
+        """Convert a raw pipeline output into a (text, language_code) tuple."""
+        # Extract text
+        text = result["text"].strip() if isinstance(result, dict) else result.strip()
+
+        # Prefer Whisper's own language ID (forced or detected while decoding);
+        # only fall back to guessing from the text when neither is available
+        if language is None and isinstance(result, dict):
+            language = self._output_language(result)
+        return text, language or self._detect_language(text)
+
+    @staticmethod
+    def _output_language(result: dict) -> str | None:
+        """Language code Whisper detected for a pipeline output, if it returned one."""
+        for chunk in result.get("chunks", []):
+            if chunk.get("language"):
+                return _language_code(chunk["language"])
+        return None
+
+    def detect_languages(
+        self, clips: list[np.ndarray], sampling_rate: int = TARGET_SAMPLE_RATE
+    ) -> list[dict[str, float]]:
+        """
+        Run Whisper's language identification on a batch of clips.
 
-        # Extract segment
-        start_sample = int(start * sr)
-        end_sample = int(end * sr)
-        segment = y[start_sample:end_sample]
+        Scores every language token at the first decoder step, which is the
+        same decision Whisper makes internally when no language is forced.
 
-        # Save segment
-        segment_path = temp_dir / f"segment_{start:.2f}_{end:.2f}.wav"
-        sf.write(str(segment_path), segment, sr)
+        Args:
+            clips: Audio sample arrays (only the first 30 s of each is used)
+            sampling_rate: Sample rate shared by all clips
 
-        return segment_path
+        Returns:
+            For each clip, a mapping of language code to probability
+        """
+        if not self._initialized:
+            self.initialize()
+
+        if not clips:
+            return []
+
+        import torch
+
+        features = self.processor.feature_extractor(
+            list(clips), sampling_rate=sampling_rate, return_tensors="pt"
+        ).input_features.to(self.model.device, dtype=self.torch_dtype)
+
+        start_token = self.processor.tokenizer.convert_tokens_to_ids("<|startoftranscript|>")
+        decoder_input_ids = torch.full(
+            (len(clips), 1), start_token, dtype=torch.long, device=self.model.device
+        )
+
+        # e.g. {"<|en|>": 50259, "<|zh|>": 50260, ...}
+        lang_to_id = self.model.generation_config.lang_to_id
+        codes = [token.strip("<|>") for token in lang_to_id]
+        token_ids = torch.tensor(list(lang_to_id.values()), device=self.model.device)
+
+        with torch.no_grad():
+            logits = self.model(
+                input_features=features, decoder_input_ids=decoder_input_ids
+            ).logits[:, -1]
+        probs = logits[:, token_ids].float().softmax(dim=-1).cpu()
+
+        return [dict(zip(codes, row.tolist())) for row in probs]
 
     def transcribe_segment(
-        self, audio_path: str | Path, start: float, end: float
+        self, audio: DecodedAudio | str | Path, start: float, end: float
     ) -> tuple[str, str]:
         """
-        Transcribe a specific time segment from an audio file.
+        Transcribe a specific time segment of a recording.
         Supports automatic language detection for Cantonese/English code-switching.
 
         Args:
-            audio_path: Path to the audio file
+            audio: Decoded audio (preferred) or path to the audio file
             start: Start time in seconds
             end: End time in seconds
 
@@ -119,36 +413,16 @@ class ASRService:
         if not self._initialized:
             self.initialize()
 
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        # Decoding a path here costs a full decode per segment; callers
+        # transcribing many segments should pass a shared DecodedAudio
+        if not isinstance(audio, DecodedAudio):
+            audio = DecodedAudio.from_file(audio)
 
         try:
-            # Extract the segment to a temporary file
-            temp_dir = settings.storage_dir / "temp"
-            segment_path = self._extract_audio_segment(audio_path, start, end, temp_dir)
-
-            # Transcribe with automatic language detection
-            # Setting language=None enables automatic detection
-            result = self.pipe(
-                str(segment_path),
-                generate_kwargs={
-                    "task": "transcribe",
-                    "language": None,  # Auto-detect language
-                },
-                return_timestamps=False,
+            text, detected_language = self.transcribe_audio(
+                audio.slice(start, end), audio.sample_rate
             )
 
-            # Extract text
-            text = result["text"].strip() if isinstance(result, dict) else result.strip()
-
-            # Attempt to detect language from the result
-            # Whisper may include language info in metadata
-            detected_language = self._detect_language(text)
-
-            # Clean up temporary file
-            segment_path.unlink(missing_ok=True)
-
             logger.debug(
                 f"Transcribed [{start:.1f}s - {end:.1f}s]: {text[:50]}... "
                 f"(language: {detected_language})"
@@ -160,13 +434,21 @@ class ASRService:
             logger.error(f"Transcription failed for segment {start}-{end}: {e}")
             raise
 
-    def transcribe_full_audio(self, audio_path: str | Path) -> dict:
+    def transcribe_full_audio(
+        self,
+        audio: DecodedAudio | str | Path,
+        return_timestamps: bool | str = True,
+        batch_size: int | None = None,
+    ) -> dict:
         """
-        Transcribe an entire audio file without segmentation.
-        Useful for getting timestamps and language info.
+        Transcribe an entire recording without segmentation.
+        Uses chunked long-form decoding, so recordings of any length are
+        split into 30 s windows that are decoded in batches.
 
         Args:
-            audio_path: Path to the audio file
+            audio: Decoded audio or path to the audio file
+            return_timestamps: True for phrase-level or "word" for word-level timestamps
+            batch_size: Windows per forward pass (defaults to settings)
 
         Returns:
             Dictionary with transcription results including timestamps
@@ -174,21 +456,24 @@ class ASRService:
         if not self._initialized:
             self.initialize()
 
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if not isinstance(audio, DecodedAudio):
+            audio = DecodedAudio.from_file(audio)
 
-        logger.info(f"Transcribing full audio: {audio_path}")
+        logger.info(f"Transcribing full audio ({audio.duration:.1f}s)")
 
         try:
-            result = self.pipe(
-                str(audio_path),
-                generate_kwargs={
-                    "task": "transcribe",
-                    "language": None,  # Auto-detect
-                },
-                return_timestamps=True,
-            )
+            with observe_asr("full", audio.duration, 1):
+                result = self.pipe(
+                    {"raw": audio.waveform, "sampling_rate": audio.sample_rate},
+                    chunk_length_s=FULL_AUDIO_CHUNK_LENGTH,
+                    batch_size=batch_size or settings.asr_batch_size,
+                    generate_kwargs={
+                        "task": "transcribe",
+                        "language": None,  # Auto-detect
+                    },
+                    return_timestamps=return_timestamps,
+                    return_language=True,
+                )
 
             return result
 
@@ -196,6 +481,49 @@ class ASRService:
             logger.error(f"Full audio transcription failed: {e}")
             raise
 
+    def transcribe_full_audio_by_speaker(
+        self, audio: DecodedAudio, speaker_segments: list[SpeakerSegment]
+    ) -> list[tuple[SpeakerSegment, str, str]]:
+        """
+        Transcribe the whole recording once and attribute the text to speakers.
+
+        Args:
+            audio: Decoded audio for the whole recording
+            speaker_segments: Diarization segments to align the transcript to
+
+        Returns:
+            List of (speaker_segment, text, language_code) tuples in time order,
+            one per speaker turn that contains speech
+        """
+        try:
+            result = self.transcribe_full_audio(audio, return_timestamps="word")
+        except Exception as e:
+            # Word timestamps need alignment heads; phrase timestamps work without them
+            logger.warning(f"Word timestamps unavailable, using phrase timestamps: {e}")
+            result = self.transcribe_full_audio(audio, return_timestamps=True)
+
+        timed = [piece for piece in result.get("chunks", []) if piece["timestamp"][0] is not None]
+        pieces = [
+            (piece["text"], piece["timestamp"][0], piece["timestamp"][1]) for piece in timed
+        ]
+        ordered = sorted(speaker_segments, key=lambda segment: segment.start_time)
+
+        # Whisper detects the language per 30 s window and tags every piece with it
+        starts = [start for _, start, _ in pieces]
+        aligned = []
+        for turn, text in align_to_speakers(pieces, ordered):
+            segment = ordered[turn]
+            lo = bisect.bisect_left(starts, segment.start_time)
+            hi = bisect.bisect_left(starts, segment.end_time)
+            detected = Counter(
+                _language_code(piece["language"])
+                for piece in timed[lo:hi]
+                if piece.get("language")
+            )
+            language = detected.most_common(1)[0][0] if detected else None
+            aligned.append((segment, text, language or self._detect_language(text)))
+        return aligned
+
     def _detect_language(self, text: str) -> str:
         """
         Simple heuristic to detect if text is primarily Cantonese or English.
@@ -227,25 +555,39 @@ class ASRService:
             return "mixed"  # Code-switching
 
 
+def _language_code(language: str) -> str:
+    """Map a Whisper language name (e.g. "english") to its code (e.g. "en")."""
+    from transformers.models.whisper.tokenization_whisper import TO_LANGUAGE_CODE
+
+    return TO_LANGUAGE_CODE.get(language.lower(), language)
+
+
 # Global service instance
 _asr_service: ASRService | None = None
+_asr_service_lock = threading.Lock()
 
 
 def get_asr_service() -> ASRService:
     """Get or create the global ASR service instance."""
     global _asr_service
     if _asr_service is None:
-        _asr_service = ASRService()
-        _asr_service.initialize()
+        # Startup warm-up and request threads may ask at once; load only once
+        with _asr_service_lock:
+            if _asr_service is None:
+                instance = ASRService()
+                instance.initialize()
+                _asr_service = instance
     return _asr_service
 
 
-def transcribe_segment(audio_path: str | Path, start: float, end: float) -> tuple[str, str]:
+def transcribe_segment(
+    audio: DecodedAudio | str | Path, start: float, end: float
+) -> tuple[str, str]:
     """
     Convenience function to transcribe a segment.
 
     Args:
-        audio_path: Path to audio file
+        audio: Decoded audio or path to audio file
         start: Start time in seconds
         end: End time in seconds
 
@@ -253,5 +595,5 @@ def transcribe_segment(audio_path: str | Path, start: float, end: float) -> tupl
         Tuple of (text, language_code)
     """
     service = get_asr_service()
-    return service.transcribe_segment(audio_path, start, end)
+    return service.transcribe_segment(audio, start, end)
 
@@ -0,0 +1,183 @@
+"""
+Persistent cache for ASR results.
+Transcriptions are keyed by audio content, time span, model and decoding
+parameters, so reprocessing a meeting skips work that was already done.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.services.metrics import record_cache_lookups
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached value format or decoding behaviour changes
+CACHE_VERSION = 2
+
+
+@dataclass
+class CacheStats:
+    """Lookup totals over every ASR batch of one meeting."""
+
+    hits: int = 0
+    lookups: int = 0
+
+    def summary(self) -> str:
+        """One-line report for the meeting's log."""
+        return (
+            f"ASR cache: {self.hits}/{self.lookups} windows hit "
+            f"({self.hits / max(self.lookups, 1):.0%})"
+        )
+
+
+class TranscriptionCache:
+    """
+    Size-bounded on-disk cache backed by SQLite.
+    Entries are evicted least-recently-used once the total payload size
+    exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Maximum total size of cached values
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(audio_hash: str, spans: list[tuple[float, float]], params: dict) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            audio_hash: Content hash of the decoded recording
+            spans: (start, end) times of the audio being transcribed
+            params: Model ID and decoding parameters that affect the output
+
+        Returns:
+            Hex digest identifying the transcription
+        """
+        payload = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "audio": audio_hash,
+                "spans": [(round(start, 3), round(end, 3)) for start, end in spans],
+                "params": params,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Look up several entries and mark them as recently used.
+
+        Args:
+            keys: Cache keys to fetch
+
+        Returns:
+            Mapping of found keys to their cached values
+        """
+        found: dict[str, Any] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE entries SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+        record_cache_lookups("asr", hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def put_many(self, entries: dict[str, Any]):
+        """
+        Store several entries, evicting old ones if the cache is over budget.
+
+        Args:
+            entries: Mapping of cache keys to JSON-serializable values
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = []
+        for key, value in entries.items():
+            encoded = json.dumps(value, ensure_ascii=False)
+            rows.append((key, encoded, len(encoded.encode("utf-8")), now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its budget."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% so we don't evict again on the very next write
+        target = total - int(self.max_bytes * 0.9)
+        freed, evicted = 0, []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            if freed >= target:
+                break
+            evicted.append((key,))
+            freed += size
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.info(f"ASR cache evicted {len(evicted)} entries ({freed / 1e6:.1f} MB)")
+
+
+# Global cache instance
+_asr_cache: TranscriptionCache | None = None
+
+
+def get_asr_cache() -> TranscriptionCache:
+    """Get or create the global ASR cache instance."""
+    global _asr_cache
+    if _asr_cache is None:
+        _asr_cache = TranscriptionCache(
+            settings.storage_dir / "asr_cache.sqlite3",
+            max_bytes=settings.asr_cache_max_mb * 1024 * 1024,
+        )
+    return _asr_cache
@@ -0,0 +1,345 @@
+"""
+Multi-process ASR executor.
+Shards transcription work across worker processes, each running its own
+Whisper model with a fixed thread budget, and merges results in order.
+"""
+
+import logging
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import get_context, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.config import settings
+from app.models.schemas import SpeakerSegment
+from app.services.asr import ASRService, get_asr_service
+from app.services.audio import DecodedAudio
+from app.services.packing import PackedWindow
+
+logger = logging.getLogger(__name__)
+
+# Per-process ASR service, created by the pool initializer in each worker
+_worker_service: ASRService | None = None
+
+
+def _init_worker(num_threads: int):
+    """Pin the worker's torch thread pools and load (or inherit) the model."""
+    global _worker_service
+    import torch
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already set, e.g. inherited from the parent after fork
+        pass
+
+    # After fork this reuses the parent's loaded model copy-on-write
+    _worker_service = get_asr_service()
+
+
+def _transcribe_shard(
+    shm_name: str,
+    num_samples: int,
+    sample_rate: int,
+    items: list[SpeakerSegment] | list[PackedWindow],
+    batch_size: int,
+    languages: list[str | None],
+) -> list:
+    """Transcribe one shard of segments or windows against the shared waveform."""
+    shm = SharedMemory(name=shm_name)
+    # The parent owns the block; stop this process's tracker from unlinking it
+    resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        waveform = np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)
+        audio = DecodedAudio(waveform, sample_rate)
+        if items and isinstance(items[0], PackedWindow):
+            results = _worker_service.transcribe_windows(audio, items, batch_size, languages)
+        else:
+            results = _worker_service.transcribe_segments(audio, items, batch_size, languages)
+        # Drop views into the shared buffer before closing it
+        del audio, waveform
+        return results
+    finally:
+        shm.close()
+
+
+class ASRProcessPool:
+    """
+    Process pool exposing the same batched API as ASRService.
+    Each worker holds its own model and uses `threads_per_worker` torch
+    threads, so N workers use the machine's cores without oversubscription.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        threads_per_worker: int | None = None,
+        start_method: str = "spawn",
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            num_workers: Number of worker processes
+            threads_per_worker: Torch threads per worker (defaults to cores / workers)
+            start_method: Multiprocessing start method ("spawn", "fork" or "forkserver")
+        """
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // num_workers)
+        self.start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        # Shared-memory copies of recordings being transcribed, by id of their DecodedAudio
+        self._shared: dict[int, SharedMemory] = {}
+
+    def start(self):
+        """Start the worker processes."""
+        if self._executor is not None:
+            return
+
+        logger.info(
+            f"Starting ASR process pool: {self.num_workers} workers x "
+            f"{self.threads_per_worker} threads ({self.start_method})"
+        )
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,),
+        )
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _restart(self):
+        """Replace a broken executor; it stays unusable once a worker has died."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.start()
+
+    @contextmanager
+    def shared_audio(self, audio: DecodedAudio) -> Iterator[None]:
+        """
+        Keep a recording in shared memory for every call made inside the block.
+
+        Without it each call copies the waveform into a new shared block, which
+        for a long meeting transcribed in batches means one copy per batch.
+
+        Args:
+            audio: Decoded audio that calls inside the block will transcribe
+        """
+        shm = self._share(audio)
+        self._shared[id(audio)] = shm
+        try:
+            yield
+        finally:
+            del self._shared[id(audio)]
+            shm.close()
+            shm.unlink()
+
+    @staticmethod
+    def _share(audio: DecodedAudio) -> SharedMemory:
+        """Copy a waveform into a new shared memory block."""
+        shm = SharedMemory(create=True, size=max(1, audio.waveform.nbytes))
+        shared = np.ndarray(audio.waveform.shape, dtype=np.float32, buffer=shm.buf)
+        shared[:] = audio.waveform
+        del shared
+        return shm
+
+    def transcribe_segments(
+        self,
+        audio: DecodedAudio,
+        segments: list[SpeakerSegment],
+        batch_size: int | None = None,
+        languages: list[str | None] | None = None,
+    ) -> list[tuple[str, str] | None]:
+        """
+        Transcribe segments across the worker pool.
+
+        Args:
+            audio: Decoded audio for the whole recording
+            segments: Speaker segments to transcribe
+            batch_size: Segments per forward pass within each worker
+            languages: Optional Whisper language code per segment
+
+        Returns:
+            List aligned with `segments` of (text, language_code) tuples,
+            or None where transcription failed
+        """
+        languages = languages or [None] * len(segments)
+        shards = self._shard([segment.duration for segment in segments])
+        shard_items = [[segments[idx] for idx in shard] for shard in shards]
+        shard_languages = [[languages[idx] for idx in shard] for shard in shards]
+        return self._run(audio, shards, shard_items, shard_languages, len(segments), batch_size)
+
+    def transcribe_windows(
+        self,
+        audio: DecodedAudio,
+        windows: list[PackedWindow],
+        batch_size: int | None = None,
+        languages: list[str | None] | None = None,
+    ) -> list[list[tuple[str, str] | None]]:
+        """
+        Transcribe packed windows across the worker pool.
+
+        Args:
+            audio: Decoded audio for the whole recording
+            windows: Packed windows from `pack_segments`
+            batch_size: Windows per forward pass within each worker
+            languages: Optional Whisper language code per window
+
+        Returns:
+            For each window, a list aligned with its segments of
+            (text, language_code) tuples, or None where transcription failed
+        """
+        languages = languages or [None] * len(windows)
+        shards = self._shard([window.duration for window in windows])
+        shard_items = [[windows[idx] for idx in shard] for shard in shards]
+        shard_languages = [[languages[idx] for idx in shard] for shard in shards]
+        results = self._run(audio, shards, shard_items, shard_languages, len(windows), batch_size)
+
+        # Windows from a crashed shard come back as None; fail each of their turns
+        return [
+            result if result is not None else [None] * len(window.segments)
+            for window, result in zip(windows, results)
+        ]
+
+    def _shard(self, durations: list[float]) -> list[list[int]]:
+        """Split item indices into per-worker shards with balanced audio time."""
+        shards: list[list[int]] = [[] for _ in range(self.num_workers)]
+        loads = [0.0] * self.num_workers
+
+        # Longest-first onto the least loaded worker
+        for idx in sorted(range(len(durations)), key=lambda i: durations[i], reverse=True):
+            worker = loads.index(min(loads))
+            shards[worker].append(idx)
+            loads[worker] += durations[idx]
+
+        # Keep time order inside each shard so packed windows stay contiguous
+        return [sorted(shard) for shard in shards if shard]
+
+    def _run(
+        self,
+        audio: DecodedAudio,
+        shards: list[list[int]],
+        shard_items: list[list],
+        shard_languages: list[list[str | None]],
+        total: int,
+        batch_size: int | None,
+    ) -> list:
+        """Dispatch shards to workers over shared memory and merge in order."""
+        batch_size = batch_size or settings.asr_batch_size
+        results: list = [None] * total
+
+        shm = self._shared.get(id(audio))
+        owned = shm is None
+        if owned:
+            shm = self._share(audio)
+        try:
+            lost = self._dispatch(
+                shm.name, audio, shards, shard_items, shard_languages, batch_size, results
+            )
+            if lost:
+                # Retry once on fresh workers; shards lost again are failed
+                logger.warning(f"Retrying {len(lost)} ASR shards on a restarted process pool")
+                lost = self._dispatch(
+                    shm.name,
+                    audio,
+                    [shards[pos] for pos in lost],
+                    [shard_items[pos] for pos in lost],
+                    [shard_languages[pos] for pos in lost],
+                    batch_size,
+                    results,
+                )
+                if lost:
+                    logger.error(f"ASR workers died again; failing {len(lost)} shards")
+        finally:
+            if owned:
+                shm.close()
+                shm.unlink()
+
+        return results
+
+    def _dispatch(
+        self,
+        shm_name: str,
+        audio: DecodedAudio,
+        shards: list[list[int]],
+        shard_items: list[list],
+        shard_languages: list[list[str | None]],
+        batch_size: int,
+        results: list,
+    ) -> list[int]:
+        """
+        Run shards on the workers, storing their output in `results`.
+
+        A shard whose worker raises only fails its own items. A worker process
+        that dies (OOM, segfault) breaks the whole executor: every unfinished
+        shard is lost and the executor is restarted.
+
+        Returns:
+            Positions in `shards` of the shards lost to a dead worker
+        """
+        self.start()
+        try:
+            futures = [
+                self._executor.submit(
+                    _transcribe_shard,
+                    shm_name,
+                    len(audio.waveform),
+                    audio.sample_rate,
+                    items,
+                    batch_size,
+                    languages,
+                )
+                for items, languages in zip(shard_items, shard_languages)
+            ]
+        except BrokenProcessPool:
+            # A worker died since the last run
+            logger.error("ASR process pool is broken; restarting it")
+            self._restart()
+            return list(range(len(shards)))
+
+        lost = []
+        for pos, (shard, future) in enumerate(zip(shards, futures)):
+            try:
+                shard_results = future.result()
+            except BrokenProcessPool:
+                lost.append(pos)
+                continue
+            except Exception as e:
+                logger.error(f"ASR worker failed on a shard of {len(shard)} items: {e}")
+                continue
+            for idx, result in zip(shard, shard_results):
+                results[idx] = result
+
+        if lost:
+            logger.error(f"An ASR worker process died; {len(lost)} of {len(shards)} shards lost")
+            self._restart()
+        return lost
+
+
+# Global pool instance
+_asr_pool: ASRProcessPool | None = None
+
+
+def get_asr_pool() -> ASRProcessPool:
+    """Get or create the global ASR process pool."""
+    global _asr_pool
+    if _asr_pool is None:
+        _asr_pool = ASRProcessPool(
+            num_workers=settings.asr_workers,
+            threads_per_worker=settings.asr_worker_threads,
+            start_method=settings.asr_worker_start_method,
+        )
+        _asr_pool.start()
+    return _asr_pool
@@ -0,0 +1,101 @@
+"""
+Audio decoding utilities.
+Decodes a meeting recording once into a shared in-memory waveform that
+downstream services slice without re-reading the file.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper and pyannote both operate on 16 kHz mono audio
+TARGET_SAMPLE_RATE = 16000
+
+
+class DecodedAudio:
+    """
+    A meeting recording decoded and resampled to 16 kHz mono float32.
+    Segments are returned as zero-copy views into the shared buffer.
+    """
+
+    def __init__(self, waveform: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE):
+        """
+        Initialize decoded audio.
+
+        Args:
+            waveform: 1-D float32 array of samples
+            sample_rate: Sample rate of the waveform in Hz
+        """
+        self.waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self._content_hash: str | None = None
+
+    @classmethod
+    def from_file(cls, audio_path: str | Path) -> "DecodedAudio":
+        """
+        Decode and resample an audio file.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            DecodedAudio holding the full recording
+        """
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        import librosa
+
+        logger.info(f"Decoding audio: {audio_path}")
+        waveform, sample_rate = librosa.load(str(audio_path), sr=TARGET_SAMPLE_RATE, mono=True)
+        audio = cls(waveform, sample_rate)
+        logger.info(f"Decoded {audio.duration:.1f}s of audio at {sample_rate} Hz")
+        return audio
+
+    @property
+    def duration(self) -> float:
+        """Duration of the recording in seconds."""
+        return len(self.waveform) / self.sample_rate
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of the decoded samples, identifying the recording's content."""
+        if self._content_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(str(self.sample_rate).encode("ascii"))
+            digest.update(memoryview(self.waveform).cast("B"))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def slice(self, start: float, end: float) -> np.ndarray:
+        """
+        Get the samples between two timestamps.
+
+        Args:
+            start: Start time in seconds
+            end: End time in seconds
+
+        Returns:
+            A view into the shared waveform (no copy is made)
+        """
+        start_sample = max(0, int(start * self.sample_rate))
+        end_sample = min(len(self.waveform), int(end * self.sample_rate))
+        return self.waveform[start_sample:max(start_sample, end_sample)]
+
+
+def load_audio(audio_path: str | Path) -> DecodedAudio:
+    """
+    Convenience function to decode an audio file.
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        DecodedAudio for the full recording
+    """
+    return DecodedAudio.from_file(audio_path)
@@ -0,0 +1,298 @@
+"""
+Stage checkpoints for meeting processing.
+Each pipeline stage persists its output under the meeting's storage
+directory, so a rerun with the same meeting ID resumes where an
+interrupted run stopped instead of starting over.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.models.schemas import SpeakerSegment, SummaryResponse
+from app.services.fileio import save_npy, write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the checkpoint layout changes; older checkpoints are discarded
+CHECKPOINT_VERSION = 1
+
+# (segment, (text, language) or None, language probability)
+Turn = tuple[SpeakerSegment, tuple[str, str] | None, float | None]
+
+
+def _segment_key(segment: SpeakerSegment) -> tuple[str, float, float]:
+    """Identify a diarization segment independently of object identity."""
+    return (segment.speaker_label, round(segment.start_time, 3), round(segment.end_time, 3))
+
+
+def _source_segment(turn: SpeakerSegment, segments: list[SpeakerSegment]) -> SpeakerSegment:
+    """Find the diarization segment a (VAD-trimmed) turn was cut from."""
+    for segment in segments:
+        if (
+            segment.speaker_label == turn.speaker_label
+            and segment.start_time <= turn.start_time + 1e-6
+            and turn.end_time <= segment.end_time + 1e-6
+        ):
+            return segment
+    raise ValueError(f"Turn {turn} is not inside any of the batch's segments")
+
+
+class MeetingCheckpoint:
+    """
+    Checkpoint files for one meeting.
+
+    Layout under `<storage_dir>/<meeting_id>/checkpoint/`:
+        manifest.json     audio hash, ASR mode and completed stages
+        diarization.json  diarization segments
+        chunks.jsonl      one line per transcribed batch, appended as ASR runs, so a
+                          rerun only transcribes segments missing from it (including
+                          segments whose transcription failed)
+        embeddings.npy    retrieval window embeddings in transcript order
+        windows.json      chunk indices of each embedded window
+        summary.json      LLM summary
+    """
+
+    def __init__(self, meeting_dir: Path):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            meeting_dir: The meeting's storage directory
+        """
+        self.path = meeting_dir / "checkpoint"
+        self.manifest: dict = {}
+        # Stages finish on different executor threads
+        self._lock = threading.Lock()
+
+    def open(self, audio_hash: str, asr_mode: str) -> list[str]:
+        """
+        Load the manifest, discarding checkpoints from a different recording or ASR mode.
+
+        Args:
+            audio_hash: Content hash of the decoded recording
+            asr_mode: ASR strategy of this run
+
+        Returns:
+            Stages already completed by an earlier run
+        """
+        manifest_path = self.path / "manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+            expected = (CHECKPOINT_VERSION, audio_hash, asr_mode)
+            found = (
+                self.manifest.get("format_version"),
+                self.manifest.get("audio_hash"),
+                self.manifest.get("asr_mode"),
+            )
+            if found != expected:
+                logger.info(f"Discarding stale checkpoint in {self.path}")
+                shutil.rmtree(self.path)
+                self.manifest = {}
+
+        if not self.manifest:
+            self.manifest = {
+                "format_version": CHECKPOINT_VERSION,
+                "audio_hash": audio_hash,
+                "asr_mode": asr_mode,
+                "completed": [],
+            }
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._save_manifest()
+
+        return list(self.manifest["completed"])
+
+    def discard(self):
+        """Delete the checkpoint once the meeting is saved; it is only needed to resume."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.manifest = {}
+
+    def is_complete(self, stage: str) -> bool:
+        """Whether an earlier run finished a stage."""
+        return stage in self.manifest.get("completed", [])
+
+    def mark_complete(self, stage: str):
+        """Record that a stage finished."""
+        with self._lock:
+            if not self.is_complete(stage):
+                self.manifest["completed"].append(stage)
+                self._save_manifest()
+
+    def load_diarization(self) -> list[SpeakerSegment] | None:
+        """Load checkpointed diarization segments, if diarization completed."""
+        if not self.is_complete("diarization"):
+            return None
+        with open(self.path / "diarization.json", "r", encoding="utf-8") as f:
+            return [SpeakerSegment(**segment) for segment in json.load(f)]
+
+    def save_diarization(self, segments: list[SpeakerSegment]):
+        """Checkpoint diarization segments."""
+        data = json.dumps([segment.model_dump() for segment in segments]).encode("utf-8")
+        write_atomic(self.path / "diarization.json", lambda tmp: Path(tmp).write_bytes(data))
+        self.mark_complete("diarization")
+
+    def load_transcribed(self) -> dict[tuple[str, float, float], list[Turn]]:
+        """
+        Load checkpointed ASR output.
+
+        Returns:
+            Mapping of transcribed diarization segment keys to the turns produced
+            from them (empty where VAD found no speech in the segment)
+        """
+        transcribed: dict[tuple[str, float, float], list[Turn]] = {}
+        chunks_path = self.path / "chunks.jsonl"
+        if not chunks_path.exists():
+            return transcribed
+
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    batch = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a truncated last line
+                    break
+                for key in batch["segments"]:
+                    transcribed[tuple(key)] = []
+                for turn in batch["turns"]:
+                    transcribed[tuple(turn["source"])].append(
+                        (
+                            SpeakerSegment(**turn["segment"]),
+                            tuple(turn["result"]) if turn["result"] is not None else None,
+                            turn["language_probability"],
+                        )
+                    )
+        return transcribed
+
+    def split_transcribed(
+        self,
+        segments: list[SpeakerSegment],
+        transcribed: dict[tuple[str, float, float], list[Turn]] | None = None,
+    ) -> tuple[list[Turn], list[SpeakerSegment]]:
+        """
+        Split diarization segments into already transcribed and remaining ones.
+
+        Args:
+            segments: Diarization segments to look up
+            transcribed: Output of `load_transcribed` (loaded if omitted)
+
+        Returns:
+            Tuple of (checkpointed turns for done segments, segments still to transcribe)
+        """
+        if transcribed is None:
+            transcribed = self.load_transcribed()
+
+        turns: list[Turn] = []
+        remaining: list[SpeakerSegment] = []
+        for segment in segments:
+            key = _segment_key(segment)
+            if key in transcribed:
+                turns.extend(transcribed[key])
+            else:
+                remaining.append(segment)
+        return turns, remaining
+
+    def append_turns(self, segments: list[SpeakerSegment], turns: list[Turn]):
+        """
+        Append one transcribed batch.
+
+        A segment is only recorded once every turn cut from it has a result,
+        so a rerun retries segments whose transcription failed.
+
+        Args:
+            segments: Diarization segments the batch covered
+            turns: Transcribed turns produced from those segments
+        """
+        sources = [_source_segment(segment, segments) for segment, _, _ in turns]
+        failed = {
+            _segment_key(source) for source, (_, result, _) in zip(sources, turns) if result is None
+        }
+        done = [key for key in map(_segment_key, segments) if key not in failed]
+        if not done:
+            return
+
+        line = json.dumps(
+            {
+                "segments": done,
+                "turns": [
+                    {
+                        "source": _segment_key(source),
+                        "segment": segment.model_dump(),
+                        "result": list(result),
+                        "language_probability": probability,
+                    }
+                    for source, (segment, result, probability) in zip(sources, turns)
+                    if _segment_key(source) not in failed
+                ],
+            },
+            ensure_ascii=False,
+        )
+        with open(self.path / "chunks.jsonl", "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Later stages were derived from a transcript that has now changed
+        self._invalidate("transcription", "indexing", "summary")
+
+    def load_embeddings(self, num_chunks: int) -> tuple[np.ndarray, list[list[int]]] | None:
+        """
+        Load checkpointed window embeddings if they match the transcript.
+
+        Args:
+            num_chunks: Number of chunks in the transcript
+
+        Returns:
+            Tuple of (embeddings, chunk indices of each window), or None
+        """
+        windows_path = self.path / "windows.json"
+        if not self.is_complete("indexing") or not windows_path.exists():
+            # Checkpoints from before retrieval windows embedded single turns; re-embed
+            return None
+        embeddings = np.load(self.path / "embeddings.npy")
+        with open(windows_path, "r", encoding="utf-8") as f:
+            windows = json.load(f)
+        if len(embeddings) != len(windows) or any(
+            idx >= num_chunks for window in windows for idx in window
+        ):
+            return None
+        return embeddings, windows
+
+    def save_embeddings(self, embeddings: np.ndarray, windows: list[list[int]]):
+        """Checkpoint window embeddings and the chunks of each window."""
+        data = json.dumps(windows).encode("utf-8")
+        write_atomic(self.path / "windows.json", lambda tmp: Path(tmp).write_bytes(data))
+        write_atomic(self.path / "embeddings.npy", lambda tmp: save_npy(tmp, embeddings))
+        self.mark_complete("indexing")
+
+    def load_summary(self) -> SummaryResponse | None:
+        """Load the checkpointed summary, if summarization completed."""
+        if not self.is_complete("summary"):
+            return None
+        with open(self.path / "summary.json", "r", encoding="utf-8") as f:
+            return SummaryResponse.model_validate_json(f.read())
+
+    def save_summary(self, summary: SummaryResponse):
+        """Checkpoint the summary."""
+        data = summary.model_dump_json().encode("utf-8")
+        write_atomic(self.path / "summary.json", lambda tmp: Path(tmp).write_bytes(data))
+        self.mark_complete("summary")
+
+    def _invalidate(self, *stages: str):
+        """Forget completed stages whose inputs changed."""
+        with self._lock:
+            completed = [stage for stage in self.manifest["completed"] if stage not in stages]
+            if completed != self.manifest["completed"]:
+                self.manifest["completed"] = completed
+                self._save_manifest()
+
+    def _save_manifest(self):
+        """Persist the manifest."""
+        data = json.dumps(self.manifest, indent=2).encode("utf-8")
+        write_atomic(self.path / "manifest.json", lambda tmp: Path(tmp).write_bytes(data))
@@ -0,0 +1,116 @@
+"""
+Retrieval windows for the RAG index.
+Consecutive transcript turns are merged into token-bounded, overlapping
+windows that are embedded in place of single turns, so a vector carries a
+stretch of conversation rather than one "OK." or "嗯". Windows remember
+their turns, so answers still cite individual turns with their speaker
+and time.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from app.models.schemas import TranscriptChunk
+from app.services.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetrievalWindow:
+    """Consecutive transcript turns embedded together as one vector."""
+
+    chunk_indices: list[int] = field(default_factory=list)
+    text: str = ""
+
+
+def build_windows(
+    chunks: list[TranscriptChunk],
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    min_tokens: int = 0,
+) -> list[RetrievalWindow]:
+    """
+    Group consecutive turns into overlapping windows of at most `max_tokens`.
+
+    Each window starts with the last turns of the previous one (up to
+    `overlap_tokens`), so a question about something said across a window
+    boundary still matches one window whole. A single turn longer than the
+    budget gets a window of its own. Turns under `min_tokens` are left out
+    of the embedded text and never start an overlap; windows made up only
+    of such turns get no vector.
+
+    Args:
+        chunks: Transcript turns in time order
+        max_tokens: Token budget per window
+        overlap_tokens: Tokens of trailing turns repeated in the next window
+        min_tokens: Turns shorter than this are too short to embed on their own
+
+    Returns:
+        Windows in time order, each at least one turn
+    """
+    tokens = [estimate_tokens(chunk.text) for chunk in chunks]
+    spans: list[range] = []
+    start = 0
+    while start < len(chunks):
+        end, used = start + 1, tokens[start]
+        while end < len(chunks) and used + tokens[end] <= max_tokens:
+            used += tokens[end]
+            end += 1
+        spans.append(range(start, end))
+        if end == len(chunks):
+            break
+
+        # Repeat trailing turns, as long as the next turn still fits beside them
+        next_start = end
+        while next_start - 1 > start and (
+            sum(tokens[next_start - 1 : end]) <= overlap_tokens
+            and sum(tokens[next_start - 1 : end + 1]) <= max_tokens
+        ):
+            next_start -= 1
+        while next_start < end and tokens[next_start] < min_tokens:
+            next_start += 1
+        start = next_start
+
+    windows = []
+    for span in spans:
+        texts = [chunks[idx].text for idx in span if tokens[idx] >= min_tokens]
+        if texts:
+            windows.append(RetrievalWindow(list(span), "\n".join(texts)))
+    if not windows and chunks:
+        # Nothing but short turns: embed them all together rather than not at all
+        windows.append(
+            RetrievalWindow(list(range(len(chunks))), "\n".join(chunk.text for chunk in chunks))
+        )
+
+    logger.debug(f"Grouped {len(chunks)} turns into {len(windows)} retrieval windows")
+    return windows
+
+
+def merge_chunks(chunks: list[TranscriptChunk]) -> TranscriptChunk:
+    """
+    Combine a window's turns into one chunk spanning their speakers and time.
+
+    Args:
+        chunks: Consecutive turns, in time order
+
+    Returns:
+        Chunk covering the turns (the turn itself for a single turn)
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    first, last = chunks[0], chunks[-1]
+    speakers = list(dict.fromkeys(chunk.speaker_label for chunk in chunks))
+    languages = {chunk.language for chunk in chunks}
+    if len(speakers) == 1:
+        text = "\n".join(chunk.text for chunk in chunks)
+    else:
+        text = "\n".join(f"{chunk.speaker_label}: {chunk.text}" for chunk in chunks)
+    return TranscriptChunk(
+        chunk_id=f"{first.chunk_id}-{last.chunk_id}",
+        speaker_label=", ".join(speakers),
+        start_time=first.start_time,
+        end_time=max(chunk.end_time for chunk in chunks),
+        text=text,
+        language=first.language if len(languages) == 1 else None,
+    )
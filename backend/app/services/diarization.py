@@ -4,12 +4,20 @@ Identifies who is speaking when in an audio file.
 """
 
 import logging
+import threading
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pyannote.audio import Pipeline
+import numpy as np
 
 from app.config import settings
 from app.models.schemas import SpeakerSegment
+from app.services.audio import DecodedAudio
+
+# torch and pyannote are imported when the model is loaded, not at import time
+if TYPE_CHECKING:
+    from pyannote.audio import Pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +26,7 @@ class DiarizationService:
     """Service for speaker diarization using pyannote/speaker-diarization-3.1."""
 
     def __init__(self):
-        self.pipeline: Pipeline | None = None
+        self.pipeline: "Pipeline | None" = None
         self._initialized = False
 
     def initialize(self):
@@ -28,6 +36,9 @@ class DiarizationService:
 
         logger.info(f"Loading diarization model: {settings.diarization_model}")
         try:
+            import torch
+            from pyannote.audio import Pipeline
+
             # Load the diarization pipeline with authentication
             self.pipeline = Pipeline.from_pretrained(
                 settings.diarization_model,
@@ -36,8 +47,6 @@ class DiarizationService:
 
             # Move to appropriate device
             if settings.device == "cuda":
-                import torch
-
                 self.pipeline.to(torch.device(settings.torch_device))
 
             self._initialized = True
@@ -46,12 +55,15 @@ class DiarizationService:
             logger.error(f"Failed to load diarization pipeline: {e}")
             raise
 
-    def run_diarization(self, audio_path: str | Path) -> list[SpeakerSegment]:
+    def run_diarization(self, audio: DecodedAudio | str | Path) -> list[SpeakerSegment]:
         """
-        Run speaker diarization on an audio file.
+        Run speaker diarization on a recording.
+
+        In windowed mode, recordings longer than one window are diarized
+        window by window (see `iter_diarization`).
 
         Args:
-            audio_path: Path to the audio file
+            audio: Decoded audio (preferred) or path to the audio file
 
         Returns:
             List of SpeakerSegment objects with speaker labels and timestamps
@@ -59,15 +71,27 @@ class DiarizationService:
         if not self._initialized:
             self.initialize()
 
-        audio_path = Path(audio_path)
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if not isinstance(audio, DecodedAudio):
+            audio = DecodedAudio.from_file(audio)
+
+        if settings.diarization_mode == "windowed" and audio.duration > settings.diarization_window:
+            segments = list(self.iter_diarization(audio))
+            logger.info(f"Diarization complete: found {len(segments)} segments")
+            return segments
+
+        logger.info(f"Running diarization on {audio.duration:.1f}s of audio")
 
-        logger.info(f"Running diarization on: {audio_path}")
+        import torch
 
         try:
-            # Run the diarization pipeline
-            diarization = self.pipeline(str(audio_path))
+            # Hand pyannote the in-memory waveform as a (channel, time) tensor;
+            # from_numpy shares the buffer, so the recording is not copied
+            diarization = self.pipeline(
+                {
+                    "waveform": torch.from_numpy(audio.waveform).unsqueeze(0),
+                    "sample_rate": audio.sample_rate,
+                }
+            )
 
             # Convert to list of SpeakerSegment
             segments = []
@@ -86,30 +110,269 @@ class DiarizationService:
             logger.error(f"Diarization failed: {e}")
             raise
 
+    def iter_diarization(
+        self,
+        audio: DecodedAudio,
+        window: float | None = None,
+        overlap: float | None = None,
+    ) -> Iterator[SpeakerSegment]:
+        """
+        Diarize a recording in overlapping windows, yielding segments as they are found.
+
+        pyannote only ever sees one window, so its memory use does not grow
+        with the recording. Speakers are stitched across windows by matching
+        each window's speaker embeddings against running global centroids.
+        Each window keeps the turns in the middle of its overlaps, and turns
+        cut at a window boundary are joined back together.
+
+        Args:
+            audio: Decoded audio for the whole recording
+            window: Window length in seconds (defaults to settings)
+            overlap: Overlap between consecutive windows in seconds (defaults to settings)
+
+        Yields:
+            SpeakerSegment objects in time order, labelled SPEAKER_00, SPEAKER_01, ...
+        """
+        if not self._initialized:
+            self.initialize()
+
+        window = window or settings.diarization_window
+        overlap = settings.diarization_window_overlap if overlap is None else overlap
+        if not 0 <= overlap < window:
+            raise ValueError(f"Diarization overlap ({overlap}s) must be shorter than the window")
+
+        import torch
+
+        registry = SpeakerRegistry(settings.diarization_stitch_threshold)
+        # Previous window's turns reaching into this window, as (global speaker, start, end)
+        previous: list[tuple[int, float, float]] = []
+        # Turns ending at the previous boundary, which may continue in this window
+        held: list[SpeakerSegment] = []
+        # Finished turns waiting until no held turn can start before them
+        pending: list[SpeakerSegment] = []
+        boundary = 0.0
+        start = 0.0
+
+        while True:
+            end = min(start + window, audio.duration)
+            last = end >= audio.duration
+            own_end = audio.duration if last else end - overlap / 2
+            logger.info(f"Diarizing window {start:.0f}s - {end:.0f}s")
+
+            try:
+                diarization, embeddings = self.pipeline(
+                    {
+                        "waveform": torch.from_numpy(audio.slice(start, end)).unsqueeze(0),
+                        "sample_rate": audio.sample_rate,
+                    },
+                    return_embeddings=True,
+                )
+            except Exception as e:
+                logger.error(f"Diarization failed for window {start:.0f}s - {end:.0f}s: {e}")
+                raise
+
+            positions = {label: idx for idx, label in enumerate(diarization.labels())}
+            turns = [
+                (positions[speaker], start + turn.start, start + turn.end)
+                for turn, _, speaker in diarization.itertracks(yield_label=True)
+            ]
+            speakers = registry.assign(
+                embeddings, len(positions), _shared_speech(turns, previous, len(positions))
+            )
+
+            segments = []
+            for local, turn_start, turn_end in turns:
+                segment_start = max(turn_start, boundary)
+                segment_end = min(turn_end, own_end)
+                if segment_end > segment_start:
+                    segments.append(
+                        SpeakerSegment(
+                            speaker_label=f"SPEAKER_{speakers[local]:02d}",
+                            start_time=segment_start,
+                            end_time=segment_end,
+                        )
+                    )
+
+            # Join turns that were cut at the boundary between the two windows
+            for segment in segments:
+                if segment.start_time != boundary:
+                    continue
+                for previous in held:
+                    if previous.speaker_label == segment.speaker_label:
+                        segment.start_time = previous.start_time
+                        held.remove(previous)
+                        break
+
+            pending += held + [
+                segment for segment in segments if last or segment.end_time < own_end
+            ]
+            held = [segment for segment in segments if not last and segment.end_time >= own_end]
+
+            # A held turn (and any later turn it is joined with) starts no earlier than
+            # itself, and other later turns start after the boundary
+            cutoff = min((segment.start_time for segment in held), default=float("inf"))
+            pending.sort(key=lambda segment: segment.start_time)
+            ready = [segment for segment in pending if segment.start_time <= cutoff]
+            pending = pending[len(ready) :]
+            yield from ready
+
+            if last:
+                break
+            boundary = own_end
+            start += window - overlap
+            previous = [
+                (speakers[local], turn_start, turn_end)
+                for local, turn_start, turn_end in turns
+                if turn_end > start
+            ]
+
+        logger.info(f"Windowed diarization found {len(registry.centroids)} speakers")
+
+
+class SpeakerRegistry:
+    """
+    Global speaker identities for windowed diarization.
+    Each speaker keeps a running centroid of its per-window embeddings, and
+    speakers from a new window are matched to the most similar centroid.
+    """
+
+    def __init__(self, threshold: float):
+        """
+        Initialize the registry.
+
+        Args:
+            threshold: Minimum cosine similarity for two speakers to be merged
+        """
+        self.threshold = threshold
+        self.centroids: list[np.ndarray | None] = []
+        self.counts: list[int] = []
+
+    def assign(
+        self,
+        embeddings: np.ndarray,
+        num_speakers: int,
+        shared: list[dict[int, float]] | None = None,
+    ) -> list[int]:
+        """
+        Map one window's speakers to global speaker indices.
+
+        Speakers without a usable embedding cannot be matched by similarity.
+        They take the global speaker they overlap most with in the region
+        shared with the previous window, or else the best-established existing
+        speaker, so they never become a new speaker of their own.
+
+        Args:
+            embeddings: (num_speakers, dim) embeddings in label order; rows may be NaN
+                for speakers with too little clean speech to embed
+            num_speakers: Number of speakers in the window
+            shared: Optional seconds of speech each window speaker shares with each
+                global speaker in the overlap with the previous window
+
+        Returns:
+            Global speaker index for each of the window's speakers
+        """
+        vectors = [
+            _normalize(embeddings[idx]) if idx < len(embeddings) else None
+            for idx in range(num_speakers)
+        ]
+
+        # Greedy one-to-one matching, most similar pairs first
+        candidates = []
+        for local, vector in enumerate(vectors):
+            if vector is None:
+                continue
+            for speaker, centroid in enumerate(self.centroids):
+                if centroid is not None:
+                    similarity = float(centroid @ vector)
+                    if similarity >= self.threshold:
+                        candidates.append((similarity, local, speaker))
+
+        assigned: dict[int, int] = {}
+        for _, local, speaker in sorted(candidates, reverse=True):
+            if local not in assigned and speaker not in assigned.values():
+                assigned[local] = speaker
+
+        for local, vector in enumerate(vectors):
+            if vector is None:
+                continue
+            speaker = assigned.get(local)
+            if speaker is None:
+                assigned[local] = len(self.centroids)
+                self.centroids.append(vector)
+                self.counts.append(1)
+            else:
+                count = self.counts[speaker]
+                self.centroids[speaker] = _normalize(self.centroids[speaker] * count + vector)
+                self.counts[speaker] = count + 1
+
+        for local, vector in enumerate(vectors):
+            if vector is not None:
+                continue
+            overlapping = shared[local] if shared and local < len(shared) else {}
+            if overlapping:
+                assigned[local] = max(overlapping, key=overlapping.get)
+            elif self.centroids:
+                assigned[local] = max(range(len(self.counts)), key=self.counts.__getitem__)
+            else:
+                # No speaker has been registered yet; later ones share this label
+                assigned[local] = 0
+                self.centroids.append(None)
+                self.counts.append(0)
+
+        return [assigned[local] for local in range(num_speakers)]
+
+
+def _shared_speech(
+    turns: list[tuple[int, float, float]],
+    previous: list[tuple[int, float, float]],
+    num_speakers: int,
+) -> list[dict[int, float]]:
+    """Seconds each window speaker talks over each global speaker of the previous window."""
+    shared: list[dict[int, float]] = [{} for _ in range(num_speakers)]
+    for local, start, end in turns:
+        for speaker, other_start, other_end in previous:
+            seconds = min(end, other_end) - max(start, other_start)
+            if seconds > 0:
+                shared[local][speaker] = shared[local].get(speaker, 0.0) + seconds
+    return shared
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray | None:
+    """Scale a vector to unit length, or None if it is NaN or zero."""
+    norm = np.linalg.norm(vector)
+    if not np.isfinite(norm) or norm == 0:
+        return None
+    return vector / norm
+
 
 # Global service instance
 _diarization_service: DiarizationService | None = None
+_diarization_service_lock = threading.Lock()
 
 
 def get_diarization_service() -> DiarizationService:
     """Get or create the global diarization service instance."""
     global _diarization_service
     if _diarization_service is None:
-        _diarization_service = DiarizationService()
-        _diarization_service.initialize()
+        # Startup warm-up and request threads may ask at once; load only once
+        with _diarization_service_lock:
+            if _diarization_service is None:
+                instance = DiarizationService()
+                instance.initialize()
+                _diarization_service = instance
     return _diarization_service
 
 
-def run_diarization(audio_path: str | Path) -> list[SpeakerSegment]:
+def run_diarization(audio: DecodedAudio | str | Path) -> list[SpeakerSegment]:
     """
     Convenience function to run diarization.
 
     Args:
-        audio_path: Path to audio file
+        audio: Decoded audio or path to audio file
 
     Returns:
         List of speaker segments with timestamps
     """
     service = get_diarization_service()
-    return service.run_diarization(audio_path)
+    return service.run_diarization(audio)
 
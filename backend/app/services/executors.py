@@ -0,0 +1,69 @@
+"""
+Dedicated executors for blocking model calls.
+Each pipeline stage runs on its own bounded thread pool, so the event loop
+stays responsive and a long diarization or ASR run cannot take the threads
+that Q&A queries need.
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Stage = Literal["diarization", "asr", "embedding", "query"]
+
+# Executors are created on first use and live until shutdown_executors()
+_executors: dict[str, ThreadPoolExecutor] = {}
+
+
+def _stage_threads(stage: Stage) -> int:
+    """Thread count configured for a stage."""
+    return {
+        "diarization": settings.executor_diarization_threads,
+        "asr": settings.executor_asr_threads,
+        "embedding": settings.executor_embedding_threads,
+        "query": settings.executor_query_threads,
+    }[stage]
+
+
+def get_executor(stage: Stage) -> ThreadPoolExecutor:
+    """Get or create the thread pool for a stage."""
+    executor = _executors.get(stage)
+    if executor is None:
+        threads = _stage_threads(stage)
+        executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix=f"{stage}-")
+        _executors[stage] = executor
+        logger.info(f"Created {stage} executor with {threads} threads")
+    return executor
+
+
+async def run_in_stage(stage: Stage, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking call on a stage's executor without blocking the event loop.
+
+    Calls beyond the pool size wait their turn in the executor's queue.
+
+    Args:
+        stage: Pipeline stage whose executor runs the call
+        func: Blocking function to call
+        *args: Positional arguments for `func`
+        **kwargs: Keyword arguments for `func`
+
+    Returns:
+        The return value of `func`
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(stage), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Shut down all stage executors, waiting for running calls to finish."""
+    for executor in _executors.values():
+        executor.shutdown(wait=True, cancel_futures=True)
+    _executors.clear()
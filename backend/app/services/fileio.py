@@ -0,0 +1,48 @@
+"""
+Small file helpers shared by the on-disk index formats.
+Files are written to a temporary sibling and renamed into place, so readers
+never see partial output and memory maps of the previous file stay valid.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+def write_atomic(path: Path, write: Callable[[str], None]):
+    """
+    Write a file via a temporary sibling path, then swap it into place.
+
+    Args:
+        path: Destination file
+        write: Function that writes the complete file at the path it is given
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        write(str(tmp_path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def save_npy(path: str, array: np.ndarray):
+    """Save an array in .npy format at exactly `path` (np.save would append a suffix)."""
+    with open(path, "wb") as f:
+        np.save(f, array)
+
+
+def save_json(path: str, data: Any, **kwargs):
+    """Save JSON as UTF-8."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **kwargs)
+
+
+def load_json(path: Path) -> Any:
+    """Load a UTF-8 JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
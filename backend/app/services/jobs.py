@@ -0,0 +1,236 @@
+"""
+Background job queue for meeting processing.
+Uploads are queued and processed by a fixed pool of async workers, so the
+upload request returns immediately and clients poll the job for progress.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.config import AsrMode, settings
+from app.models.schemas import JobInfo, JobStage
+from app.services.metrics import JOBS_FINISHED, JOBS_QUEUED, JOBS_RUNNING
+from app.services.pipeline import PIPELINE_STAGES, get_pipeline
+from app.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its maximum depth."""
+
+
+class JobQueue:
+    """
+    In-memory queue of meeting processing jobs.
+    At most `concurrency` jobs run at once and at most `max_queued` wait.
+    Finished jobs are forgotten after `retention_seconds`, or sooner once
+    more than `max_finished` of them are kept.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_queued: int,
+        retention_seconds: float = 86400.0,
+        max_finished: int = 1000,
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            concurrency: Number of jobs processed at the same time
+            max_queued: Maximum number of jobs waiting to start
+            retention_seconds: How long a finished job stays available for polling
+            max_finished: Maximum number of finished jobs kept
+        """
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self._jobs: dict[str, JobInfo] = {}
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._init_lock = asyncio.Lock()
+
+    def start(self):
+        """Start the worker tasks (must be called from the running event loop)."""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        JOBS_QUEUED.set_function(self._queue.qsize)
+        JOBS_RUNNING.set_function(
+            lambda: sum(1 for job in self._jobs.values() if job.status == "running")
+        )
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{idx}")
+            for idx in range(self.concurrency)
+        ]
+        logger.info(
+            f"Job queue started: {self.concurrency} workers, up to {self.max_queued} queued"
+        )
+
+    async def shutdown(self):
+        """Cancel the workers; running jobs are abandoned."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Job queue stopped")
+
+    def is_full(self) -> bool:
+        """Whether a new job would be rejected right now."""
+        return self._queue is not None and self._queue.full()
+
+    def submit(
+        self,
+        audio_path: Path,
+        filename: str,
+        meeting_id: str,
+        asr_mode: AsrMode | None = None,
+    ) -> JobInfo:
+        """
+        Queue a meeting for processing.
+
+        Args:
+            audio_path: Path to the saved upload
+            filename: Original upload filename
+            meeting_id: ID of the meeting the job will produce
+            asr_mode: Optional ASR strategy override
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If `max_queued` jobs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+
+        job = JobInfo(
+            job_id=f"job_{uuid.uuid4().hex[:12]}",
+            meeting_id=meeting_id,
+            filename=filename,
+            stages=[JobStage(name=stage) for stage in PIPELINE_STAGES],
+        )
+        try:
+            self._queue.put_nowait((job.job_id, audio_path, asr_mode))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.max_queued} jobs are already queued") from None
+
+        self._prune()
+        self._jobs[job.job_id] = job
+        logger.info(f"Queued job {job.job_id} for meeting {meeting_id} ({filename})")
+        return job
+
+    def get_job(self, job_id: str) -> JobInfo | None:
+        """Retrieve a job by ID."""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, include_finished: bool = False) -> list[JobInfo]:
+        """
+        List jobs, oldest first.
+
+        Args:
+            include_finished: Also include completed and failed jobs
+
+        Returns:
+            Queued and running jobs (plus finished ones if requested)
+        """
+        return [
+            job
+            for job in self._jobs.values()
+            if include_finished or job.status in ("queued", "running")
+        ]
+
+    async def _worker(self):
+        """Process queued jobs one at a time until cancelled."""
+        while True:
+            job_id, audio_path, asr_mode = await self._queue.get()
+            try:
+                await self._run(self._jobs[job_id], audio_path, asr_mode)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: JobInfo, audio_path: Path, asr_mode: AsrMode | None):
+        """Run the meeting pipeline for one job and record the outcome."""
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        logger.info(f"Starting job {job.job_id}")
+
+        try:
+            # Model loading blocks, so do it off the event loop, and only once
+            async with self._init_lock:
+                pipeline = await asyncio.to_thread(get_pipeline)
+
+            result, rag_index = await pipeline.process_meeting_audio(
+                audio_path,
+                meeting_id=job.meeting_id,
+                asr_mode=asr_mode,
+                progress=lambda stage, status: self._update_stage(job, stage, status),
+            )
+
+            # Store on disk, then in memory (saving swaps the vectors for memory-mapped files)
+            await asyncio.to_thread(
+                pipeline.save_meeting_data, result.meeting_id, result, rag_index
+            )
+            get_storage().store_meeting(result.meeting_id, result, rag_index)
+
+            job.status = "completed"
+            JOBS_FINISHED.labels("completed").inc()
+            logger.info(f"Job {job.job_id} completed")
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+            JOBS_FINISHED.labels("failed").inc()
+        finally:
+            job.completed_at = datetime.utcnow()
+            self._prune()
+
+    def _prune(self):
+        """Forget finished jobs past their retention, then the oldest beyond `max_finished`."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        finished = sorted(
+            (job for job in self._jobs.values() if job.completed_at is not None),
+            key=lambda job: job.completed_at,
+        )
+        excess = len(finished) - self.max_finished
+        for idx, job in enumerate(finished):
+            if idx < excess or job.completed_at < cutoff:
+                del self._jobs[job.job_id]
+
+    @staticmethod
+    def _update_stage(job: JobInfo, stage_name: str, status: str):
+        """Record a stage transition reported by the pipeline."""
+        for stage in job.stages:
+            if stage.name == stage_name:
+                stage.status = status
+                if status == "running":
+                    stage.started_at = datetime.utcnow()
+                else:
+                    stage.completed_at = datetime.utcnow()
+
+        completed = sum(1 for stage in job.stages if stage.status == "completed")
+        job.progress = completed / len(job.stages)
+
+
+# Global job queue instance
+_job_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the global job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            settings.job_concurrency,
+            settings.job_max_queued,
+            retention_seconds=settings.job_retention_seconds,
+            max_finished=settings.job_max_finished,
+        )
+    return _job_queue
@@ -0,0 +1,120 @@
+"""
+Language pinning for ASR.
+Identifies the language distribution on a sample of a meeting, so the rest
+can be decoded with the language token forced instead of letting Whisper
+re-detect it for every segment.
+"""
+
+import logging
+
+from app.services.asr import ASRService
+from app.services.audio import DecodedAudio
+from app.services.packing import PackedWindow
+
+logger = logging.getLogger(__name__)
+
+
+def _average(distributions: list[tuple[dict[str, float], float]]) -> tuple[str, float]:
+    """Duration-weighted mean of language distributions; returns the top language."""
+    total_weight = sum(weight for _, weight in distributions) or 1.0
+    mean: dict[str, float] = {}
+    for probs, weight in distributions:
+        for code, prob in probs.items():
+            mean[code] = mean.get(code, 0.0) + prob * weight / total_weight
+    code = max(mean, key=mean.get)
+    return code, mean[code]
+
+
+def _detect(
+    asr_service: ASRService,
+    audio: DecodedAudio,
+    windows: list[PackedWindow],
+    indices: list[int],
+    batch_size: int,
+) -> dict[int, dict[str, float]]:
+    """Run language identification on the given windows in batches."""
+    indices = [idx for idx in indices if windows[idx].duration > 0]
+    detected = {}
+    for batch_start in range(0, len(indices), batch_size):
+        batch = indices[batch_start : batch_start + batch_size]
+        clips = [windows[idx].build_clip(audio) for idx in batch]
+        detected.update(zip(batch, asr_service.detect_languages(clips, audio.sample_rate)))
+    return detected
+
+
+def pin_languages(
+    asr_service: ASRService,
+    audio: DecodedAudio,
+    windows: list[PackedWindow],
+    mode: str = "meeting",
+    sample_size: int = 8,
+    min_probability: float = 0.8,
+    batch_size: int = 8,
+) -> list[tuple[str | None, float | None]]:
+    """
+    Decide the Whisper language for every ASR window.
+
+    The longest windows (per meeting, or per speaker) are run through
+    Whisper's language identification. Where the averaged probability of the
+    top language reaches `min_probability`, that language is pinned for the
+    group's remaining windows. Windows in groups without a confident language
+    are left to Whisper, which detects the language while decoding them.
+
+    Args:
+        asr_service: ASR service used for language identification
+        audio: Decoded audio for the whole recording
+        windows: ASR windows in time order
+        mode: "meeting" for one language overall, "speaker" for one per speaker
+        sample_size: Windows sampled per group
+        min_probability: Minimum averaged probability to pin a language
+        batch_size: Windows per language identification pass
+
+    Returns:
+        List aligned with `windows` of (language_code, probability) tuples;
+        (None, None) for windows whose language Whisper should detect itself
+    """
+
+    def group_of(window: PackedWindow) -> str | None:
+        if mode != "speaker":
+            return None
+        speakers = {segment.speaker_label for segment in window.segments}
+        # Windows mixing speakers form their own group
+        return speakers.pop() if len(speakers) == 1 else None
+
+    groups: dict[str | None, list[int]] = {}
+    for idx, window in enumerate(windows):
+        groups.setdefault(group_of(window), []).append(idx)
+
+    # Longest windows give the most reliable language ID
+    sampled = []
+    for indices in groups.values():
+        sampled.extend(sorted(indices, key=lambda idx: windows[idx].duration)[-sample_size:])
+
+    detected = _detect(asr_service, audio, windows, sampled, batch_size)
+
+    pins: dict[str | None, tuple[str, float]] = {}
+    for group, indices in groups.items():
+        samples = [(detected[idx], windows[idx].duration) for idx in indices if idx in detected]
+        if not samples:
+            continue
+        code, prob = _average(samples)
+        if prob >= min_probability:
+            pins[group] = (code, prob)
+            logger.info(f"Pinned language '{code}' ({prob:.2f}) for {group or 'meeting'}")
+        else:
+            logger.info(
+                f"No confident language for {group or 'meeting'} "
+                f"(best '{code}' at {prob:.2f}); detecting while decoding"
+            )
+
+    # Sampled windows keep the language already identified for them
+    assignments = []
+    for idx, window in enumerate(windows):
+        if idx in detected:
+            probs = detected[idx]
+            code = max(probs, key=probs.get)
+            assignments.append((code, probs[code]))
+        else:
+            assignments.append(pins.get(group_of(window), (None, None)))
+
+    return assignments
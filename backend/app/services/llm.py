@@ -4,17 +4,46 @@ Provides a generic interface for calling various LLM providers.
 """
 
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Protocol
-
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Protocol
 
 from app.config import settings
 from app.models.schemas import MeetingTranscript, SummaryResponse
+from app.services.metrics import LLM_ERRORS, LLM_SECONDS, record_llm_usage
+
+# The provider SDK is imported when a client is created, not at import time
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
 
+async def _create_completion(client: "AsyncOpenAI", operation: str, **kwargs):
+    """
+    Send a chat completion request, recording latency, token usage and errors.
+
+    Args:
+        client: OpenAI-compatible client
+        operation: Metrics label for the request, e.g. "summary" or "qa"
+        **kwargs: Arguments for `chat.completions.create`
+
+    Returns:
+        The completion response
+    """
+    start = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(**kwargs)
+    except Exception:
+        LLM_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        LLM_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+    record_llm_usage(operation, getattr(response, "usage", None))
+    return response
+
+
 class LLMClient(Protocol):
     """Protocol defining the LLM client interface."""
 
@@ -26,8 +55,151 @@ class LLMClient(Protocol):
         """Answer a question based on provided transcript context."""
         ...
 
+    async def summarize_section(self, text: str, label: str) -> str:
+        """Condense one part of a long meeting into notes for a later merge."""
+        ...
+
+    async def merge_summaries(
+        self, notes: str, speaker_info: dict[str, int], duration: float
+    ) -> SummaryResponse:
+        """Merge notes on consecutive parts of a meeting into the final summary."""
+        ...
+
 
-class DeepSeekLLMClient:
+class ChatCompletionLLMClient(ABC):
+    """
+    Base class for clients of OpenAI-compatible chat completion APIs.
+    Subclasses create `client` for their provider and set `model`; the
+    calls of the windowed (hierarchical) summary are shared.
+    """
+
+    client: "AsyncOpenAI"
+    model: str
+
+    async def summarize_section(self, text: str, label: str) -> str:
+        """
+        Condense one part of a long meeting into notes.
+
+        Args:
+            text: Transcript excerpt, or notes on several earlier parts
+            label: Which part of the meeting the text covers (e.g. a time range)
+
+        Returns:
+            Notes keeping the part's points, action items, decisions and topics
+        """
+        logger.info(f"Summarizing meeting section: {label}")
+
+        try:
+            response = await _create_completion(
+                self.client,
+                "section",
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are an expert meeting analyst. You take notes on one "
+                            "part of a long meeting; the notes are merged with notes on "
+                            "the other parts afterwards. The transcript may contain "
+                            "Cantonese and English."
+                        ),
+                    },
+                    {"role": "user", "content": self._build_section_prompt(text, label)},
+                ],
+                temperature=0.3,
+                max_tokens=1000,
+            )
+            return response.choices[0].message.content or ""
+
+        except Exception as e:
+            logger.error(f"Failed to summarize section {label}: {e}")
+            raise
+
+    async def merge_summaries(
+        self, notes: str, speaker_info: dict[str, int], duration: float
+    ) -> SummaryResponse:
+        """
+        Merge notes on consecutive parts of a meeting into the final summary.
+
+        Args:
+            notes: Section notes in meeting order
+            speaker_info: Speaking turns per speaker
+            duration: Meeting duration in seconds
+
+        Returns:
+            SummaryResponse with summary, action items, and key decisions
+        """
+        prompt = self._build_summary_prompt(
+            notes,
+            speaker_info,
+            duration,
+            source="notes on consecutive parts of a meeting",
+            heading="Notes",
+        )
+
+        try:
+            response = await _create_completion(
+                self.client,
+                "merge",
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are an expert meeting analyst. Your task is to merge "
+                            "notes on the parts of a long meeting into one clear, "
+                            "actionable summary, removing repetition. The notes may "
+                            "contain multiple languages including Cantonese and English."
+                        ),
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=2000,
+            )
+
+            summary = self._parse_summary_response(response.choices[0].message.content)
+            logger.info("Merged section summaries successfully")
+            return summary
+
+        except Exception as e:
+            logger.error(f"Failed to merge section summaries: {e}")
+            raise
+
+    def _build_section_prompt(self, text: str, label: str) -> str:
+        """Build the prompt for summarizing one part of a long meeting."""
+        return f"""Take notes on this part of a longer meeting ({label}).
+
+Keep every point that matters for the whole meeting:
+- What was discussed and concluded
+- Action items, with who should do them
+- Decisions made
+- Topics covered
+
+Be concise, use bullet points, and keep speaker labels and timestamps where useful.
+
+**Excerpt:**
+{text}
+
+**Notes:**"""
+
+    @abstractmethod
+    def _build_summary_prompt(
+        self,
+        transcript: str,
+        speaker_info: dict[str, int],
+        duration: float,
+        source: str = "meeting transcript",
+        heading: str = "Transcript",
+    ) -> str:
+        """Build the prompt for meeting summarization."""
+
+    @abstractmethod
+    def _parse_summary_response(self, content: str) -> SummaryResponse:
+        """Parse the LLM response into a structured SummaryResponse."""
+
+
+class DeepSeekLLMClient(ChatCompletionLLMClient):
     """
     LLM client implementation using DeepSeek's API.
     DeepSeek has an OpenAI-compatible API.
@@ -45,6 +217,8 @@ class DeepSeekLLMClient:
         if not self.api_key:
             raise ValueError("DeepSeek API key not provided")
 
+        from openai import AsyncOpenAI
+
         self.model = model or settings.llm_model
         # DeepSeek uses OpenAI-compatible API
         self.client = AsyncOpenAI(
@@ -73,7 +247,9 @@ class DeepSeekLLMClient:
         prompt = self._build_summary_prompt(full_text, speaker_info, transcript.duration)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await _create_completion(
+                self.client,
+                "summary",
                 model=self.model,
                 messages=[
                     {
@@ -118,9 +294,11 @@ class DeepSeekLLMClient:
         prompt = self._build_qa_prompt(transcript_context, question)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await _create_completion(
+                self.client,
+                "qa",
                 model=self.model,
-                messages=[about:blank#blocked
+                messages=[
                     {
                         "role": "system",
                         "content": (
@@ -145,7 +323,12 @@ class DeepSeekLLMClient:
             raise
 
     def _build_summary_prompt(
-        self, transcript: str, speaker_info: dict[str, int], duration: float
+        self,
+        transcript: str,
+        speaker_info: dict[str, int],
+        duration: float,
+        source: str = "meeting transcript",
+        heading: str = "Transcript",
     ) -> str:
         """Build the prompt for meeting summarization."""
         duration_min = duration / 60
@@ -154,7 +337,7 @@ class DeepSeekLLMClient:
             f"{speaker} ({turns} turns)" for speaker, turns in speaker_info.items()
         )
 
-        return f"""Please analyze the following meeting transcript and provide:
+        return f"""Please analyze the following {source} and provide:
 
 1. **Summary**: A concise 1-2 paragraph overview of the meeting
 2. **Action Items**: A bulleted list of specific action items and who should do them
@@ -165,7 +348,7 @@ class DeepSeekLLMClient:
 - Duration: {duration_min:.1f} minutes
 - Speakers: {speaker_list}
 
-**Transcript:**
+**{heading}:**
 {transcript}
 
 **Format your response as:**
@@ -255,7 +438,7 @@ TOPICS:
         )
 
 
-class OpenAILLMClient:
+class OpenAILLMClient(ChatCompletionLLMClient):
     """
     LLM client implementation using OpenAI's API.
     Supports GPT-4 and other OpenAI models.
@@ -273,6 +456,8 @@ class OpenAILLMClient:
         if not self.api_key:
             raise ValueError("OpenAI API key not provided")
 
+        from openai import AsyncOpenAI
+
         self.model = model or settings.llm_model
         self.client = AsyncOpenAI(api_key=self.api_key)
         logger.info(f"Initialized OpenAI client with model: {self.model}")
@@ -297,7 +482,9 @@ class OpenAILLMClient:
         prompt = self._build_summary_prompt(full_text, speaker_info, transcript.duration)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await _create_completion(
+                self.client,
+                "summary",
                 model=self.model,
                 messages=[
                     {
@@ -342,7 +529,9 @@ class OpenAILLMClient:
         prompt = self._build_qa_prompt(transcript_context, question)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await _create_completion(
+                self.client,
+                "qa",
                 model=self.model,
                 messages=[
                     {
@@ -369,7 +558,12 @@ class OpenAILLMClient:
             raise
 
     def _build_summary_prompt(
-        self, transcript: str, speaker_info: dict[str, int], duration: float
+        self,
+        transcript: str,
+        speaker_info: dict[str, int],
+        duration: float,
+        source: str = "meeting transcript",
+        heading: str = "Transcript",
     ) -> str:
         """Build the prompt for meeting summarization."""
         duration_min = duration / 60
@@ -378,7 +572,7 @@ class OpenAILLMClient:
             f"{speaker} ({turns} turns)" for speaker, turns in speaker_info.items()
         )
 
-        return f"""Please analyze the following meeting transcript and provide:
+        return f"""Please analyze the following {source} and provide:
 
 1. **Summary**: A concise 1-2 paragraph overview of the meeting
 2. **Action Items**: A bulleted list of specific action items and who should do them
@@ -389,7 +583,7 @@ class OpenAILLMClient:
 - Duration: {duration_min:.1f} minutes
 - Speakers: {speaker_list}
 
-**Transcript:**
+**{heading}:**
 {transcript}
 
 **Format your response as:**
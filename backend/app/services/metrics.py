@@ -0,0 +1,177 @@
+"""
+Prometheus metrics for the processing pipeline.
+Stage latencies, ASR throughput, embedding and LLM calls and cache hit
+rates are recorded here and served in Prometheus text format at /metrics.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Pipeline stages take seconds to hours
+STAGE_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+# Single model calls take milliseconds to minutes
+CALL_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Processing seconds per second of audio
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+# Texts per batched embedding call
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Pipeline
+STAGE_SECONDS = Histogram(
+    "meeting_pipeline_stage_seconds",
+    "Wall-clock time of each pipeline stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    "meeting_pipeline_stage_errors_total", "Pipeline runs that failed in a stage", ["stage"]
+)
+PIPELINE_AUDIO_SECONDS = Counter(
+    "meeting_pipeline_audio_seconds_total", "Seconds of meeting audio processed"
+)
+PIPELINE_RTF = Histogram(
+    "meeting_pipeline_real_time_factor",
+    "End-to-end processing time per second of meeting audio",
+    buckets=RTF_BUCKETS,
+)
+
+# ASR
+ASR_DECODE_SECONDS = Histogram(
+    "meeting_asr_decode_seconds",
+    "Latency of one Whisper pipeline call",
+    ["mode"],
+    buckets=CALL_BUCKETS,
+)
+ASR_AUDIO_SECONDS = Counter(
+    "meeting_asr_audio_seconds_total", "Seconds of audio decoded by Whisper", ["mode"]
+)
+ASR_SEGMENTS = Counter("meeting_asr_segments_total", "Audio clips decoded by Whisper", ["mode"])
+ASR_RTF = Histogram(
+    "meeting_asr_real_time_factor",
+    "Decode time per second of audio for one Whisper pipeline call",
+    ["mode"],
+    buckets=RTF_BUCKETS,
+)
+ASR_ERRORS = Counter(
+    "meeting_asr_errors_total", "Whisper pipeline calls that raised", ["mode"]
+)
+VAD_SEGMENT_SECONDS = Counter(
+    "meeting_vad_segment_seconds_total", "Seconds of diarized segment audio checked by VAD"
+)
+VAD_REMOVED_SECONDS = Counter(
+    "meeting_vad_removed_seconds_total", "Seconds of silence VAD trimmed before ASR"
+)
+
+# Embeddings
+EMBEDDING_SECONDS = Histogram(
+    "meeting_embedding_seconds",
+    "Latency of one embedding model call",
+    ["kind"],
+    buckets=CALL_BUCKETS,
+)
+EMBEDDING_TEXTS = Counter("meeting_embedding_texts_total", "Texts embedded", ["kind"])
+QUERY_BATCH_SIZE = Histogram(
+    "meeting_query_batch_size", "Questions encoded per micro-batched call", buckets=BATCH_BUCKETS
+)
+
+# LLM
+LLM_SECONDS = Histogram(
+    "meeting_llm_request_seconds",
+    "Latency of one LLM request",
+    ["operation"],
+    buckets=CALL_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "meeting_llm_tokens_total",
+    "LLM tokens reported by the provider",
+    ["operation", "direction"],
+)
+LLM_ERRORS = Counter("meeting_llm_errors_total", "LLM requests that failed", ["operation"])
+
+# Cross-meeting search
+SEARCH_SECONDS = Histogram(
+    "meeting_search_seconds", "Latency of one global index search", buckets=CALL_BUCKETS
+)
+SEARCH_INDEX_CHUNKS = Gauge("meeting_search_index_chunks", "Chunks in the global search index")
+
+# Caches
+CACHE_LOOKUPS = Counter(
+    "meeting_cache_lookups_total", "Cache lookups by cache and outcome", ["cache", "result"]
+)
+
+# Jobs
+JOBS_QUEUED = Gauge("meeting_jobs_queued", "Uploads waiting to be processed")
+JOBS_RUNNING = Gauge("meeting_jobs_running", "Meetings being processed")
+JOBS_FINISHED = Counter("meeting_jobs_finished_total", "Finished processing jobs", ["status"])
+
+
+@contextmanager
+def observe_asr(mode: str, audio_seconds: float, segments: int) -> Iterator[None]:
+    """
+    Time a Whisper call and record its throughput.
+
+    Args:
+        mode: "segment" for batched clips or "full" for long-form decoding
+        audio_seconds: Seconds of audio in the call
+        segments: Number of clips in the call
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ASR_ERRORS.labels(mode).inc()
+        raise
+    elapsed = time.perf_counter() - start
+    ASR_DECODE_SECONDS.labels(mode).observe(elapsed)
+    ASR_AUDIO_SECONDS.labels(mode).inc(audio_seconds)
+    ASR_SEGMENTS.labels(mode).inc(segments)
+    if audio_seconds > 0:
+        ASR_RTF.labels(mode).observe(elapsed / audio_seconds)
+
+
+@contextmanager
+def observe_embedding(kind: str, texts: int) -> Iterator[None]:
+    """
+    Time an embedding model call.
+
+    Args:
+        kind: "chunks" for transcript chunks or "query" for questions
+        texts: Number of texts embedded
+    """
+    with EMBEDDING_SECONDS.labels(kind).time():
+        yield
+    EMBEDDING_TEXTS.labels(kind).inc(texts)
+
+
+def record_llm_usage(operation: str, usage: Any):
+    """
+    Record token counts from an OpenAI-compatible response's `usage` field.
+
+    Args:
+        operation: LLM operation, e.g. "summary" or "qa"
+        usage: The response's usage object (may be None)
+    """
+    if usage is None:
+        return
+    LLM_TOKENS.labels(operation, "in").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(operation, "out").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def record_cache_lookups(cache: str, hits: int, misses: int):
+    """Record the outcome of cache lookups."""
+    CACHE_LOOKUPS.labels(cache, "hit").inc(hits)
+    CACHE_LOOKUPS.labels(cache, "miss").inc(misses)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render all metrics in Prometheus text format.
+
+    Returns:
+        Tuple of (payload, content type)
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
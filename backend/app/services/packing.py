@@ -0,0 +1,127 @@
+"""
+Segment packing for ASR.
+Merges short diarization turns into windows close to Whisper's fixed 30 s
+input so each decode carries as much speech as possible.
+"""
+
+import bisect
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.models.schemas import SpeakerSegment
+from app.services.audio import DecodedAudio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PackedWindow:
+    """
+    Consecutive speaker turns decoded together as one Whisper input.
+    The turns' audio is concatenated back to back, so gaps between turns
+    (and any other speaker talking in them) are not sent to the model.
+    """
+
+    segment_indices: list[int] = field(default_factory=list)
+    segments: list[SpeakerSegment] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Length of the concatenated window audio in seconds."""
+        return sum(segment.duration for segment in self.segments)
+
+    def add(self, idx: int, segment: SpeakerSegment):
+        """Append a turn to the window."""
+        self.segment_indices.append(idx)
+        self.segments.append(segment)
+
+    def build_clip(self, audio: DecodedAudio) -> np.ndarray:
+        """
+        Assemble the window's audio.
+
+        Args:
+            audio: Decoded audio for the whole recording
+
+        Returns:
+            Sample array for the window (a view when it holds a single turn)
+        """
+        slices = [audio.slice(segment.start_time, segment.end_time) for segment in self.segments]
+        if len(slices) == 1:
+            return slices[0]
+        return np.concatenate(slices)
+
+    def split_words(self, words: list[tuple[str, float, float | None]]) -> list[str]:
+        """
+        Split word-timestamped window output back into per-turn text.
+
+        Args:
+            words: (text, start, end) tuples with times relative to the window clip
+
+        Returns:
+            Text for each turn, in the order of `segments`
+        """
+        # Start of each turn on the concatenated clip's timeline
+        offsets = []
+        cursor = 0.0
+        for segment in self.segments:
+            offsets.append(cursor)
+            cursor += segment.duration
+
+        parts: list[list[str]] = [[] for _ in self.segments]
+        for text, start, end in words:
+            # Assign by midpoint; Whisper may leave the final word's end open
+            midpoint = (start + end) / 2 if end is not None else start
+            turn = max(0, bisect.bisect_right(offsets, midpoint) - 1)
+            parts[turn].append(text)
+
+        return ["".join(part).strip() for part in parts]
+
+
+def pack_segments(
+    segments: list[SpeakerSegment],
+    max_window: float = 30.0,
+    max_gap: float = 1.0,
+    across_speakers: bool = False,
+) -> list[PackedWindow]:
+    """
+    Group consecutive speaker turns into ASR windows.
+
+    A turn joins the open window when it starts within `max_gap` seconds of
+    the previous turn, the window stays within `max_window` seconds of
+    audio, and (unless `across_speakers`) it has the same speaker.
+
+    Args:
+        segments: Diarization segments in time order
+        max_window: Maximum seconds of audio per window
+        max_gap: Maximum silence between turns merged into one window
+        across_speakers: Also pack turns from different speakers together
+
+    Returns:
+        Windows covering every segment exactly once, in time order
+    """
+    windows: list[PackedWindow] = []
+    current: PackedWindow | None = None
+
+    for idx, segment in enumerate(segments):
+        if current is not None:
+            previous = current.segments[-1]
+            fits = (
+                segment.start_time - previous.end_time <= max_gap
+                and current.duration + segment.duration <= max_window
+                and (across_speakers or segment.speaker_label == previous.speaker_label)
+            )
+            if not fits:
+                windows.append(current)
+                current = None
+
+        if current is None:
+            current = PackedWindow()
+        current.add(idx, segment)
+
+    if current is not None:
+        windows.append(current)
+
+    logger.info(f"Packed {len(segments)} segments into {len(windows)} ASR windows")
+    return windows
@@ -3,25 +3,72 @@ Main pipeline orchestration for meeting processing.
 Coordinates diarization, ASR, RAG, and LLM services.
 """
 
+import asyncio
 import logging
+import threading
+import time
 import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-from app.config import settings
+import numpy as np
+
+from app.config import AsrMode, settings
 from app.models.schemas import (
     MeetingResult,
     MeetingTranscript,
+    SpeakerSegment,
     SummaryResponse,
     TranscriptChunk,
 )
 from app.services.asr import get_asr_service
+from app.services.asr_cache import CacheStats, get_asr_cache
+from app.services.asr_pool import ASRProcessPool, get_asr_pool
+from app.services.audio import DecodedAudio, load_audio
+from app.services.checkpoint import MeetingCheckpoint
 from app.services.diarization import get_diarization_service
+from app.services.executors import run_in_stage
+from app.services.language import pin_languages
 from app.services.llm import get_llm_client
+from app.services.metrics import (
+    PIPELINE_AUDIO_SECONDS,
+    PIPELINE_RTF,
+    STAGE_ERRORS,
+    STAGE_SECONDS,
+)
+from app.services.packing import PackedWindow, pack_segments
+from app.services.query_encoder import get_query_encoder
 from app.services.rag import RagIndex, get_rag_service
+from app.services.search import get_search_index
+from app.services.summarizer import HierarchicalSummarizer
+from app.services.vad import FRAME_SECONDS, VadStats, frame_energies, trim_segments
 
 logger = logging.getLogger(__name__)
 
+# Stages reported to progress callbacks, in pipeline order
+PIPELINE_STAGES = ("diarization", "transcription", "transcript", "indexing", "summary")
+
+# Called with (stage, status) where status is "running" or "completed"
+ProgressCallback = Callable[[str, str], None]
+
+
+@dataclass
+class WindowPlan:
+    """ASR windows for a run of speaker turns, transcribed in one or more slices."""
+
+    # Voiced turns in time order; windows refer to them by index
+    turns: list[SpeakerSegment]
+    windows: list[PackedWindow]
+    # Per window: turn results (cached, or filled in as slices are transcribed),
+    # language probability, cache key (empty with the cache off) and forced language
+    results: list[list[tuple[str, str] | None] | None]
+    probabilities: list[float | None]
+    keys: list[str]
+    languages: list[str | None]
+
 
 class MeetingPipeline:
     """
@@ -35,6 +82,7 @@ class MeetingPipeline:
     def __init__(self):
         self.diarization_service = None
         self.asr_service = None
+        self.asr_executor = None
         self.rag_service = None
         self.llm_client = None
         self._initialized = False
@@ -47,20 +95,35 @@ class MeetingPipeline:
         logger.info("Initializing meeting pipeline services...")
         self.diarization_service = get_diarization_service()
         self.asr_service = get_asr_service()
+        # Segment-mode ASR is sharded across processes when workers are configured
+        self.asr_executor = get_asr_pool() if settings.asr_workers > 1 else self.asr_service
         self.rag_service = get_rag_service()
         self.llm_client = get_llm_client()
         self._initialized = True
         logger.info("Pipeline services initialized")
 
     async def process_meeting_audio(
-        self, audio_path: str | Path, meeting_id: str | None = None
+        self,
+        audio_path: str | Path,
+        meeting_id: str | None = None,
+        asr_mode: AsrMode | None = None,
+        progress: ProgressCallback | None = None,
     ) -> tuple[MeetingResult, RagIndex]:
         """
         Process a meeting audio file through the complete pipeline.
 
+        Blocking model work runs on per-stage executors so the event loop
+        stays free to serve other requests while a meeting is processed.
+        With checkpointing enabled, each stage's output is saved under the
+        meeting's storage directory and a rerun with the same meeting ID
+        resumes from it.
+
         Args:
             audio_path: Path to the audio file
             meeting_id: Optional meeting ID (generated if not provided)
+            asr_mode: ASR strategy (defaults to settings.asr_mode)
+            progress: Optional callback notified as each of PIPELINE_STAGES
+                starts and completes
 
         Returns:
             Tuple of (MeetingResult, RagIndex)
@@ -75,36 +138,142 @@ class MeetingPipeline:
         meeting_id = meeting_id or self._generate_meeting_id()
         logger.info(f"Processing meeting {meeting_id}: {audio_path}")
 
-        # Step 1: Run diarization
-        logger.info("Step 1/5: Running speaker diarization...")
-        speaker_segments = self.diarization_service.run_diarization(audio_path)
-        logger.info(f"Found {len(speaker_segments)} speaker segments")
+        # Stage latencies are measured from the first "running" report to "completed"
+        started = time.perf_counter()
+        stage_started: dict[str, float] = {}
 
-        # Step 2: Transcribe each segment with language detection
-        logger.info("Step 2/5: Transcribing segments with language detection...")
-        transcript_chunks = await self._transcribe_segments(audio_path, speaker_segments)
-        logger.info(f"Transcribed {len(transcript_chunks)} chunks")
+        def report(stage: str, status: str):
+            if status == "running":
+                stage_started.setdefault(stage, time.perf_counter())
+            elif stage in stage_started:
+                elapsed = time.perf_counter() - stage_started.pop(stage)
+                STAGE_SECONDS.labels(stage).observe(elapsed)
+            if progress is not None:
+                progress(stage, status)
 
-        # Step 3: Build transcript structure
-        logger.info("Step 3/5: Building structured transcript...")
-        duration = max(segment.end_time for segment in speaker_segments)
-        speakers = sorted(set(segment.speaker_label for segment in speaker_segments))
+        async def run_stage(stage: str, aw: Awaitable):
+            report(stage, "running")
+            result = await aw
+            report(stage, "completed")
+            return result
 
-        transcript = MeetingTranscript(
-            meeting_id=meeting_id,
-            chunks=transcript_chunks,
-            speakers=speakers,
-            duration=duration,
-            created_at=datetime.utcnow(),
-        )
+        summarizer = None
+        try:
+            # Decode once to 16 kHz mono float32; diarization and ASR share the waveform
+            report("diarization", "running")
+            audio = await run_in_stage("diarization", load_audio, audio_path)
+
+            asr_mode = asr_mode or settings.asr_mode
+            checkpoint = None
+            if settings.pipeline_checkpointing:
+                checkpoint = MeetingCheckpoint(settings.storage_dir / meeting_id)
+                completed = await run_in_stage(
+                    "diarization", checkpoint.open, audio.content_hash, asr_mode
+                )
+                if completed:
+                    logger.info(
+                        f"Resuming meeting {meeting_id} (completed: {', '.join(completed)})"
+                    )
+
+            # Long meetings are summarized window by window while ASR is still running
+            summarizer = self._create_summarizer(checkpoint)
+            # Segments are trimmed and looked up batch by batch; report the meeting's totals once
+            vad_stats = VadStats() if settings.vad_enabled else None
+            cache_stats = CacheStats() if settings.asr_cache_enabled else None
+
+            speaker_segments = checkpoint.load_diarization() if checkpoint else None
+            embedded = None
+            streaming = settings.pipeline_streaming and asr_mode == "segment"
+            if speaker_segments is None and streaming:
+                # Steps 1-2 (and chunk embedding) overlap instead of running back to back
+                logger.info("Steps 1-2/5: Streaming diarization into ASR and embedding...")
+                report("transcription", "running")
+                speaker_segments, transcript_chunks, embedded = await self._process_streaming(
+                    audio, checkpoint, summarizer, vad_stats, cache_stats
+                )
+                report("diarization", "completed")
+                report("transcription", "completed")
+                logger.info(
+                    f"Found {len(speaker_segments)} speaker segments, "
+                    f"transcribed {len(transcript_chunks)} chunks"
+                )
+            else:
+                # Step 1: Run diarization
+                if speaker_segments is None:
+                    logger.info("Step 1/5: Running speaker diarization...")
+                    speaker_segments = await run_stage(
+                        "diarization",
+                        run_in_stage("diarization", self._diarize, audio, checkpoint),
+                    )
+                    logger.info(f"Found {len(speaker_segments)} speaker segments")
+                else:
+                    report("diarization", "completed")
+                    logger.info(
+                        f"Step 1/5: Loaded {len(speaker_segments)} segments from checkpoint"
+                    )
+
+                # Step 2: Transcribe each segment with language detection
+                logger.info(
+                    f"Step 2/5: Transcribing with language detection ({asr_mode} mode)..."
+                )
+                if asr_mode == "full":
+                    transcribe = self._transcribe_full_audio(audio, speaker_segments, checkpoint)
+                else:
+                    transcribe = self._transcribe_segments(
+                        audio, speaker_segments, checkpoint, summarizer, vad_stats, cache_stats
+                    )
+                transcript_chunks = await run_stage("transcription", transcribe)
+                logger.info(f"Transcribed {len(transcript_chunks)} chunks")
+
+            if vad_stats is not None and vad_stats.segment_seconds > 0:
+                logger.info(vad_stats.summary())
+            if cache_stats is not None and cache_stats.lookups > 0:
+                logger.info(cache_stats.summary())
+            if not transcript_chunks:
+                logger.warning(f"Meeting {meeting_id} has no transcribed speech")
+
+            # Step 3: Build transcript structure
+            logger.info("Step 3/5: Building structured transcript...")
+            report("transcript", "running")
+            duration = max(
+                (segment.end_time for segment in speaker_segments), default=audio.duration
+            )
+            speakers = sorted(set(segment.speaker_label for segment in speaker_segments))
 
-        # Step 4: Build RAG index
-        logger.info("Step 4/5: Building RAG index...")
-        rag_index = self.rag_service.build_index(transcript_chunks)
+            transcript = MeetingTranscript(
+                meeting_id=meeting_id,
+                chunks=transcript_chunks,
+                speakers=speakers,
+                duration=duration,
+                created_at=datetime.utcnow(),
+            )
 
-        # Step 5: Generate summary
-        logger.info("Step 5/5: Generating AI summary...")
-        summary = await self.llm_client.summarize_meeting(transcript)
+            # Steps 4-5: Build the RAG index on the embedding executor while the summary
+            # request is in flight; they are independent of each other
+            logger.info("Steps 4-5/5: Building RAG index and generating AI summary...")
+            report("transcript", "completed")
+            rag_index, summary = await _gather_or_cancel(
+                run_stage(
+                    "indexing",
+                    run_in_stage(
+                        "embedding", self._build_index, transcript_chunks, embedded, checkpoint
+                    ),
+                ),
+                run_stage("summary", self._summarize(transcript, checkpoint, summarizer)),
+                # Let a checkpointed stage finish and save even if the other one fails
+                cancel=checkpoint is None,
+            )
+        except BaseException:
+            for stage in stage_started:
+                STAGE_ERRORS.labels(stage).inc()
+            if summarizer is not None:
+                summarizer.cancel()
+            raise
+
+        elapsed = time.perf_counter() - started
+        PIPELINE_AUDIO_SECONDS.inc(audio.duration)
+        if audio.duration > 0:
+            PIPELINE_RTF.observe(elapsed / audio.duration)
 
         # Create result
         result = MeetingResult(
@@ -117,62 +286,590 @@ class MeetingPipeline:
         logger.info(f"Meeting {meeting_id} processing complete!")
         return result, rag_index
 
+    def _diarize(
+        self, audio: DecodedAudio, checkpoint: MeetingCheckpoint | None
+    ) -> list[SpeakerSegment]:
+        """Run diarization and checkpoint the segments."""
+        speaker_segments = self.diarization_service.run_diarization(audio)
+        if checkpoint is not None:
+            checkpoint.save_diarization(speaker_segments)
+        return speaker_segments
+
     async def _transcribe_segments(
-        self, audio_path: Path, speaker_segments: list
+        self,
+        audio: DecodedAudio,
+        speaker_segments: list,
+        checkpoint: MeetingCheckpoint | None = None,
+        summarizer: HierarchicalSummarizer | None = None,
+        vad_stats: VadStats | None = None,
+        cache_stats: CacheStats | None = None,
     ) -> list[TranscriptChunk]:
         """
         Transcribe all speaker segments with language detection.
 
+        With a checkpoint, segments transcribed by an earlier run are reused
+        and the rest are transcribed in batches that are saved (and fed to the
+        summarizer) as they finish. The remaining segments are planned as a
+        whole first, so the cache lookup and language pinning run once.
+
         Args:
-            audio_path: Path to audio file
+            audio: Decoded audio for the whole meeting
             speaker_segments: List of SpeakerSegment objects
+            checkpoint: Optional checkpoint to resume from and save to
+            summarizer: Optional summarizer fed with each transcribed batch
+            vad_stats: Optional totals to add VAD trimming to
+            cache_stats: Optional totals to add ASR cache lookups to
 
         Returns:
             List of TranscriptChunk objects
         """
-        chunks = []
+        if checkpoint is None:
+            turns = await run_in_stage(
+                "asr",
+                self._transcribe_turns,
+                audio,
+                speaker_segments,
+                None,
+                vad_stats,
+                cache_stats,
+            )
+            return [self._make_chunk(idx, *turn) for idx, turn in enumerate(turns)]
 
-        for idx, segment in enumerate(speaker_segments):
-            try:
-                # Transcribe segment with language detection
-                text, language = self.asr_service.transcribe_segment(
-                    audio_path, segment.start_time, segment.end_time
-                )
+        turns, remaining = checkpoint.split_transcribed(speaker_segments)
+        if len(remaining) < len(speaker_segments):
+            logger.info(
+                f"Resuming ASR: {len(speaker_segments) - len(remaining)}/"
+                f"{len(speaker_segments)} segments already transcribed"
+            )
+
+        if summarizer is not None:
+            summarizer.feed(self._make_chunk(0, *turn) for turn in turns)
 
-                # Create chunk
-                chunk = TranscriptChunk(
-                    chunk_id=f"chunk_{idx:04d}",
-                    speaker_label=segment.speaker_label,
-                    start_time=segment.start_time,
-                    end_time=segment.end_time,
-                    text=text,
-                    language=language,
+        if remaining:
+            energies = None
+            if settings.vad_enabled:
+                energies = await run_in_stage("asr", frame_energies, audio, FRAME_SECONDS)
+            plan = await run_in_stage(
+                "asr", self._plan_windows, audio, remaining, energies, vad_stats, cache_stats
+            )
+
+            # An interruption loses at most one batch of ASR work
+            with self._shared_audio(audio):
+                for segments, start, end in self._checkpoint_batches(remaining, plan):
+                    batch_turns = await run_in_stage(
+                        "asr", self._transcribe_batch, audio, segments, plan, checkpoint, start, end
+                    )
+                    if summarizer is not None:
+                        summarizer.feed(self._make_chunk(0, *turn) for turn in batch_turns)
+                    turns.extend(batch_turns)
+
+        checkpoint.mark_complete("transcription")
+        turns.sort(key=lambda turn: (turn[0].start_time, turn[0].end_time))
+        return [self._make_chunk(idx, *turn) for idx, turn in enumerate(turns)]
+
+    def _transcribe_batch(
+        self,
+        audio: DecodedAudio,
+        segments: list[SpeakerSegment],
+        plan: WindowPlan,
+        checkpoint: MeetingCheckpoint,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[tuple[SpeakerSegment, tuple[str, str] | None, float | None]]:
+        """Transcribe a batch of planned windows and append the result to the checkpoint."""
+        turns = self._transcribe_plan(audio, plan, start, end)
+        checkpoint.append_turns(segments, turns)
+        return turns
+
+    def _build_index(
+        self,
+        chunks: list[TranscriptChunk],
+        embedded: tuple[np.ndarray, list[list[int]]] | None,
+        checkpoint: MeetingCheckpoint | None,
+    ) -> RagIndex:
+        """Build the RAG index, reusing and saving checkpointed window embeddings."""
+        if embedded is None and checkpoint is not None:
+            embedded = checkpoint.load_embeddings(len(chunks))
+            if embedded is not None:
+                logger.info("Loaded window embeddings from checkpoint")
+
+        embeddings, windows = embedded if embedded is not None else (None, None)
+        rag_index = self.rag_service.build_index(chunks, embeddings, windows)
+        if checkpoint is not None and not checkpoint.is_complete("indexing"):
+            checkpoint.save_embeddings(rag_index.embeddings, rag_index.windows)
+        return rag_index
+
+    def _create_summarizer(
+        self, checkpoint: MeetingCheckpoint | None
+    ) -> HierarchicalSummarizer | None:
+        """Create the windowed summarizer, unless disabled or the summary is checkpointed."""
+        if not settings.summary_hierarchical:
+            return None
+        if checkpoint is not None and checkpoint.is_complete("summary"):
+            return None
+        return HierarchicalSummarizer(
+            self.llm_client,
+            window_tokens=settings.summary_window_tokens,
+            concurrency=settings.summary_concurrency,
+            gap_seconds=settings.summary_window_gap,
+        )
+
+    async def _summarize(
+        self,
+        transcript: MeetingTranscript,
+        checkpoint: MeetingCheckpoint | None,
+        summarizer: HierarchicalSummarizer | None = None,
+    ) -> SummaryResponse:
+        """Generate the summary, reusing a checkpointed one."""
+        if checkpoint is not None:
+            summary = checkpoint.load_summary()
+            if summary is not None:
+                logger.info("Loaded summary from checkpoint")
+                return summary
+
+        if not transcript.chunks:
+            # Nothing to summarize; don't ask the LLM to invent a meeting
+            summary = SummaryResponse(summary="No speech was detected in this recording.")
+        elif summarizer is not None:
+            summary = await summarizer.finish(transcript)
+        else:
+            summary = await self.llm_client.summarize_meeting(transcript)
+        if checkpoint is not None:
+            checkpoint.save_summary(summary)
+        return summary
+
+    async def _process_streaming(
+        self,
+        audio: DecodedAudio,
+        checkpoint: MeetingCheckpoint | None = None,
+        summarizer: HierarchicalSummarizer | None = None,
+        vad_stats: VadStats | None = None,
+        cache_stats: CacheStats | None = None,
+    ) -> tuple[
+        list[SpeakerSegment], list[TranscriptChunk], tuple[np.ndarray, list[list[int]]] | None
+    ]:
+        """
+        Run diarization, ASR and chunk embedding as overlapping stages.
+
+        Diarized segments flow through a bounded queue into ASR as soon as
+        they are final, and transcribed turns flow on to embedding the same
+        way, so every stage works while the one before it is still running.
+        A full queue pauses the stage feeding it. Each ASR batch is grouped
+        into retrieval windows and embedded as it arrives, so windows don't
+        span batches. Turns are put back into time order once all stages finish.
+
+        With a checkpoint, segments transcribed by an earlier run skip ASR,
+        new batches are saved as they finish, and the diarization is saved
+        at the end.
+
+        Args:
+            audio: Decoded audio for the whole meeting
+            checkpoint: Optional checkpoint to resume from and save to
+            summarizer: Optional summarizer fed with turns as they are transcribed
+            vad_stats: Optional totals to add VAD trimming to
+            cache_stats: Optional totals to add ASR cache lookups to
+
+        Returns:
+            Tuple of (speaker segments, transcript chunks, (window embeddings,
+            chunk indices of each window) or None if nothing was transcribed)
+        """
+        segment_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+        turn_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+        speaker_segments: list[SpeakerSegment] = []
+        all_turns: list[tuple] = []
+        # (window's turns, window embedding)
+        embedded: list[tuple[list[tuple], np.ndarray]] = []
+
+        # The noise floor is measured on the whole recording, so compute it once
+        energies = None
+        if settings.vad_enabled:
+            energies = await run_in_stage("asr", frame_energies, audio, FRAME_SECONDS)
+        transcribed = checkpoint.load_transcribed() if checkpoint else {}
+
+        async def diarize():
+            segments = self._iter_speaker_segments(audio)
+            # Advance the generator off the event loop; a full queue stalls diarization
+            while (segment := await run_in_stage("diarization", next, segments, None)) is not None:
+                speaker_segments.append(segment)
+                await segment_queue.put(segment)
+            await segment_queue.put(None)
+
+        async def transcribe():
+            finished = False
+            while not finished:
+                # Gather enough speech for well-filled ASR batches
+                batch: list[SpeakerSegment] = []
+                while sum(segment.duration for segment in batch) < settings.pipeline_asr_seconds:
+                    segment = await segment_queue.get()
+                    if segment is None:
+                        finished = True
+                        break
+                    batch.append(segment)
+
+                if batch and checkpoint is not None:
+                    turns, batch = checkpoint.split_transcribed(batch, transcribed)
+                    if batch:
+                        plan = await run_in_stage(
+                            "asr",
+                            self._plan_windows,
+                            audio,
+                            batch,
+                            energies,
+                            vad_stats,
+                            cache_stats,
+                        )
+                        turns += await run_in_stage(
+                            "asr", self._transcribe_batch, audio, batch, plan, checkpoint
+                        )
+                    await turn_queue.put(turns)
+                elif batch:
+                    turns = await run_in_stage(
+                        "asr",
+                        self._transcribe_turns,
+                        audio,
+                        batch,
+                        energies,
+                        vad_stats,
+                        cache_stats,
+                    )
+                    await turn_queue.put(turns)
+            await turn_queue.put(None)
+
+        async def embed():
+            while (turns := await turn_queue.get()) is not None:
+                if not turns:
+                    continue
+                turns = sorted(turns, key=lambda turn: (turn[0].start_time, turn[0].end_time))
+                chunks = [self._make_chunk(0, *turn) for turn in turns]
+                if summarizer is not None:
+                    summarizer.feed(chunks)
+                windows = self.rag_service.build_windows(chunks)
+                texts = [window.text for window in windows]
+                vectors = await run_in_stage("embedding", self.rag_service.embed_texts, texts)
+                all_turns.extend(turns)
+                embedded.extend(
+                    ([turns[idx] for idx in window.chunk_indices], vector)
+                    for window, vector in zip(windows, vectors)
                 )
 
-                chunks.append(chunk)
+        with self._shared_audio(audio):
+            await _gather_or_cancel(diarize(), transcribe(), embed())
 
-                # Log progress periodically
-                if (idx + 1) % 10 == 0:
-                    logger.info(f"Transcribed {idx + 1}/{len(speaker_segments)} segments")
+        # Ordered reassembly: batches finish in arbitrary time order
+        all_turns.sort(key=lambda turn: (turn[0].start_time, turn[0].end_time))
+        chunks = [self._make_chunk(idx, *turn) for idx, turn in enumerate(all_turns)]
+        position = {id(turn): idx for idx, turn in enumerate(all_turns)}
+        windows = sorted(
+            (
+                ([position[id(turn)] for turn in window_turns], vector)
+                for window_turns, vector in embedded
+            ),
+            key=lambda window: window[0],
+        )
+        speaker_segments.sort(key=lambda segment: segment.start_time)
+        if checkpoint is not None:
+            await run_in_stage("diarization", checkpoint.save_diarization, speaker_segments)
+            checkpoint.mark_complete("transcription")
+        if not windows:
+            return speaker_segments, chunks, None
+        embeddings = np.stack([vector for _, vector in windows])
+        return speaker_segments, chunks, (embeddings, [window for window, _ in windows])
 
-            except Exception as e:
-                logger.warning(
-                    f"Failed to transcribe segment {idx} "
-                    f"[{segment.start_time:.1f}s - {segment.end_time:.1f}s]: {e}"
+    def _iter_speaker_segments(self, audio: DecodedAudio) -> Iterator[SpeakerSegment]:
+        """Yield diarization segments, incrementally when windowed diarization applies."""
+        if settings.diarization_mode == "windowed" and audio.duration > settings.diarization_window:
+            yield from self.diarization_service.iter_diarization(audio)
+        else:
+            yield from self.diarization_service.run_diarization(audio)
+
+    def _transcribe_turns(
+        self,
+        audio: DecodedAudio,
+        speaker_segments: list[SpeakerSegment],
+        energies: np.ndarray | None = None,
+        vad_stats: VadStats | None = None,
+        cache_stats: CacheStats | None = None,
+    ) -> list[tuple[SpeakerSegment, tuple[str, str] | None, float | None]]:
+        """
+        Trim, pack and transcribe speaker segments.
+
+        Args:
+            audio: Decoded audio for the whole meeting
+            speaker_segments: Speaker segments in time order
+            energies: Precomputed VAD frame energies for the recording
+            vad_stats: Optional totals to add VAD trimming to
+            cache_stats: Optional totals to add ASR cache lookups to
+
+        Returns:
+            List of (segment, (text, language) or None, language probability),
+            one per voiced segment
+        """
+        plan = self._plan_windows(audio, speaker_segments, energies, vad_stats, cache_stats)
+        return self._transcribe_plan(audio, plan)
+
+    def _plan_windows(
+        self,
+        audio: DecodedAudio,
+        speaker_segments: list[SpeakerSegment],
+        energies: np.ndarray | None = None,
+        vad_stats: VadStats | None = None,
+        cache_stats: CacheStats | None = None,
+    ) -> WindowPlan:
+        """
+        Trim and pack speaker segments, and prepare their windows for ASR.
+
+        Cached windows take their results from the ASR cache, and the language
+        of the others is pinned here, so a meeting transcribed in several
+        batches reads the cache and identifies its language only once.
+
+        Args:
+            audio: Decoded audio for the whole meeting
+            speaker_segments: Speaker segments in time order
+            energies: Precomputed VAD frame energies for the recording
+            vad_stats: Optional totals to add VAD trimming to
+            cache_stats: Optional totals to add ASR cache lookups to
+
+        Returns:
+            Plan covering every voiced turn
+        """
+        if settings.vad_enabled:
+            # Drop silence and breaths; segments without speech get no chunk
+            speaker_segments, _ = trim_segments(
+                audio,
+                speaker_segments,
+                margin_db=settings.vad_margin_db,
+                min_speech=settings.vad_min_speech,
+                min_silence=settings.vad_min_silence,
+                padding=settings.vad_padding,
+                energies=energies,
+                stats=vad_stats,
+            )
+
+        if settings.asr_pack_segments:
+            # Decode short turns together so each ~30 s Whisper window is used fully
+            windows = pack_segments(
+                speaker_segments,
+                max_window=settings.asr_pack_max_window,
+                max_gap=settings.asr_pack_max_gap,
+                across_speakers=settings.asr_pack_across_speakers,
+            )
+        else:
+            windows = [
+                PackedWindow([idx], [segment]) for idx, segment in enumerate(speaker_segments)
+            ]
+
+        plan = WindowPlan(
+            turns=speaker_segments,
+            windows=windows,
+            results=[None] * len(windows),
+            probabilities=[None] * len(windows),
+            keys=[],
+            languages=[None] * len(windows),
+        )
+
+        cache = get_asr_cache() if settings.asr_cache_enabled else None
+        if cache is not None and windows:
+            params = self._decoding_params()
+            plan.keys = [
+                cache.make_key(
+                    audio.content_hash,
+                    [(segment.start_time, segment.end_time) for segment in window.segments],
+                    params,
                 )
-                # Create empty chunk for failed transcription
-                chunks.append(
-                    TranscriptChunk(
-                        chunk_id=f"chunk_{idx:04d}",
-                        speaker_label=segment.speaker_label,
-                        start_time=segment.start_time,
-                        end_time=segment.end_time,
-                        text="[Transcription failed]",
-                        language=None,
-                    )
+                for window in windows
+            ]
+            cached = cache.get_many(plan.keys)
+            for idx, key in enumerate(plan.keys):
+                if key in cached:
+                    plan.results[idx] = [tuple(result) for result in cached[key]["results"]]
+                    plan.probabilities[idx] = cached[key]["language_probability"]
+            if cache_stats is not None:
+                cache_stats.hits += len(cached)
+                cache_stats.lookups += len(windows)
+
+        # Identify the language up front so Whisper can skip detection per window
+        missing = [idx for idx, result in enumerate(plan.results) if result is None]
+        if missing and settings.asr_language_pinning != "off":
+            pinned = pin_languages(
+                self.asr_service,
+                audio,
+                [windows[idx] for idx in missing],
+                mode=settings.asr_language_pinning,
+                sample_size=settings.asr_language_sample_size,
+                min_probability=settings.asr_language_min_probability,
+                batch_size=settings.asr_batch_size,
+            )
+            for idx, (code, probability) in zip(missing, pinned):
+                plan.languages[idx] = code
+                plan.probabilities[idx] = probability
+
+        return plan
+
+    def _transcribe_plan(
+        self, audio: DecodedAudio, plan: WindowPlan, start: int = 0, end: int | None = None
+    ) -> list[tuple[SpeakerSegment, tuple[str, str] | None, float | None]]:
+        """
+        Transcribe a slice of a plan's windows that the cache did not cover.
+
+        Args:
+            audio: Decoded audio for the whole meeting
+            plan: Plan from `_plan_windows`
+            start: First window of the slice
+            end: End of the slice (defaults to the last window)
+
+        Returns:
+            List of (segment, (text, language) or None, language probability),
+            one per voiced turn in the slice
+        """
+        end = len(plan.windows) if end is None else end
+        missing = [idx for idx in range(start, end) if plan.results[idx] is None]
+
+        # A fully cached meeting never loads the ASR model
+        if missing:
+            results = self.asr_executor.transcribe_windows(
+                audio,
+                [plan.windows[idx] for idx in missing],
+                batch_size=settings.asr_batch_size,
+                languages=[plan.languages[idx] for idx in missing],
+            )
+
+            new_entries = {}
+            for idx, turn_results in zip(missing, results):
+                plan.results[idx] = turn_results
+                # Only cache complete windows so failures are retried next run
+                if plan.keys and all(result is not None for result in turn_results):
+                    new_entries[plan.keys[idx]] = {
+                        "results": [list(result) for result in turn_results],
+                        "language_probability": plan.probabilities[idx],
+                    }
+            if new_entries:
+                get_asr_cache().put_many(new_entries)
+
+        # Flatten per-window results back into turn order
+        turns = []
+        for idx in range(start, end):
+            probability = plan.probabilities[idx]
+            for turn, result in zip(plan.windows[idx].segment_indices, plan.results[idx]):
+                turns.append(
+                    (plan.turns[turn], result, probability if result is not None else None)
                 )
+        return turns
+
+    @staticmethod
+    def _checkpoint_batches(
+        segments: list[SpeakerSegment], plan: WindowPlan
+    ) -> Iterator[tuple[list[SpeakerSegment], int, int]]:
+        """
+        Split a plan into the batches that are transcribed and checkpointed together.
+
+        Each batch holds enough windows to give every ASR worker a full Whisper
+        batch, and at least `pipeline_asr_seconds` of audio. Batches only end
+        between windows cut from different diarization segments, because a
+        segment is checkpointed as a whole.
+
+        Args:
+            segments: Diarization segments the plan was made from, in time order
+            plan: Plan from `_plan_windows`
 
-        return chunks
+        Yields:
+            (diarization segments, first window, end window) tuples that
+            together cover every segment and window once
+        """
+        # Trimming keeps segment order, so each turn's source is found by walking forward
+        sources = []
+        source = 0
+        for turn in plan.turns:
+            while not (
+                segments[source].speaker_label == turn.speaker_label
+                and segments[source].start_time <= turn.start_time + 1e-6
+                and turn.end_time <= segments[source].end_time + 1e-6
+            ):
+                source += 1
+            sources.append(source)
+
+        min_windows = settings.asr_batch_size * settings.asr_workers
+        first_segment, first_window, seconds = 0, 0, 0.0
+        for idx, window in enumerate(plan.windows[:-1]):
+            seconds += window.duration
+            boundary = sources[plan.windows[idx + 1].segment_indices[0]]
+            if (
+                idx + 1 - first_window >= min_windows
+                and seconds >= settings.pipeline_asr_seconds
+                and boundary != sources[window.segment_indices[-1]]
+            ):
+                yield segments[first_segment:boundary], first_window, idx + 1
+                first_segment, first_window, seconds = boundary, idx + 1, 0.0
+        yield segments[first_segment:], first_window, len(plan.windows)
+
+    def _shared_audio(self, audio: DecodedAudio) -> AbstractContextManager:
+        """Share the waveform with ASR worker processes once for all of a meeting's batches."""
+        if isinstance(self.asr_executor, ASRProcessPool):
+            return self.asr_executor.shared_audio(audio)
+        return nullcontext()
+
+    @staticmethod
+    def _make_chunk(
+        idx: int,
+        segment: SpeakerSegment,
+        result: tuple[str, str] | None,
+        language_probability: float | None,
+    ) -> TranscriptChunk:
+        """Build the transcript chunk for one transcribed speaker turn."""
+        # Failed segments keep their slot so chunk IDs stay aligned with segments
+        text, language = result if result is not None else ("[Transcription failed]", None)
+        return TranscriptChunk(
+            chunk_id=f"chunk_{idx:04d}",
+            speaker_label=segment.speaker_label,
+            start_time=segment.start_time,
+            end_time=segment.end_time,
+            text=text,
+            language=language,
+            language_probability=language_probability,
+        )
+
+    def _decoding_params(self) -> dict:
+        """Settings that change ASR output, used to key cached transcriptions."""
+        return {
+            "model": settings.asr_model,
+            "backend": settings.asr_backend,
+            "task": "transcribe",
+            "language_pinning": settings.asr_language_pinning,
+            "language_sample_size": settings.asr_language_sample_size,
+            "language_min_probability": settings.asr_language_min_probability,
+        }
+
+    async def _transcribe_full_audio(
+        self,
+        audio: DecodedAudio,
+        speaker_segments: list,
+        checkpoint: MeetingCheckpoint | None = None,
+    ) -> list[TranscriptChunk]:
+        """
+        Transcribe the whole recording in one pass and align it to speakers.
+
+        Args:
+            audio: Decoded audio for the whole meeting
+            speaker_segments: List of SpeakerSegment objects
+            checkpoint: Optional checkpoint; the single pass is reused or saved whole
+
+        Returns:
+            List of TranscriptChunk objects, one per speaker turn with speech
+        """
+        if checkpoint is not None:
+            turns, remaining = checkpoint.split_transcribed(speaker_segments)
+            if not remaining:
+                logger.info("Loaded full-audio transcription from checkpoint")
+                return [self._make_chunk(idx, *turn) for idx, turn in enumerate(turns)]
+
+        aligned = await run_in_stage(
+            "asr", self.asr_service.transcribe_full_audio_by_speaker, audio, speaker_segments
+        )
+        turns = [(segment, (text, language), None) for segment, text, language in aligned]
+        if checkpoint is not None:
+            checkpoint.append_turns(speaker_segments, turns)
+            checkpoint.mark_complete("transcription")
+
+        return [self._make_chunk(idx, *turn) for idx, turn in enumerate(turns)]
 
     async def answer_question(
         self, rag_index: RagIndex, question: str, top_k: int = 5
@@ -193,8 +890,11 @@ class MeetingPipeline:
 
         logger.info(f"Answering question: {question[:50]}...")
 
+        # Encode the question (cached, and batched with concurrent questions)
+        query_embedding = await get_query_encoder().encode(question)
+
         # Query RAG index for relevant chunks
-        relevant_chunks = self.rag_service.query_index(rag_index, question, top_k=top_k)
+        relevant_chunks = await run_in_stage("query", rag_index.query, query_embedding, top_k)
 
         # Build context string
         context = "\n\n".join(chunk.to_context_string() for chunk in relevant_chunks)
@@ -234,6 +934,18 @@ class MeetingPipeline:
         # Save RAG index
         rag_index.save(meeting_dir / "rag_index")
 
+        # The meeting is complete on disk; its stage checkpoints are no longer needed
+        MeetingCheckpoint(meeting_dir).discard()
+
+        # Add to the cross-meeting search index; a failure here doesn't lose the meeting
+        if settings.search_enabled:
+            try:
+                get_search_index().add_meeting(
+                    meeting_id, rag_index.window_chunks(), rag_index.embeddings
+                )
+            except Exception as e:
+                logger.error(f"Failed to add {meeting_id} to the search index: {e}", exc_info=True)
+
         logger.info(f"Saved meeting data to {meeting_dir}")
         return meeting_dir
 
@@ -277,24 +989,58 @@ class MeetingPipeline:
 
     def _generate_meeting_id(self) -> str:
         """Generate a unique meeting ID."""
-        return f"meeting_{uuid.uuid4().hex[:12]}"
+        return generate_meeting_id()
+
+
+def generate_meeting_id() -> str:
+    """Generate a unique meeting ID."""
+    return f"meeting_{uuid.uuid4().hex[:12]}"
+
+
+async def _gather_or_cancel(*aws: Awaitable, cancel: bool = True) -> list:
+    """
+    Run awaitables concurrently and return their results in order.
+
+    If one fails, its exception is re-raised unchanged. By default the
+    others are cancelled first (work already handed to a thread finishes in
+    the background, but its result is discarded); with `cancel=False` they
+    are allowed to finish, e.g. so they can checkpoint their output.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            if cancel:
+                task.cancel()
+        # Let cancelled tasks unwind before propagating the error
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 # Global pipeline instance
 _pipeline: MeetingPipeline | None = None
+_pipeline_lock = threading.Lock()
 
 
 def get_pipeline() -> MeetingPipeline:
     """Get or create the global pipeline instance."""
     global _pipeline
     if _pipeline is None:
-        _pipeline = MeetingPipeline()
-        _pipeline.initialize()
+        # Startup warm-up and request threads may ask at once; load only once
+        with _pipeline_lock:
+            if _pipeline is None:
+                instance = MeetingPipeline()
+                instance.initialize()
+                _pipeline = instance
     return _pipeline
 
 
 async def process_meeting_audio(
-    audio_path: str | Path, meeting_id: str | None = None
+    audio_path: str | Path,
+    meeting_id: str | None = None,
+    asr_mode: AsrMode | None = None,
+    progress: ProgressCallback | None = None,
 ) -> tuple[MeetingResult, RagIndex]:
     """
     Convenience function to process a meeting audio file.
@@ -302,10 +1048,12 @@ async def process_meeting_audio(
     Args:
         audio_path: Path to audio file
         meeting_id: Optional meeting ID
+        asr_mode: Optional ASR strategy override
+        progress: Optional stage progress callback
 
     Returns:
         Tuple of (MeetingResult, RagIndex)
     """
-    pipeline = get_pipeline()
-    return await pipeline.process_meeting_audio(audio_path, meeting_id)
+    pipeline = await asyncio.to_thread(get_pipeline)
+    return await pipeline.process_meeting_audio(audio_path, meeting_id, asr_mode, progress)
 
@@ -0,0 +1,159 @@
+"""
+Question encoding for Q&A and search.
+Question embeddings are cached (LRU) by normalized text, and questions
+that arrive within a few milliseconds of each other are encoded in one
+embedding model call, so bursts of concurrent requests share a forward
+pass instead of queueing for one each.
+"""
+
+import asyncio
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from app.config import settings
+from app.services.executors import run_in_stage
+from app.services.metrics import QUERY_BATCH_SIZE, record_cache_lookups
+from app.services.rag import get_rag_service
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a question so trivially different spellings share an embedding.
+
+    Applies Unicode NFKC (full-width to half-width forms, as typed with CJK
+    input methods) and collapses whitespace.
+
+    Args:
+        text: Question text
+
+    Returns:
+        Normalized text, which is also what gets embedded
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class QueryEncoder:
+    """
+    Encodes questions with an LRU cache and asynchronous micro-batching.
+
+    A question that misses the cache waits up to `query_batch_wait_ms` for
+    others to join its batch (or until `query_batch_max_size` are waiting);
+    the batch is then encoded with one model call on the query executor.
+    Identical questions waiting or in flight share a single encoding.
+    Must be used from the event loop.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache and batch."""
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        # Normalized question -> futures of the requests waiting for it
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._in_flight: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def encode(self, question: str) -> np.ndarray:
+        """
+        Get the embedding of a question.
+
+        Args:
+            question: Question or search query
+
+        Returns:
+            Embedding vector (read-only; shared with the cache)
+        """
+        key = normalize_query(question)
+        vector = self._cache.get(key)
+        hit = vector is not None
+        record_cache_lookups("query_embedding", hits=int(hit), misses=int(not hit))
+        if hit:
+            self._cache.move_to_end(key)
+            return vector
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Waiters from a previous event loop can never be resolved
+            self._loop, self._pending, self._in_flight, self._timer = loop, {}, {}, None
+
+        future = loop.create_future()
+        waiters = self._in_flight.get(key)
+        if waiters is not None:
+            waiters.append(future)
+        else:
+            self._pending.setdefault(key, []).append(future)
+            if len(self._pending) >= settings.query_batch_max_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(settings.query_batch_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        """Send the waiting questions to the encoder as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self._in_flight.update(batch)
+        task = asyncio.create_task(self._encode_batch(list(batch)))
+        # Keep a reference so the task isn't garbage-collected mid-flight
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _encode_batch(self, keys: list[str]):
+        """Encode a batch and resolve everyone waiting on it."""
+        QUERY_BATCH_SIZE.observe(len(keys))
+        try:
+            vectors = await run_in_stage("query", _embed_queries, keys)
+        except Exception as e:
+            logger.error(f"Failed to encode {len(keys)} questions: {e}")
+            for key in keys:
+                for future in self._in_flight.pop(key, []):
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, vector in zip(keys, vectors):
+            vector = np.ascontiguousarray(vector, dtype=np.float32)
+            vector.setflags(write=False)
+            self._store(key, vector)
+            for future in self._in_flight.pop(key, []):
+                # A cancelled request no longer waits for its result
+                if not future.done():
+                    future.set_result(vector)
+
+    def _store(self, key: str, vector: np.ndarray):
+        """Add an embedding to the cache, evicting the least recently used."""
+        if settings.query_cache_size == 0:
+            return
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.query_cache_size:
+            self._cache.popitem(last=False)
+
+
+def _embed_queries(texts: list[str]) -> np.ndarray:
+    """Embed questions with the shared embedding model (runs on the query executor)."""
+    return get_rag_service().embed_queries(texts)
+
+
+# Global encoder instance
+_query_encoder: QueryEncoder | None = None
+
+
+def get_query_encoder() -> QueryEncoder:
+    """Get or create the global query encoder instance."""
+    global _query_encoder
+    if _query_encoder is None:
+        _query_encoder = QueryEncoder()
+    return _query_encoder
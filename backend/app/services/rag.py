@@ -4,37 +4,76 @@ Builds vector index over transcript chunks and enables semantic search.
 """
 
 import logging
+import threading
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-from app.config import settings
+from app.config import RagIndexType, settings
 from app.models.schemas import TranscriptChunk
+from app.services.chunking import RetrievalWindow, build_windows, merge_chunks
+from app.services.fileio import load_json, save_json, save_npy, write_atomic
+from app.services.metrics import observe_embedding
+from app.services.tokens import estimate_tokens
+
+# faiss and sentence-transformers are imported on first use, not at import time
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Version 1 stored only the FAISS index and chunks; version 2 adds meta.json
+# and the raw embedding matrix; version 3 embeds retrieval windows of turns
+RAG_INDEX_FORMAT_VERSION = 3
+# Older versions still load (one vector per turn)
+SUPPORTED_FORMAT_VERSIONS = (2, 3)
+# PQ needs enough vectors to train its codebooks; smaller meetings use SQ8
+PQ_MIN_CHUNKS = 64
+
 
 class RagIndex:
     """
     Vector index for transcript chunks using FAISS.
     Supports semantic search over meeting transcripts.
+
+    Vectors embed retrieval windows of consecutive chunks (see
+    `chunking.build_windows`). A query returns chunks of the closest
+    windows, so results are individual turns with their own speakers and
+    timestamps.
+
+    With a compressed index type, the index holds quantized codes and the
+    full-precision embeddings are only read to re-rank candidates. Once the
+    index is saved, both are memory-mapped from disk rather than held in RAM.
     """
 
-    def __init__(self, chunks: list[TranscriptChunk], embeddings: np.ndarray, index: Any):
+    def __init__(
+        self,
+        chunks: list[TranscriptChunk],
+        embeddings: np.ndarray,
+        index: Any,
+        index_type: RagIndexType = "flat",
+        windows: list[list[int]] | None = None,
+    ):
         """
         Initialize RAG index.
 
         Args:
             chunks: List of transcript chunks
-            embeddings: Embedding vectors for chunks
+            embeddings: Embedding vectors, one per window
             index: FAISS index object
+            index_type: How `index` stores vectors (see `create_index`)
+            windows: Chunk indices of each vector's window (default: one chunk each)
         """
         self.chunks = chunks
         self.embeddings = embeddings
         self.index = index
+        self.index_type = index_type
+        self.windows = windows if windows is not None else [[idx] for idx in range(len(chunks))]
+
+    def window_chunks(self) -> list[TranscriptChunk]:
+        """One chunk per vector, spanning its window's turns (for cross-meeting search)."""
+        return [merge_chunks([self.chunks[idx] for idx in window]) for window in self.windows]
 
     def query(self, query_embedding: np.ndarray, top_k: int = 5) -> list[TranscriptChunk]:
         """
@@ -42,72 +81,286 @@ class RagIndex:
 
         Args:
             query_embedding: Query vector
-            top_k: Number of results to return
+            top_k: Number of chunks to return
 
         Returns:
-            List of most relevant transcript chunks
+            Up to `top_k` chunks of the closest windows, closest window first
+            and each window's chunks in time order (chunks shared by
+            overlapping windows appear once)
         """
+        if not self.windows:
+            return []
+
         # Ensure query is 2D array
         if query_embedding.ndim == 1:
             query_embedding = query_embedding.reshape(1, -1)
+        query_embedding = query_embedding.astype("float32")
 
-        # Search the index
-        distances, indices = self.index.search(query_embedding.astype("float32"), top_k)
+        # Compressed indexes fetch extra candidates and re-rank them exactly
+        rerank = self.index_type != "flat" and settings.rag_rerank_factor > 1
+        candidates = top_k * settings.rag_rerank_factor if rerank else top_k
 
-        # Return corresponding chunks
-        results = []
-        for idx in indices[0]:
-            if idx < len(self.chunks):
-                results.append(self.chunks[idx])
+        # Search the index (-1 marks missing results when there are few windows)
+        distances, indices = self.index.search(query_embedding, min(candidates, len(self.windows)))
+        ids = [int(idx) for idx in indices[0] if 0 <= idx < len(self.windows)]
+        if rerank:
+            ids = exact_rerank(self.embeddings, query_embedding[0], ids)
 
-        return results
+        # Chunks by window rank, then time order (chunks shared by overlapping windows once)
+        chunk_ids = list(
+            dict.fromkeys(idx for window in ids[:top_k] for idx in self.windows[window])
+        )
+        # Turns too short to be embedded in a window ("OK.") are not worth a citation
+        chunk_ids = [
+            idx
+            for idx in chunk_ids
+            if estimate_tokens(self.chunks[idx].text) >= settings.rag_chunk_min_tokens
+        ] or chunk_ids
+        return [self.chunks[idx] for idx in chunk_ids[:top_k]]
 
     def save(self, path: Path):
-        """Save the index to disk."""
-        path.mkdir(parents=True, exist_ok=True)
+        """
+        Save the index to disk.
 
-        # Save FAISS index
-        index_path = path / "faiss.index"
-        faiss.write_index(self.index, str(index_path))
+        Every file is written to a temporary sibling and swapped in, so
+        readers that memory-mapped the previous version keep a valid mapping.
+        meta.json is written last and marks the directory as complete.
+        Afterwards the index and embeddings are re-opened as memory maps of
+        the saved files, releasing the in-memory copies.
 
-        # Save chunks as JSON
-        import json
+        Args:
+            path: Index directory (created if missing)
+        """
+        import faiss
+
+        path.mkdir(parents=True, exist_ok=True)
+        embeddings = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+
+        write_atomic(path / "faiss.index", lambda tmp: faiss.write_index(self.index, tmp))
+        write_atomic(path / "embeddings.npy", lambda tmp: save_npy(tmp, embeddings))
 
-        chunks_path = path / "chunks.json"
         chunks_data = [chunk.model_dump() for chunk in self.chunks]
-        with open(chunks_path, "w", encoding="utf-8") as f:
-            json.dump(chunks_data, f, ensure_ascii=False, indent=2)
+        write_atomic(path / "chunks.json", lambda tmp: save_json(tmp, chunks_data, indent=2))
+        write_atomic(path / "windows.json", lambda tmp: save_json(tmp, self.windows))
+
+        meta = {
+            "format_version": RAG_INDEX_FORMAT_VERSION,
+            "embedding_model": settings.embedding_model,
+            "index_type": self.index_type,
+            "num_chunks": len(self.chunks),
+            "num_vectors": len(self.windows),
+            "dimension": int(embeddings.shape[1]),
+        }
+        write_atomic(path / "meta.json", lambda tmp: save_json(tmp, meta, indent=2))
+
+        self.embeddings = np.load(path / "embeddings.npy", mmap_mode="r")
+        self.index = faiss.read_index(str(path / "faiss.index"), _mmap_flags())
 
         logger.info(f"Saved RAG index to {path}")
 
     @classmethod
-    def load(cls, path: Path, embedding_model: "SentenceTransformer") -> "RagIndex":
-        """Load an index from disk."""
-        import json
+    def load(
+        cls, path: Path, embedding_model: "SentenceTransformer | None" = None
+    ) -> "RagIndex":
+        """
+        Load an index from disk.
 
-        # Load FAISS index
-        index_path = path / "faiss.index"
-        index = faiss.read_index(str(index_path))
+        The embedding matrix and the FAISS index are memory-mapped, so a load
+        reads only the chunk metadata and runs no model inference. Indexes
+        saved before format version 2 have no stored embeddings; they are
+        re-encoded once and rewritten in the current format.
 
-        # Load chunks
-        chunks_path = path / "chunks.json"
-        with open(chunks_path, "r", encoding="utf-8") as f:
-            chunks_data = json.load(f)
-        chunks = [TranscriptChunk(**chunk) for chunk in chunks_data]
+        Args:
+            path: Index directory written by `save`
+            embedding_model: Model used to re-encode chunks of legacy indexes
+
+        Returns:
+            The loaded RagIndex
 
-        # Regenerate embeddings (could also save/load these)
-        texts = [chunk.text for chunk in chunks]
-        embeddings = embedding_model.encode(texts, show_progress_bar=False)
+        Raises:
+            ValueError: If the format version is unsupported, the files
+                disagree, or a legacy index is loaded without a model
+        """
+        import faiss
+
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            return cls._migrate_legacy(path, embedding_model)
+
+        meta = load_json(meta_path)
+        version = meta.get("format_version")
+        if version not in SUPPORTED_FORMAT_VERSIONS:
+            raise ValueError(f"Unsupported RAG index format version {version} in {path}")
+        if meta.get("embedding_model") != settings.embedding_model:
+            logger.warning(
+                f"RAG index at {path} was built with {meta.get('embedding_model')}, "
+                f"not {settings.embedding_model}; retrieval quality may suffer"
+            )
+
+        chunks, windows = load_chunks(path, meta)
+        embeddings = np.load(path / "embeddings.npy", mmap_mode="r")
+        index = faiss.read_index(str(path / "faiss.index"), _mmap_flags())
+
+        if len(chunks) != meta.get("num_chunks") or not (
+            len(windows) == len(embeddings) == index.ntotal
+        ):
+            raise ValueError(
+                f"RAG index at {path} is inconsistent: {len(chunks)} chunks, "
+                f"{len(windows)} windows, {len(embeddings)} embeddings, "
+                f"{index.ntotal} indexed vectors"
+            )
 
         logger.info(f"Loaded RAG index from {path}")
-        return cls(chunks, embeddings, index)
+        return cls(chunks, embeddings, index, meta.get("index_type", "flat"), windows)
+
+    @classmethod
+    def _migrate_legacy(
+        cls, path: Path, embedding_model: "SentenceTransformer | None"
+    ) -> "RagIndex":
+        """Load a format 1 index (FAISS index and chunks only) and upgrade it in place."""
+        import faiss
+
+        if embedding_model is None:
+            raise ValueError(f"RAG index at {path} predates stored embeddings; a model is required")
+
+        logger.info(f"Migrating legacy RAG index at {path}")
+        index = faiss.read_index(str(path / "faiss.index"))
+        chunks = [TranscriptChunk(**chunk) for chunk in load_json(path / "chunks.json")]
+        embeddings = embedding_model.encode(
+            [chunk.text for chunk in chunks], show_progress_bar=False, convert_to_numpy=True
+        )
+        rag_index = cls(chunks, embeddings.astype(np.float32), index)
+
+        try:
+            rag_index.save(path)
+        except OSError as e:
+            # Still usable; the migration is retried on the next load
+            logger.warning(f"Could not upgrade legacy RAG index at {path}: {e}")
+            return rag_index
+        return cls.load(path)
+
+
+def load_chunks(path: Path, meta: dict) -> tuple[list[TranscriptChunk], list[list[int]]]:
+    """
+    Read a saved index's chunks and retrieval windows.
+
+    Args:
+        path: Index directory written by `RagIndex.save`
+        meta: The directory's meta.json
+
+    Returns:
+        Tuple of (chunks, chunk indices of each vector's window)
+    """
+    chunks = [TranscriptChunk(**chunk) for chunk in load_json(path / "chunks.json")]
+    if meta.get("format_version", 0) < 3:
+        # One vector per chunk
+        return chunks, [[idx] for idx in range(len(chunks))]
+    return chunks, load_json(path / "windows.json")
+
+
+def create_index(index_type: RagIndexType, vectors: np.ndarray) -> tuple[Any, RagIndexType]:
+    """
+    Create, train and fill a FAISS index (L2 distance) of the given type.
+
+    Args:
+        index_type: "flat" (exact float32), "fp16", "sq8" (8-bit scalar
+            quantization) or "pq" (product quantization, `rag_pq_bytes` per vector)
+        vectors: Vectors to index, one row per chunk
+
+    Returns:
+        Tuple of (index, type actually used); PQ falls back to SQ8 for
+        meetings too small to train codebooks on
+    """
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if index_type == "pq" and len(vectors) < PQ_MIN_CHUNKS:
+        index_type = "sq8"
+    index = faiss.index_factory(vectors.shape[1], faiss_storage(index_type, vectors))
+    train_index(index, vectors)
+    index.add(vectors)
+    return index, index_type
+
+
+def faiss_storage(index_type: RagIndexType, vectors: np.ndarray) -> str:
+    """
+    FAISS index factory string for a vector storage type.
+
+    Args:
+        index_type: Storage type
+        vectors: Training vectors, which size the PQ codebooks
+
+    Returns:
+        Factory string such as "SQ8" or "PQ48x8np"
+    """
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "fp16":
+        return "SQfp16"
+    if index_type == "sq8":
+        return "SQ8"
+
+    dimension = vectors.shape[1]
+    # Sub-quantizers must divide the dimension; use the largest that fits the byte budget
+    sub_quantizers = max(m for m in range(1, settings.rag_pq_bytes + 1) if dimension % m == 0)
+    # k-means needs at least as many vectors as centroids
+    bits = min(8, int(np.log2(len(vectors))))
+    # "np": skip polysemous training, which only speeds up Hamming-distance search
+    return f"PQ{sub_quantizers}x{bits}np"
+
+
+def exact_rerank(vectors: np.ndarray, query: np.ndarray, ids: list[int]) -> list[int]:
+    """
+    Order candidate rows by exact L2 distance to the query.
+
+    Args:
+        vectors: Full-precision vectors (may be memory-mapped; only `ids` are read)
+        query: Query vector
+        ids: Candidate row indices
+
+    Returns:
+        `ids` sorted closest first
+    """
+    if not ids:
+        return ids
+    rows = np.asarray(vectors[np.sort(ids)], dtype=np.float32)
+    order = np.argsort(((rows - query) ** 2).sum(axis=1))
+    return [int(idx) for idx in np.sort(ids)[order]]
+
+
+def train_index(index: Any, vectors: np.ndarray):
+    """
+    Train an index's quantizer, if it needs training.
+
+    Args:
+        index: FAISS index, possibly an HNSW index over quantized storage
+        vectors: Training vectors
+    """
+    import faiss
+
+    if index.is_trained:
+        return
+    pq_index = faiss.downcast_index(getattr(index, "storage", None) or index)
+    if hasattr(pq_index, "pq"):
+        # Codebooks are sized so every centroid gets at least one vector;
+        # silence FAISS's per-codebook warning about small training sets
+        pq_index.pq.cp.min_points_per_centroid = 1
+    index.train(vectors)
+
+
+def _mmap_flags() -> int:
+    """FAISS read flags that map flat index storage instead of copying it."""
+    import faiss
+
+    # IO_FLAG_MMAP_IFC maps flat codes; older FAISS versions only map IVF lists
+    return getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
 
 
 class RAGService:
     """Service for building and querying RAG indices over transcripts."""
 
     def __init__(self):
-        self.embedding_model: SentenceTransformer | None = None
+        self.embedding_model: "SentenceTransformer | None" = None
         self._initialized = False
 
     def initialize(self):
@@ -117,6 +370,8 @@ class RAGService:
 
         logger.info(f"Loading embedding model: {settings.embedding_model}")
         try:
+            from sentence_transformers import SentenceTransformer
+
             self.embedding_model = SentenceTransformer(settings.embedding_model)
             self._initialized = True
             logger.info("Embedding model loaded successfully")
@@ -124,12 +379,21 @@ class RAGService:
             logger.error(f"Failed to load embedding model: {e}")
             raise
 
-    def build_index(self, chunks: list[TranscriptChunk]) -> RagIndex:
+    def build_index(
+        self,
+        chunks: list[TranscriptChunk],
+        embeddings: np.ndarray | None = None,
+        windows: list[list[int]] | None = None,
+    ) -> RagIndex:
         """
         Build a FAISS index from transcript chunks.
 
         Args:
             chunks: List of transcript chunks to index
+            embeddings: Precomputed window embeddings (windows are grouped and
+                embedded here if omitted)
+            windows: Chunk indices of each precomputed embedding's window
+                (one chunk each if omitted)
 
         Returns:
             RagIndex object for querying
@@ -138,26 +402,51 @@ class RAGService:
             self.initialize()
 
         if not chunks:
-            raise ValueError("Cannot build index from empty chunks list")
+            # A recording without speech gets an index that returns nothing
+            logger.info("Building empty RAG index (no transcript chunks)")
+            dimension = self.embedding_model.get_sentence_embedding_dimension()
+            embeddings = np.zeros((0, dimension), dtype=np.float32)
+            index, index_type = create_index("flat", embeddings)
+            return RagIndex(chunks, embeddings, index, index_type, [])
 
         logger.info(f"Building RAG index from {len(chunks)} chunks")
 
-        # Extract text from chunks
-        texts = [chunk.text for chunk in chunks]
+        # Group turns into retrieval windows and embed them
+        if embeddings is None:
+            retrieval_windows = self.build_windows(chunks)
+            windows = [window.chunk_indices for window in retrieval_windows]
+            embeddings = self.embed_texts([window.text for window in retrieval_windows])
 
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(
-            texts, show_progress_bar=True, convert_to_numpy=True
+        # Create FAISS index (L2 distance)
+        index, index_type = create_index(settings.rag_index_type, embeddings)
+
+        logger.info(
+            f"RAG index built with {index.ntotal} vectors over {len(chunks)} chunks ({index_type})"
         )
 
-        # Create FAISS index
-        dimension = embeddings.shape[1]
-        index = faiss.IndexFlatL2(dimension)  # L2 distance
-        index.add(embeddings.astype("float32"))
+        return RagIndex(chunks, embeddings, index, index_type, windows)
+
+    def build_windows(self, chunks: list[TranscriptChunk]) -> list[RetrievalWindow]:
+        """
+        Group chunks into retrieval windows sized for the embedding model.
 
-        logger.info(f"RAG index built with {index.ntotal} vectors")
+        Args:
+            chunks: Transcript chunks in time order
 
-        return RagIndex(chunks, embeddings, index)
+        Returns:
+            Windows of at most `rag_chunk_max_tokens` (or the model's input length)
+        """
+        max_tokens = settings.rag_chunk_max_tokens
+        # Text past the model's input length would be truncated, not embedded
+        model_limit = getattr(self.embedding_model, "max_seq_length", None)
+        if isinstance(model_limit, int) and model_limit > 0:
+            max_tokens = min(max_tokens, model_limit)
+        return build_windows(
+            chunks,
+            max_tokens=max_tokens,
+            overlap_tokens=settings.rag_chunk_overlap_tokens,
+            min_tokens=settings.rag_chunk_min_tokens,
+        )
 
     def query_index(
         self, index: RagIndex, question: str, top_k: int = 5
@@ -179,7 +468,8 @@ class RAGService:
         logger.debug(f"Querying RAG index: {question[:50]}...")
 
         # Encode the question
-        query_embedding = self.embedding_model.encode([question], convert_to_numpy=True)
+        with observe_embedding("query", 1):
+            query_embedding = self.embedding_model.encode([question], convert_to_numpy=True)
 
         # Query the index
         results = index.query(query_embedding, top_k=top_k)
@@ -187,6 +477,40 @@ class RAGService:
         logger.debug(f"Found {len(results)} relevant chunks")
         return results
 
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        """
+        Generate embeddings for several text strings.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of embedding vectors, one row per text
+        """
+        if not self._initialized:
+            self.initialize()
+
+        with observe_embedding("chunks", len(texts)):
+            return self.embedding_model.encode(
+                texts, show_progress_bar=len(texts) > 100, convert_to_numpy=True
+            )
+
+    def embed_queries(self, texts: list[str]) -> np.ndarray:
+        """
+        Generate embeddings for a batch of questions or search queries.
+
+        Args:
+            texts: Queries to embed
+
+        Returns:
+            Array of embedding vectors, one row per query
+        """
+        if not self._initialized:
+            self.initialize()
+
+        with observe_embedding("query", len(texts)):
+            return self.embedding_model.encode(texts, convert_to_numpy=True)
+
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a text string.
@@ -200,19 +524,25 @@ class RAGService:
         if not self._initialized:
             self.initialize()
 
-        return self.embedding_model.encode([text], convert_to_numpy=True)[0]
+        with observe_embedding("query", 1):
+            return self.embedding_model.encode([text], convert_to_numpy=True)[0]
 
 
 # Global service instance
 _rag_service: RAGService | None = None
+_rag_service_lock = threading.Lock()
 
 
 def get_rag_service() -> RAGService:
     """Get or create the global RAG service instance."""
     global _rag_service
     if _rag_service is None:
-        _rag_service = RAGService()
-        _rag_service.initialize()
+        # Startup warm-up and request threads may ask at once; load only once
+        with _rag_service_lock:
+            if _rag_service is None:
+                instance = RAGService()
+                instance.initialize()
+                _rag_service = instance
     return _rag_service
 
 
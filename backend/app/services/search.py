@@ -0,0 +1,481 @@
+"""
+Cross-meeting semantic search.
+One FAISS index over the chunks of every saved meeting, so a question can
+be searched across all meetings without loading them one by one. Exact
+(flat) search is used while the corpus is small; past a size threshold
+the index is rebuilt as HNSW, which keeps queries in the millisecond range
+at hundreds of thousands of chunks. Meetings are added incrementally as
+they are saved, and the index is persisted next to the meetings.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.config import RagIndexType, settings
+from app.models.schemas import SearchResult, TranscriptChunk
+from app.services.chunking import merge_chunks
+from app.services.executors import run_in_stage
+from app.services.fileio import load_json, save_json, write_atomic
+from app.services.metrics import SEARCH_INDEX_CHUNKS, SEARCH_SECONDS
+from app.services.rag import PQ_MIN_CHUNKS, RagIndex, faiss_storage, load_chunks, train_index
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_FORMAT_VERSION = 1
+# Directory under the storage dir; not a meeting, so listings skip it
+SEARCH_DIR_NAME = "_search"
+# HNSW graph construction effort (build time vs graph quality)
+HNSW_EF_CONSTRUCTION = 80
+# Compact the index once this fraction of its rows belongs to replaced meetings
+COMPACT_FRACTION = 0.1
+# Vectors sampled to train compressed HNSW storage
+TRAIN_SAMPLE = 50000
+
+
+class GlobalSearchIndex:
+    """
+    FAISS index over the chunks of all saved meetings.
+
+    Row IDs are positions in the index; each meeting owns a contiguous range
+    of rows. Re-saving a meeting appends its new rows and tombstones the old
+    ones (HNSW cannot delete), which are filtered out of searches and dropped
+    when the index is compacted.
+
+    The HNSW index stores vectors as configured by `rag_index_type`. With
+    compressed storage, candidates are re-ranked exactly against each
+    meeting's saved embeddings, which are memory-mapped rather than kept in RAM.
+    """
+
+    def __init__(self, path: Path, storage_dir: Path):
+        """
+        Initialize an empty index.
+
+        Args:
+            path: Directory the index is persisted in
+            storage_dir: Meeting storage directory (for saved embeddings)
+        """
+        self.path = path
+        self.storage_dir = storage_dir
+        self.index: Any = None
+        self.kind = "flat"
+        self.storage: RagIndexType = "flat"
+        self._vectors: dict[str, np.ndarray] = {}
+        self._rows: list[tuple[str, TranscriptChunk] | None] = []
+        self._meetings: dict[str, tuple[int, int]] = {}
+        self._deleted: set[int] = set()
+        # _lock guards the index for searches and in-place adds; _write_lock
+        # serializes writers so a rebuild can run without blocking searches
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def num_chunks(self) -> int:
+        """Number of searchable chunks."""
+        return len(self._rows) - len(self._deleted)
+
+    def has_meeting(self, meeting_id: str) -> bool:
+        """Check if a meeting is indexed."""
+        return meeting_id in self._meetings
+
+    def add_meeting(
+        self,
+        meeting_id: str,
+        chunks: list[TranscriptChunk],
+        embeddings: np.ndarray,
+        persist: bool = True,
+    ):
+        """
+        Add (or replace) a meeting's chunks.
+
+        Args:
+            meeting_id: Meeting identifier
+            chunks: The meeting's transcript chunks
+            embeddings: Chunk embeddings in chunk order
+            persist: Save the index afterwards (batch adds save once at the end)
+        """
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        with self._write_lock:
+            with self._lock:
+                if self.index is None:
+                    self.index, _ = _create_index("flat", "flat", vectors)
+                    self.kind, self.storage = "flat", "flat"
+                self._tombstone(meeting_id)
+                offset = len(self._rows)
+                self.index.add(vectors)
+                self._rows.extend((meeting_id, chunk) for chunk in chunks)
+                self._meetings[meeting_id] = (offset, len(chunks))
+
+            self._maybe_rebuild()
+            if persist:
+                self._save()
+        SEARCH_INDEX_CHUNKS.set(self.num_chunks)
+        logger.info(f"Indexed {len(chunks)} chunks of {meeting_id} for search ({self.kind})")
+
+    def remove_meeting(self, meeting_id: str):
+        """Remove a meeting from search results."""
+        with self._write_lock:
+            with self._lock:
+                self._tombstone(meeting_id)
+            self._maybe_rebuild()
+            self._save()
+        SEARCH_INDEX_CHUNKS.set(self.num_chunks)
+
+    def search(
+        self, query_embedding: np.ndarray, top_k: int = 10, meeting_ids: list[str] | None = None
+    ) -> list[SearchResult]:
+        """
+        Find the chunks closest to a query.
+
+        Args:
+            query_embedding: Query vector
+            top_k: Number of results to return
+            meeting_ids: Only search these meetings (all meetings if None)
+
+        Returns:
+            Results ordered by distance, closest first
+        """
+        query = np.ascontiguousarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        with SEARCH_SECONDS.time(), self._lock:
+            if self.index is None or self.num_chunks == 0:
+                return []
+            if meeting_ids is not None:
+                distances, ids = self._search_meetings(query, top_k, meeting_ids)
+            else:
+                # Compressed storage fetches extra candidates and re-ranks them exactly
+                rerank = self.storage != "flat" and settings.rag_rerank_factor > 1
+                candidates = top_k * settings.rag_rerank_factor if rerank else top_k
+                distances, ids = self.index.search(
+                    query, candidates, params=self._search_params()
+                )
+                distances, ids = distances[0], ids[0]
+                if rerank:
+                    distances, ids = self._rerank(query[0], distances, ids)
+            return [
+                SearchResult(meeting_id=entry[0], chunk=entry[1], distance=float(distance))
+                for distance, row in zip(distances[:top_k], ids[:top_k])
+                if row >= 0 and (entry := self._rows[row]) is not None
+            ]
+
+    def sync(self):
+        """
+        Bring the index in line with the meetings saved on disk.
+
+        Adds saved meetings the index doesn't have (e.g. meetings saved
+        before the index existed) from their stored embeddings, and removes
+        meetings whose data was deleted.
+        """
+        saved = {
+            meeting_dir.name: meeting_dir / "rag_index"
+            for meeting_dir in self.storage_dir.glob("meeting_*")
+            if (meeting_dir / "rag_index" / "meta.json").exists()
+        }
+        for meeting_id in set(self._meetings) - set(saved):
+            logger.info(f"Removing deleted meeting {meeting_id} from the search index")
+            self.remove_meeting(meeting_id)
+
+        missing = sorted(set(saved) - set(self._meetings))
+        if missing:
+            logger.info(f"Adding {len(missing)} saved meetings to the search index")
+        for meeting_id in missing:
+            try:
+                rag_index = RagIndex.load(saved[meeting_id])
+            except Exception as e:
+                logger.warning(f"Skipping {meeting_id} in the search index: {e}")
+                continue
+            self.add_meeting(
+                meeting_id, rag_index.window_chunks(), rag_index.embeddings, persist=False
+            )
+        if missing:
+            with self._write_lock:
+                self._save()
+
+    @classmethod
+    def load(cls, path: Path, storage_dir: Path) -> "GlobalSearchIndex":
+        """
+        Load a persisted index, or return an empty one if there is none.
+
+        Chunk metadata is read from each meeting's own saved chunks. Meetings
+        whose saved chunks no longer match are dropped from the index (and
+        re-added by `sync`). An index built with a different embedding model,
+        or left inconsistent by an interrupted save, is discarded and rebuilt
+        by `sync`.
+
+        Args:
+            path: Directory the index is persisted in
+            storage_dir: Meeting storage directory
+
+        Returns:
+            The loaded GlobalSearchIndex
+        """
+        import faiss
+
+        search_index = cls(path, storage_dir)
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            return search_index
+
+        meta = load_json(meta_path)
+        if meta.get("format_version") != SEARCH_INDEX_FORMAT_VERSION:
+            logger.warning(f"Rebuilding search index with unsupported format at {path}")
+            return search_index
+        if meta.get("embedding_model") != settings.embedding_model:
+            logger.warning("Rebuilding search index built with a different embedding model")
+            return search_index
+
+        try:
+            index = faiss.read_index(str(path / "global.index"))
+        except RuntimeError as e:
+            logger.warning(f"Rebuilding unreadable search index at {path}: {e}")
+            return search_index
+        if index.ntotal != meta.get("ntotal"):
+            # Interrupted save: the index and its metadata are from different versions
+            logger.warning(f"Rebuilding search index whose metadata doesn't match at {path}")
+            return search_index
+
+        search_index.index = index
+        search_index.kind = meta["kind"]
+        search_index.storage = meta.get("storage", "flat")
+        if search_index.kind == "hnsw":
+            search_index.index.hnsw.efSearch = settings.search_hnsw_ef_search
+
+        rows: list[tuple[str, TranscriptChunk] | None] = [None] * search_index.index.ntotal
+        for entry in meta["meetings"]:
+            meeting_id, offset, count = entry["meeting_id"], entry["offset"], entry["count"]
+            index_dir = storage_dir / meeting_id / "rag_index"
+            if not (index_dir / "meta.json").exists():
+                continue
+            meeting_chunks, windows = load_chunks(index_dir, load_json(index_dir / "meta.json"))
+            if len(windows) != count:
+                continue
+            chunks = [merge_chunks([meeting_chunks[idx] for idx in window]) for window in windows]
+            rows[offset : offset + count] = [(meeting_id, chunk) for chunk in chunks]
+            search_index._meetings[meeting_id] = (offset, count)
+        search_index._rows = rows
+        search_index._deleted = {row for row, entry in enumerate(rows) if entry is None}
+
+        SEARCH_INDEX_CHUNKS.set(search_index.num_chunks)
+        logger.info(
+            f"Loaded search index with {search_index.num_chunks} chunks from "
+            f"{len(search_index._meetings)} meetings ({search_index.kind})"
+        )
+        return search_index
+
+    def _tombstone(self, meeting_id: str):
+        """Mark a meeting's rows as deleted. Caller holds `_lock`."""
+        if meeting_id not in self._meetings:
+            return
+        offset, count = self._meetings.pop(meeting_id)
+        # A re-saved meeting's embeddings file is replaced; drop the old mapping
+        self._vectors.pop(meeting_id, None)
+        for row in range(offset, offset + count):
+            self._rows[row] = None
+            self._deleted.add(row)
+
+    def _search_params(self) -> Any:
+        """Search parameters that skip deleted rows."""
+        import faiss
+
+        if not self._deleted:
+            return None
+        deleted = np.fromiter(self._deleted, dtype=np.int64)
+        selector = faiss.IDSelectorNot(faiss.IDSelectorBatch(deleted))
+        if self.kind == "hnsw":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=settings.search_hnsw_ef_search)
+        return faiss.SearchParameters(sel=selector)
+
+    def _search_meetings(
+        self, query: np.ndarray, top_k: int, meeting_ids: list[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Exact search restricted to some meetings' rows."""
+        meetings = [meeting_id for meeting_id in meeting_ids if meeting_id in self._meetings]
+        if not meetings:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        ids = np.concatenate(
+            [np.arange(*_row_range(self._meetings[m]), dtype=np.int64) for m in meetings]
+        )
+        vectors = np.concatenate([self._full_vectors(m) for m in meetings])
+        distances = ((vectors - query) ** 2).sum(axis=1)
+        order = np.argsort(distances)[:top_k]
+        return distances[order], ids[order]
+
+    def _rerank(
+        self, query: np.ndarray, distances: np.ndarray, ids: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Replace approximate distances with exact ones where embeddings are saved."""
+        exact = []
+        for distance, row in zip(distances, ids):
+            if row < 0 or (entry := self._rows[row]) is None:
+                continue
+            vectors = self._saved_vectors(entry[0])
+            if vectors is not None:
+                vector = np.asarray(vectors[row - self._meetings[entry[0]][0]], dtype=np.float32)
+                distance = ((vector - query) ** 2).sum()
+            exact.append((float(distance), int(row)))
+        exact.sort()
+        return (
+            np.array([distance for distance, _ in exact]),
+            np.array([row for _, row in exact], dtype=np.int64),
+        )
+
+    def _saved_vectors(self, meeting_id: str) -> np.ndarray | None:
+        """A meeting's saved embeddings, memory-mapped, or None if not on disk."""
+        vectors = self._vectors.get(meeting_id)
+        if vectors is None:
+            path = self.storage_dir / meeting_id / "rag_index" / "embeddings.npy"
+            if not path.exists():
+                return None
+            vectors = np.load(path, mmap_mode="r")
+            if len(vectors) != self._meetings[meeting_id][1]:
+                return None
+            self._vectors[meeting_id] = vectors
+        return vectors
+
+    def _full_vectors(self, meeting_id: str) -> np.ndarray:
+        """A meeting's full-precision vectors, from disk or else from the index."""
+        vectors = self._saved_vectors(meeting_id)
+        if vectors is None:
+            offset, count = self._meetings[meeting_id]
+            vectors = self.index.reconstruct_n(offset, count)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _maybe_rebuild(self):
+        """
+        Rebuild the index if its type no longer fits or it has too many deleted rows.
+
+        Vectors come from the meetings' saved embeddings where available, so
+        compressed indexes are rebuilt from full-precision data. The new index
+        is built without holding `_lock`, so searches continue on the old
+        index meanwhile. Once the last meeting is removed there is nothing to
+        rebuild from, and the index is reset to an empty exact index instead.
+        Caller holds `_write_lock`.
+        """
+        if not self._meetings:
+            if self._rows:
+                empty = np.empty((0, self.index.d), dtype=np.float32)
+                with self._lock:
+                    self.index, self.storage = _create_index("flat", "flat", empty)
+                    self.kind = "flat"
+                    self._rows, self._deleted = [], set()
+                logger.info("Reset the search index; no meetings are left")
+            return
+
+        live = self.num_chunks
+        kind = "hnsw" if live >= settings.search_hnsw_threshold else "flat"
+        storage = settings.rag_index_type if kind == "hnsw" else "flat"
+        unchanged = kind == self.kind and storage == self.storage
+        if unchanged and len(self._deleted) <= COMPACT_FRACTION * len(self._rows):
+            return
+
+        start = time.perf_counter()
+        meetings = sorted(self._meetings, key=lambda meeting_id: self._meetings[meeting_id][0])
+        vectors = {meeting_id: self._full_vectors(meeting_id) for meeting_id in meetings}
+        index, storage = _create_index(kind, storage, _training_sample(list(vectors.values())))
+        for meeting_vectors in vectors.values():
+            index.add(meeting_vectors)
+
+        rows, positions = [], {}
+        for meeting_id in meetings:
+            offset, count = self._meetings[meeting_id]
+            positions[meeting_id] = (len(rows), count)
+            rows.extend(self._rows[offset : offset + count])
+
+        with self._lock:
+            self.index, self.kind, self.storage = index, kind, storage
+            self._rows, self._meetings, self._deleted = rows, positions, set()
+        logger.info(
+            f"Rebuilt search index as {kind} ({storage}) over {live} chunks "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+    def _save(self):
+        """Persist the index; meta.json is written last. Caller holds `_write_lock`."""
+        import faiss
+
+        # Searches only read the index, so writing it needs no search lock
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path / "global.index", lambda tmp: faiss.write_index(self.index, tmp))
+        meta = {
+            "format_version": SEARCH_INDEX_FORMAT_VERSION,
+            "embedding_model": settings.embedding_model,
+            "kind": self.kind,
+            "storage": self.storage,
+            "ntotal": self.index.ntotal,
+            "meetings": [
+                {"meeting_id": meeting_id, "offset": offset, "count": count}
+                for meeting_id, (offset, count) in self._meetings.items()
+            ],
+        }
+        write_atomic(self.path / "meta.json", lambda tmp: save_json(tmp, meta))
+
+
+def _create_index(
+    kind: str, storage: RagIndexType, sample: np.ndarray
+) -> tuple[Any, RagIndexType]:
+    """
+    Create an empty, trained exact or HNSW index (L2 distance, like per-meeting indexes).
+
+    Args:
+        kind: "flat" for exact search or "hnsw"
+        storage: How HNSW stores vectors (see `rag.create_index`)
+        sample: Vectors to train compressed storage on
+
+    Returns:
+        Tuple of (index, storage actually used)
+    """
+    import faiss
+
+    if kind == "flat":
+        return faiss.IndexFlatL2(sample.shape[1]), "flat"
+    if storage == "pq" and len(sample) < PQ_MIN_CHUNKS:
+        storage = "sq8"
+    index = faiss.index_factory(
+        sample.shape[1], f"HNSW{settings.search_hnsw_m},{faiss_storage(storage, sample)}"
+    )
+    train_index(index, sample)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = settings.search_hnsw_ef_search
+    return index, storage
+
+
+def _training_sample(vectors: list[np.ndarray]) -> np.ndarray:
+    """An evenly spaced sample of at most TRAIN_SAMPLE rows across all meetings."""
+    total = sum(len(meeting_vectors) for meeting_vectors in vectors)
+    step = max(1, total // TRAIN_SAMPLE)
+    sample = np.concatenate([meeting_vectors[::step] for meeting_vectors in vectors])
+    return np.ascontiguousarray(sample[:TRAIN_SAMPLE], dtype=np.float32)
+
+
+def _row_range(position: tuple[int, int]) -> tuple[int, int]:
+    """(start, stop) rows of a meeting's (offset, count) position."""
+    offset, count = position
+    return offset, offset + count
+
+
+# Global index instance
+_search_index: GlobalSearchIndex | None = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> GlobalSearchIndex:
+    """Get or load the global search index."""
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = GlobalSearchIndex.load(
+                    settings.storage_dir / SEARCH_DIR_NAME, settings.storage_dir
+                )
+    return _search_index
+
+
+async def sync_search_index():
+    """Load the search index and add meetings saved without it, off the event loop."""
+    try:
+        await run_in_stage("embedding", lambda: get_search_index().sync())
+    except Exception as e:
+        logger.error(f"Failed to sync the search index: {e}", exc_info=True)
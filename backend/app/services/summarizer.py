@@ -0,0 +1,198 @@
+"""
+Hierarchical map-reduce summarization for long meetings.
+The transcript is split into token-bounded windows that are summarized
+concurrently while ASR is still running; the window notes are then merged
+into the final summary, condensing them in rounds if they are too long for
+one prompt.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.models.schemas import MeetingTranscript, SummaryResponse, TranscriptChunk
+from app.services.llm import LLMClient
+from app.services.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SectionNotes:
+    """LLM notes on a contiguous part of the meeting."""
+
+    start_time: float
+    end_time: float
+    text: str
+
+    @property
+    def label(self) -> str:
+        """Time range the notes cover, e.g. "00:10:00-00:20:00"."""
+        return f"{_format_time(self.start_time)}-{_format_time(self.end_time)}"
+
+
+def _format_time(seconds: float) -> str:
+    """Format seconds as HH:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _chunk_key(chunk: TranscriptChunk) -> tuple[str, float, float]:
+    """Identify a transcript chunk independently of its chunk ID."""
+    return (chunk.speaker_label, round(chunk.start_time, 3), round(chunk.end_time, 3))
+
+
+class HierarchicalSummarizer:
+    """
+    Summarizes one meeting in token-bounded windows.
+
+    Chunks are fed in (roughly) time order as they are transcribed. A window
+    closes when the next chunk would exceed the token budget, or at a long
+    pause once it is at least half full, since pauses tend to separate
+    topics. Each closed window is summarized immediately in the background.
+    Meetings that fit in a single window are summarized in one call as before.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        window_tokens: int,
+        concurrency: int,
+        gap_seconds: float,
+    ):
+        """
+        Initialize the summarizer.
+
+        Args:
+            llm_client: Client used for all LLM calls
+            window_tokens: Token budget of each window (and of each merge input)
+            concurrency: Maximum number of LLM calls in flight for this meeting
+            gap_seconds: Pause treated as a topic boundary when closing a window
+        """
+        self.llm_client = llm_client
+        self.window_tokens = window_tokens
+        self.gap_seconds = gap_seconds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._window: list[TranscriptChunk] = []
+        self._window_size = 0
+        self._fed: set[tuple[str, float, float]] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def feed(self, chunks: Iterable[TranscriptChunk]):
+        """
+        Add transcribed chunks, starting window summaries as windows fill up.
+
+        Must be called from the event loop. Chunks already fed are skipped.
+
+        Args:
+            chunks: Transcript chunks in time order
+        """
+        for chunk in chunks:
+            key = _chunk_key(chunk)
+            if key in self._fed:
+                continue
+            self._fed.add(key)
+
+            size = estimate_tokens(chunk.to_context_string())
+            if self._window and self._should_close(chunk, size):
+                self._close_window()
+            self._window.append(chunk)
+            self._window_size += size
+
+    async def finish(self, transcript: MeetingTranscript) -> SummaryResponse:
+        """
+        Summarize the remaining chunks and merge all window notes.
+
+        Args:
+            transcript: The complete meeting transcript; chunks not fed yet
+                are added first
+
+        Returns:
+            SummaryResponse for the whole meeting
+        """
+        try:
+            self.feed(transcript.chunks)
+            if not self._tasks:
+                # Short meeting: the whole transcript fits in one prompt
+                self._window = []
+                return await self.llm_client.summarize_meeting(transcript)
+
+            if self._window:
+                self._close_window()
+            logger.info(f"Waiting for {len(self._tasks)} window summaries")
+            notes = await self._condense(list(await asyncio.gather(*self._tasks)))
+
+            merged = "\n\n".join(f"[{section.label}]\n{section.text}" for section in notes)
+            async with self._semaphore:
+                summary = await self.llm_client.merge_summaries(
+                    merged, transcript.get_speaker_turns(), transcript.duration
+                )
+            logger.info(f"Merged notes on {len(self._tasks)} windows into the summary")
+            return summary
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        """Cancel window summaries still running (e.g. when processing fails)."""
+        for task in self._tasks:
+            task.cancel()
+
+    def _should_close(self, chunk: TranscriptChunk, size: int) -> bool:
+        """Whether the current window ends before `chunk`."""
+        if self._window_size + size > self.window_tokens:
+            return True
+        gap = chunk.start_time - self._window[-1].end_time
+        return self._window_size >= self.window_tokens / 2 and gap >= self.gap_seconds
+
+    def _close_window(self):
+        """Start summarizing the current window in the background."""
+        window = self._window
+        self._window = []
+        self._window_size = 0
+        text = "\n".join(chunk.to_context_string() for chunk in window)
+        section = SectionNotes(window[0].start_time, window[-1].end_time, text)
+        self._tasks.append(asyncio.create_task(self._summarize_section(section)))
+
+    async def _summarize_section(self, section: SectionNotes) -> SectionNotes:
+        """Condense a window transcript (or a group of notes) into notes."""
+        async with self._semaphore:
+            text = await self.llm_client.summarize_section(section.text, section.label)
+        return SectionNotes(section.start_time, section.end_time, text)
+
+    async def _condense(self, notes: list[SectionNotes]) -> list[SectionNotes]:
+        """
+        Condense notes in rounds until they fit in one merge prompt.
+
+        Each round summarizes groups of at least two consecutive notes, so the
+        number of notes at least halves per round.
+        """
+        notes.sort(key=lambda section: section.start_time)
+        sizes = [estimate_tokens(section.text) for section in notes]
+        while len(notes) > 1 and sum(sizes) > self.window_tokens:
+            groups: list[list[SectionNotes]] = [[]]
+            group_size = 0
+            for section, size in zip(notes, sizes):
+                if len(groups[-1]) >= 2 and group_size + size > self.window_tokens:
+                    groups.append([])
+                    group_size = 0
+                groups[-1].append(section)
+                group_size += size
+
+            logger.info(f"Condensing {len(notes)} section notes into {len(groups)}")
+            notes = list(
+                await asyncio.gather(
+                    *(
+                        self._summarize_section(
+                            SectionNotes(
+                                group[0].start_time,
+                                group[-1].end_time,
+                                "\n\n".join(f"[{s.label}]\n{s.text}" for s in group),
+                            )
+                        )
+                        for group in groups
+                    )
+                )
+            )
+            sizes = [estimate_tokens(section.text) for section in notes]
+        return notes
@@ -0,0 +1,33 @@
+"""
+Approximate token counting for LLM and embedding budgets.
+Meetings mix Cantonese and English, so CJK characters (roughly one token
+each) and other text (roughly four characters per token) are counted
+separately. No tokenizer model is loaded.
+"""
+
+import math
+import re
+
+# CJK ideographs, kana, hangul and full-width punctuation
+_CJK_RE = re.compile(
+    "[　-〿぀-ヿ㐀-䶿一-鿿가-힯豈-﫿＀-￯]"
+)
+
+# Average characters per token for non-CJK text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count (an overestimate rather than an underestimate)
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / CHARS_PER_TOKEN)
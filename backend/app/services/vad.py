@@ -0,0 +1,158 @@
+"""
+Voice activity detection (VAD) for ASR.
+Trims diarization segments to their voiced regions with a frame-energy
+detector, so Whisper does not decode (or hallucinate on) silence.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.schemas import SpeakerSegment
+from app.services.audio import DecodedAudio
+from app.services.metrics import VAD_REMOVED_SECONDS, VAD_SEGMENT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Frames processed per block when computing energies, to bound temporary memory
+_BLOCK_FRAMES = 10_000
+
+# Default analysis frame length in seconds
+FRAME_SECONDS = 0.03
+
+
+@dataclass
+class VadStats:
+    """Totals over every `trim_segments` call of one meeting."""
+
+    segment_seconds: float = 0.0
+    removed_seconds: float = 0.0
+    skipped_segments: int = 0
+
+    def summary(self) -> str:
+        """One-line report for the meeting's log."""
+        return (
+            f"VAD removed {self.removed_seconds:.1f}s of {self.segment_seconds:.1f}s segment "
+            f"audio ({self.removed_seconds / max(self.segment_seconds, 1e-9):.0%}); "
+            f"skipped {self.skipped_segments} segments with no speech"
+        )
+
+
+def frame_energies(audio: DecodedAudio, frame_seconds: float) -> np.ndarray:
+    """
+    Compute the energy of every frame of the recording in dB.
+
+    Args:
+        audio: Decoded audio for the whole recording
+        frame_seconds: Frame length in seconds
+
+    Returns:
+        1-D array of frame energies in dB (full scale)
+    """
+    frame_len = max(1, int(frame_seconds * audio.sample_rate))
+    num_frames = len(audio.waveform) // frame_len
+    frames = audio.waveform[: num_frames * frame_len].reshape(num_frames, frame_len)
+
+    energies = np.empty(num_frames, dtype=np.float32)
+    for block_start in range(0, num_frames, _BLOCK_FRAMES):
+        block = frames[block_start : block_start + _BLOCK_FRAMES]
+        energies[block_start : block_start + len(block)] = np.mean(block * block, axis=1)
+
+    return 10.0 * np.log10(energies + 1e-10)
+
+
+def _voiced_runs(
+    voiced: np.ndarray, min_speech_frames: int, min_silence_frames: int
+) -> list[tuple[int, int]]:
+    """Turn a per-frame voiced mask into [start, end) frame runs."""
+    # Run boundaries where the mask flips
+    padded = np.concatenate(([False], voiced, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    runs = list(zip(edges[::2], edges[1::2]))
+
+    # Bridge short pauses inside speech
+    merged: list[tuple[int, int]] = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] < min_silence_frames:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    # Drop clicks and breaths too short to be speech
+    return [(start, end) for start, end in merged if end - start >= min_speech_frames]
+
+
+def trim_segments(
+    audio: DecodedAudio,
+    segments: list[SpeakerSegment],
+    frame_seconds: float = FRAME_SECONDS,
+    margin_db: float = 12.0,
+    min_speech: float = 0.25,
+    min_silence: float = 0.5,
+    padding: float = 0.15,
+    energies: np.ndarray | None = None,
+    stats: VadStats | None = None,
+) -> tuple[list[SpeakerSegment], float]:
+    """
+    Trim and split speaker segments to their voiced regions.
+
+    A frame counts as voiced when its energy is `margin_db` above the
+    recording's noise floor (its 10th-percentile frame energy). Pauses
+    shorter than `min_silence` stay inside a region, regions shorter than
+    `min_speech` are dropped, and kept regions are padded by `padding`.
+
+    Args:
+        audio: Decoded audio for the whole recording
+        segments: Diarization segments in time order
+        frame_seconds: Analysis frame length in seconds
+        margin_db: Energy above the noise floor that counts as speech
+        min_speech: Shortest voiced region kept, in seconds
+        min_silence: Shortest pause that splits a segment, in seconds
+        padding: Seconds of context kept around each voiced region
+        energies: Precomputed `frame_energies` of the recording, for callers
+            trimming segments in several batches
+        stats: Running totals to add this call's trimming to, for callers
+            trimming segments in several batches
+
+    Returns:
+        Tuple of (voiced segments in time order, seconds of audio removed)
+    """
+    if energies is None:
+        energies = frame_energies(audio, frame_seconds)
+    if len(energies) == 0:
+        return segments, 0.0
+
+    threshold = float(np.percentile(energies, 10)) + margin_db
+    min_speech_frames = max(1, round(min_speech / frame_seconds))
+    min_silence_frames = max(1, round(min_silence / frame_seconds))
+
+    trimmed: list[SpeakerSegment] = []
+    skipped = 0
+    for segment in segments:
+        first = int(segment.start_time / frame_seconds)
+        last = min(len(energies), int(np.ceil(segment.end_time / frame_seconds)))
+        runs = _voiced_runs(energies[first:last] > threshold, min_speech_frames, min_silence_frames)
+        if not runs:
+            skipped += 1
+            continue
+
+        for start, end in runs:
+            trimmed.append(
+                SpeakerSegment(
+                    speaker_label=segment.speaker_label,
+                    start_time=max(segment.start_time, (first + start) * frame_seconds - padding),
+                    end_time=min(segment.end_time, (first + end) * frame_seconds + padding),
+                )
+            )
+
+    before = sum(segment.duration for segment in segments)
+    removed = before - sum(segment.duration for segment in trimmed)
+    VAD_SEGMENT_SECONDS.inc(before)
+    VAD_REMOVED_SECONDS.inc(removed)
+    if stats is not None:
+        stats.segment_seconds += before
+        stats.removed_seconds += removed
+        stats.skipped_segments += skipped
+    logger.debug(f"VAD removed {removed:.1f}s of {before:.1f}s in {len(segments)} segments")
+    return trimmed, removed
@@ -0,0 +1,145 @@
+"""
+Background model warm-up at startup.
+The API starts serving immediately; diarization, ASR and embedding models
+are loaded on their stage executors and run once on dummy input so the
+first real upload or question doesn't pay for loading and lazy kernel
+initialization. Per-model progress is reported by /ready.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from app.config import settings
+from app.models.schemas import ModelReadiness, ReadinessResponse
+from app.services.asr import get_asr_service
+from app.services.audio import TARGET_SAMPLE_RATE, DecodedAudio
+from app.services.diarization import get_diarization_service
+from app.services.executors import Stage, run_in_stage
+from app.services.llm import get_llm_client
+from app.services.pipeline import get_pipeline
+from app.services.rag import get_rag_service
+
+logger = logging.getLogger(__name__)
+
+# Length of the dummy clip used to warm up the audio models
+WARMUP_SECONDS = 3.0
+
+
+def _warm_diarization():
+    """Load the diarization pipeline and run it on a short silent clip."""
+    silence = np.zeros(int(WARMUP_SECONDS * TARGET_SAMPLE_RATE), dtype=np.float32)
+    get_diarization_service().run_diarization(DecodedAudio(silence))
+
+
+def _warm_asr():
+    """Load Whisper and decode one second of low noise."""
+    noise = np.random.default_rng(0).standard_normal(TARGET_SAMPLE_RATE) * 0.001
+    get_asr_service().transcribe_audio(noise.astype(np.float32))
+
+
+def _warm_embedding():
+    """Load the embedding model and embed one text."""
+    get_rag_service().embed_texts(["warm-up"])
+
+
+def _warm_llm():
+    """Create the LLM client; no request is sent, since provider calls are billed."""
+    get_llm_client()
+
+
+# Model name, executor it loads on (None: default thread pool), warm-up function
+WARMUPS: list[tuple[str, Stage | None, Callable[[], Any]]] = [
+    ("diarization", "diarization", _warm_diarization),
+    ("asr", "asr", _warm_asr),
+    ("embedding", "embedding", _warm_embedding),
+    ("llm", None, _warm_llm),
+]
+
+
+class ModelWarmup:
+    """
+    Loads all models in the background and tracks their readiness.
+
+    Each model loads on the executor of the stage that uses it, so the
+    models load in parallel and a slow download never blocks the event loop.
+    Requests that arrive before a model is ready simply wait for it in the
+    service factory, which loads each model only once.
+    """
+
+    def __init__(self):
+        """Initialize the warm-up state."""
+        status = "pending" if settings.model_warmup else "lazy"
+        self._models = {name: ModelReadiness(name=name, status=status) for name, _, _ in WARMUPS}
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start warming up models in the background. Must be called from the event loop."""
+        if not settings.model_warmup:
+            logger.info("Model warm-up disabled; models load on first use")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self):
+        """Stop waiting for the warm-up (model loads already running finish in their threads)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def readiness(self) -> ReadinessResponse:
+        """
+        Get the load state of every model.
+
+        Returns:
+            ReadinessResponse, ready when all models are loaded (or loading is lazy)
+        """
+        models = [model.model_copy() for model in self._models.values()]
+        ready = all(model.status in ("ready", "lazy") for model in models)
+        return ReadinessResponse(ready=ready, models=models)
+
+    async def _run(self):
+        """Warm up all models concurrently, then assemble the pipeline."""
+        start = time.perf_counter()
+        await asyncio.gather(*(self._load(name, stage, func) for name, stage, func in WARMUPS))
+
+        if all(model.status == "ready" for model in self._models.values()):
+            await asyncio.to_thread(get_pipeline)
+            logger.info(f"All models ready in {time.perf_counter() - start:.1f}s")
+
+    async def _load(self, name: str, stage: Stage | None, func: Callable[[], Any]):
+        """Load and warm up one model, recording the outcome."""
+        model = self._models[name]
+        model.status = "loading"
+        start = time.perf_counter()
+        try:
+            if stage is None:
+                await asyncio.to_thread(func)
+            else:
+                await run_in_stage(stage, func)
+        except Exception as e:
+            model.status = "failed"
+            model.error = str(e)
+            logger.error(f"Failed to warm up {name} model: {e}", exc_info=True)
+            return
+
+        model.status = "ready"
+        model.load_seconds = round(time.perf_counter() - start, 3)
+        logger.info(f"{name} model ready in {model.load_seconds:.1f}s")
+
+
+# Global warm-up instance
+_model_warmup: ModelWarmup | None = None
+
+
+def get_model_warmup() -> ModelWarmup:
+    """Get or create the global model warm-up instance."""
+    global _model_warmup
+    if _model_warmup is None:
+        _model_warmup = ModelWarmup()
+    return _model_warmup
@@ -4,8 +4,10 @@ Provides in-memory storage for Stage 1 (can be replaced with DB later).
 """
 
 import logging
+from collections import OrderedDict
 from typing import Dict
 
+from app.config import settings
 from app.models.schemas import MeetingResult
 from app.services.rag import RagIndex
 
@@ -16,16 +18,23 @@ class MeetingStorage:
     """
     In-memory storage for meeting results and RAG indices.
     For Stage 1 local development.
+
+    Only the `storage_cached_indexes` most recently used indices are kept;
+    evicted ones are reloaded from disk (memory-mapped) on their next query.
     """
 
     def __init__(self):
         self._meetings: Dict[str, MeetingResult] = {}
-        self._indices: Dict[str, RagIndex] = {}
+        self._indices: OrderedDict[str, RagIndex] = OrderedDict()
 
     def store_meeting(self, meeting_id: str, result: MeetingResult, index: RagIndex):
         """Store a meeting result and its RAG index."""
         self._meetings[meeting_id] = result
         self._indices[meeting_id] = index
+        self._indices.move_to_end(meeting_id)
+        while len(self._indices) > settings.storage_cached_indexes:
+            evicted, _ = self._indices.popitem(last=False)
+            logger.info(f"Evicted RAG index of meeting {evicted} from memory")
         logger.info(f"Stored meeting {meeting_id} in memory")
 
     def get_meeting(self, meeting_id: str) -> MeetingResult | None:
@@ -33,8 +42,11 @@ class MeetingStorage:
         return self._meetings.get(meeting_id)
 
     def get_index(self, meeting_id: str) -> RagIndex | None:
-        """Retrieve a RAG index."""
-        return self._indices.get(meeting_id)
+        """Retrieve a RAG index, marking it recently used."""
+        index = self._indices.get(meeting_id)
+        if index is not None:
+            self._indices.move_to_end(meeting_id)
+        return index
 
     def list_meetings(self) -> list[str]:
         """List all stored meeting IDs."""
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Compare ASR inference backends.
+Runs each backend in its own process on the same segments and reports
+load time, real-time factor (RTF) and peak resident memory.
+
+Usage:
+    python benchmarks/asr_backends.py path/to/audio.wav
+    python benchmarks/asr_backends.py path/to/audio.wav --backends pytorch pytorch-int8
+"""
+
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.asr import ASRService
+from app.services.asr_backends import get_asr_backend
+from app.services.audio import load_audio
+from benchmarks.asr_batching import make_segments
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ["pytorch", "pytorch-int8", "onnxruntime"]
+
+
+def measure(audio_path: Path, backend: str, max_segments: int, batch_size: int) -> dict:
+    """Load one backend, transcribe the benchmark segments and collect stats."""
+    audio = load_audio(audio_path)
+    segments = make_segments(audio.duration, max_segments, 0.5, 8.0, seed=0)
+    audio_seconds = sum(segment.duration for segment in segments)
+
+    start = time.perf_counter()
+    service = ASRService(get_asr_backend(backend))
+    service.initialize()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = service.transcribe_segments(audio, segments, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "load_s": round(load_seconds, 2),
+        "rtf": round(elapsed / audio_seconds, 4),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "failed": sum(1 for result in results if result is None),
+        "texts": [result[0] if result else None for result in results],
+    }
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Compare ASR inference backends")
+    parser.add_argument("audio_path", type=Path, help="Path to audio file")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--max-segments", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = measure(args.audio_path, args.child, args.max_segments, args.batch_size)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    # One process per backend so peak memory is not shared between them
+    rows = []
+    for backend in args.backends:
+        proc = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                str(args.audio_path),
+                "--child",
+                backend,
+                "--max-segments",
+                str(args.max_segments),
+                "--batch-size",
+                str(args.batch_size),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{backend}: failed\n{proc.stderr.strip()[-500:]}")
+            continue
+        rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{'backend':<14} {'load':>8} {'RTF':>8} {'peak RSS':>10} {'failed':>7} {'changed':>8}")
+    print("-" * 60)
+    reference = rows[0]["texts"] if rows else []
+    for row in rows:
+        # Share of segments whose text differs from the first backend's output
+        differs = sum(1 for a, b in zip(reference, row["texts"]) if a != b)
+        print(
+            f"{row['backend']:<14} {row['load_s']:7.1f}s {row['rtf']:8.3f} "
+            f"{row['peak_rss_mb']:8.0f}MB {row['failed']:>7} "
+            f"{differs / max(1, len(reference)):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
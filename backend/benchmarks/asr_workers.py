@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark process-pool ASR sharding.
+Transcribes the same segments of a fixed recording with 1..N worker
+processes and reports wall time and speedup against the in-process path.
+
+Usage:
+    python benchmarks/asr_workers.py path/to/audio.wav
+    python benchmarks/asr_workers.py path/to/audio.wav --workers 1 2 4 8 --start-method fork
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.asr import get_asr_service
+from app.services.asr_pool import ASRProcessPool
+from app.services.audio import load_audio
+from benchmarks.asr_batching import make_segments
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark multi-process ASR sharding")
+    parser.add_argument("audio_path", type=Path, help="Path to audio file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--start-method", choices=["spawn", "fork", "forkserver"], default="spawn")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-segments", type=int, default=96)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    audio = load_audio(args.audio_path)
+    segments = make_segments(audio.duration, args.max_segments, 0.5, 8.0, args.seed)
+    audio_seconds = sum(segment.duration for segment in segments)
+    cores = os.cpu_count() or 1
+
+    print(f"{len(segments)} segments, {audio_seconds:.1f}s of audio, {cores} cores")
+    print(f"{'workers':>8} {'threads':>8} {'wall':>9} {'RTF':>7} {'speedup':>8}")
+    print("-" * 46)
+
+    # In-process baseline with every core available to torch
+    asr_service = get_asr_service()
+    asr_service.transcribe_segments(audio, segments[:1], batch_size=1)
+    start = time.perf_counter()
+    asr_service.transcribe_segments(audio, segments, batch_size=args.batch_size)
+    baseline = time.perf_counter() - start
+    print(f"{1:>8} {cores:>8} {baseline:8.2f}s {baseline / audio_seconds:7.3f} {1.0:7.2f}x")
+
+    for num_workers in args.workers:
+        pool = ASRProcessPool(num_workers, start_method=args.start_method)
+        # Model load happens once per worker; keep it out of the timing
+        pool.transcribe_segments(audio, segments[:num_workers], batch_size=1)
+
+        start = time.perf_counter()
+        pool.transcribe_segments(audio, segments, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+
+        print(
+            f"{num_workers:>8} {pool.threads_per_worker:>8} {elapsed:8.2f}s "
+            f"{elapsed / audio_seconds:7.3f} {baseline / elapsed:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
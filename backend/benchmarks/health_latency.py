@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Check that the API stays responsive while a meeting is processing.
+Uploads a recording, then polls /health until the job finishes and reports
+the latency distribution. Exits non-zero if the p99 latency exceeds the
+threshold or the job fails.
+
+Without an audio path the check runs offline: a synthetic meeting is
+processed by the ASGI app in this process, with stub models whose simulated
+cost keeps the executors busy, so it needs no server, models or network.
+With an audio path it uploads the recording to a running server.
+
+Usage:
+    python benchmarks/health_latency.py
+    python benchmarks/health_latency.py --minutes 30 --asr-rtf 0.05 --max-p99-ms 50
+
+    uvicorn app.main:app &
+    python benchmarks/health_latency.py path/to/long_meeting.wav
+    python benchmarks/health_latency.py path/to/audio.wav --max-p99-ms 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings require a Hugging Face token, which the stub models never use
+os.environ.setdefault("HUGGINGFACE_TOKEN", "offline-benchmark")
+
+from benchmarks.pipeline_offline import percentile
+
+
+def request_json(url: str, data: bytes | None = None, headers: dict | None = None) -> dict:
+    """Send a request and decode the JSON response."""
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def upload(base_url: str, audio_path: Path) -> dict:
+    """Upload a recording as multipart form data."""
+    boundary = uuid.uuid4().hex
+    body = (
+        (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{audio_path.name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        + audio_path.read_bytes()
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+    return request_json(
+        f"{base_url}/meetings/upload",
+        data=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+
+def probe_server(args: argparse.Namespace) -> tuple[list[float], str]:
+    """Upload to a running server and probe /health until the job finishes."""
+    job = upload(args.url, args.audio_path)
+    job_id = job["job_id"]
+    print(f"Queued job {job_id} for meeting {job['meeting_id']}")
+
+    latencies = []
+    status = "queued"
+    last_job_check = 0.0
+    while status in ("queued", "running"):
+        start = time.perf_counter()
+        request_json(f"{args.url}/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        if time.monotonic() - last_job_check > 2.0:
+            status = request_json(f"{args.url}/jobs/{job_id}")["status"]
+            last_job_check = time.monotonic()
+        time.sleep(args.interval)
+    return latencies, status
+
+
+async def poll_health(client, interval: float, latencies: list[float], stop: asyncio.Event):
+    """
+    Probe /health on a fixed schedule until stopped.
+
+    Requests share the event loop with the job, and latency is measured from
+    when each probe was due, so every probe held up while the loop was
+    blocked counts against it.
+    """
+    due = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        (await client.get("/health")).raise_for_status()
+        latencies.append((time.perf_counter() - due) * 1000)
+        due += interval
+
+
+async def probe_offline(args: argparse.Namespace, workdir: Path) -> tuple[list[float], str]:
+    """Process a synthetic meeting in the in-process app and probe /health meanwhile."""
+    import httpx
+
+    from app.main import app
+    from benchmarks.stubs import StubCosts, install_stubs
+    from benchmarks.synthetic import make_meeting, write_wav
+
+    waveform, segments = make_meeting(args.minutes * 60, seed=args.seed)
+    audio_path = workdir / "meeting.wav"
+    write_wav(audio_path, waveform)
+    install_stubs(
+        segments,
+        StubCosts(
+            diarization_rtf=args.diarization_rtf,
+            asr_rtf=args.asr_rtf,
+            embedding_ms=args.embedding_ms,
+            llm_latency=args.llm_latency,
+        ),
+    )
+
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            stop = asyncio.Event()
+            prober = asyncio.create_task(poll_health(client, args.interval, latencies, stop))
+
+            with open(audio_path, "rb") as f:
+                response = await client.post("/meetings/upload", files={"file": ("meeting.wav", f)})
+            response.raise_for_status()
+            job_id = response.json()["job_id"]
+            print(f"Queued job {job_id} for a {args.minutes:g} min synthetic meeting")
+
+            status = "queued"
+            while status in ("queued", "running"):
+                await asyncio.sleep(0.2)
+                status = (await client.get(f"/jobs/{job_id}")).json()["status"]
+            stop.set()
+            await prober
+    return latencies, status
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Measure /health latency during processing")
+    parser.add_argument(
+        "audio_path", type=Path, nargs="?", help="Audio to upload to --url (offline if omitted)"
+    )
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between probes")
+    parser.add_argument("--max-p99-ms", type=float, default=100.0, help="Allowed p99 latency")
+    offline = parser.add_argument_group("offline check")
+    offline.add_argument("--minutes", type=float, default=10, help="Synthetic meeting length")
+    offline.add_argument("--diarization-rtf", type=float, default=0.01)
+    offline.add_argument("--asr-rtf", type=float, default=0.02)
+    offline.add_argument("--embedding-ms", type=float, default=1.0)
+    offline.add_argument("--llm-latency", type=float, default=0.5)
+    offline.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.audio_path is not None:
+        latencies, status = probe_server(args)
+    else:
+        from app.config import settings
+
+        with tempfile.TemporaryDirectory(prefix="health-latency-") as tmp:
+            workdir = Path(tmp)
+            # Keep the synthetic meeting out of the real data dirs
+            settings.storage_dir = workdir / "storage"
+            settings.upload_dir = workdir / "uploads"
+            settings.storage_dir.mkdir()
+            settings.upload_dir.mkdir()
+            settings.asr_cache_enabled = False
+            settings.asr_workers = 1
+            latencies, status = asyncio.run(probe_offline(args, workdir))
+
+    latencies.sort()
+    p99 = percentile(latencies, 0.99)
+    print(f"Job finished with status: {status}")
+    print(f"/health probes: {len(latencies)}")
+    print(
+        f"  p50: {statistics.median(latencies):.1f} ms   p95: {percentile(latencies, 0.95):.1f} ms"
+        f"   p99: {p99:.1f} ms   max: {latencies[-1]:.1f} ms"
+    )
+
+    if status != "completed":
+        print("FAIL: the job did not complete")
+        sys.exit(1)
+    if p99 > args.max_p99_ms:
+        print(f"FAIL: p99 {p99:.1f} ms exceeds {args.max_p99_ms:.0f} ms")
+        sys.exit(1)
+    print(f"OK: p99 within {args.max_p99_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline benchmark with synthetic audio and stub models.
+Generates multi-speaker meetings of several lengths, runs them through the
+real MeetingPipeline with deterministic stub diarization, ASR, embedding
+and LLM services, and times each stage, the storage save/load path and
+Q&A. Needs no model downloads or network; results are written as JSON so
+runs can be compared across commits.
+
+Usage:
+    python benchmarks/pipeline_offline.py
+    python benchmarks/pipeline_offline.py --minutes 5 30 90 --asr-rtf 0.05 --llm-latency 0.5
+    python benchmarks/pipeline_offline.py --output new.json --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings require a Hugging Face token, which the stub models never use
+os.environ.setdefault("HUGGINGFACE_TOKEN", "offline-benchmark")
+
+from app.config import settings
+from app.services.pipeline import PIPELINE_STAGES, get_pipeline
+from benchmarks.stubs import StubCosts, install_stubs
+from benchmarks.synthetic import make_meeting, write_wav
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS = [
+    "What was decided about the budget?",
+    "Who is following up on the launch timeline?",
+    "What risks were raised?",
+    "今日討論咗咩預算問題？",
+    "What are the action items for the design review?",
+]
+
+
+def git_commit() -> str | None:
+    """Current commit of the repository, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_meeting(minutes: float, args: argparse.Namespace, workdir: Path) -> dict:
+    """Process one synthetic meeting and time every stage."""
+    waveform, segments = make_meeting(minutes * 60, num_speakers=args.speakers, seed=args.seed)
+    audio_path = workdir / f"meeting_{minutes:g}min.wav"
+    write_wav(audio_path, waveform)
+
+    costs = StubCosts(
+        diarization_rtf=args.diarization_rtf,
+        asr_rtf=args.asr_rtf,
+        embedding_ms=args.embedding_ms,
+        llm_latency=args.llm_latency,
+    )
+    install_stubs(segments, costs)
+    pipeline = get_pipeline()
+
+    # Stage timings from the pipeline's own progress reports
+    stage_started: dict[str, float] = {}
+    stages: dict[str, float] = {}
+
+    def progress(stage: str, status: str):
+        if status == "running":
+            stage_started.setdefault(stage, time.perf_counter())
+        elif stage in stage_started:
+            stages[stage] = time.perf_counter() - stage_started.pop(stage)
+
+    start = time.perf_counter()
+    result, rag_index = await pipeline.process_meeting_audio(
+        audio_path, asr_mode=args.asr_mode, progress=progress
+    )
+    total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pipeline.save_meeting_data(result.meeting_id, result, rag_index)
+    save_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, rag_index = pipeline.load_meeting_data(result.meeting_id)
+    load_seconds = time.perf_counter() - start
+
+    latencies = []
+    for idx in range(args.questions):
+        start = time.perf_counter()
+        await pipeline.answer_question(rag_index, QUESTIONS[idx % len(QUESTIONS)])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    duration = len(waveform) / 16000
+    return {
+        "minutes": minutes,
+        "audio_seconds": round(duration, 1),
+        "speaker_segments": len(segments),
+        "chunks": len(result.transcript.chunks),
+        "vectors": len(rag_index.windows),
+        "total_seconds": round(total, 4),
+        "rtf": round(total / duration, 6),
+        "stages": {stage: round(stages[stage], 4) for stage in PIPELINE_STAGES if stage in stages},
+        "storage": {"save_seconds": round(save_seconds, 4), "load_seconds": round(load_seconds, 4)},
+        "qa": {
+            "questions": len(latencies),
+            "mean_ms": round(statistics.mean(latencies), 3) if latencies else None,
+            "p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+            "p95_ms": round(percentile(latencies, 0.95), 3) if latencies else None,
+        },
+    }
+
+
+def print_run(run: dict):
+    """Print one meeting's results as a table row block."""
+    stages = "  ".join(f"{stage}={seconds:.3f}s" for stage, seconds in run["stages"].items())
+    print(
+        f"{run['minutes']:>6g} min  {run['chunks']:>5} chunks  "
+        f"{run.get('vectors', '-'):>5} vectors  "
+        f"total {run['total_seconds']:8.3f}s  RTF {run['rtf']:.5f}"
+    )
+    print(f"           {stages}")
+    print(
+        f"           save {run['storage']['save_seconds']:.3f}s  "
+        f"load {run['storage']['load_seconds']:.3f}s  "
+        f"Q&A p50 {run['qa']['p50_ms']}ms p95 {run['qa']['p95_ms']}ms"
+    )
+
+
+def print_comparison(current: dict, baseline: dict):
+    """Print relative change against a baseline result file."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    previous = {run["minutes"]: run for run in baseline["runs"]}
+    for run in current["runs"]:
+        before = previous.get(run["minutes"])
+        if before is None:
+            continue
+        metrics = [("total", run["total_seconds"], before["total_seconds"])]
+        metrics += [
+            (stage, seconds, before["stages"][stage])
+            for stage, seconds in run["stages"].items()
+            if stage in before["stages"]
+        ]
+        metrics += [
+            ("save", run["storage"]["save_seconds"], before["storage"]["save_seconds"]),
+            ("load", run["storage"]["load_seconds"], before["storage"]["load_seconds"]),
+            ("qa_p95", run["qa"]["p95_ms"], before["qa"]["p95_ms"]),
+        ]
+        changes = "  ".join(
+            f"{name} {(now - then) / then:+.0%}"
+            for name, now, then in metrics
+            if now is not None and then
+        )
+        print(f"{run['minutes']:>6g} min  {changes}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark with stub models")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 30, 60])
+    parser.add_argument("--speakers", type=int, default=4)
+    parser.add_argument("--asr-mode", choices=["segment", "full"], default=None)
+    parser.add_argument("--streaming", action="store_true", help="Set PIPELINE_STREAMING")
+    parser.add_argument("--questions", type=int, default=20, help="Q&A calls per meeting")
+    parser.add_argument("--diarization-rtf", type=float, default=0.0, help="Simulated cost")
+    parser.add_argument("--asr-rtf", type=float, default=0.0, help="Simulated cost")
+    parser.add_argument("--embedding-ms", type=float, default=0.0, help="Per text embedded")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per LLM call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare with")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="meeting-bench-") as tmp:
+        workdir = Path(tmp)
+        # Keep benchmark meetings, checkpoints and cache entries out of the real data dirs
+        settings.storage_dir = workdir / "storage"
+        settings.upload_dir = workdir / "uploads"
+        settings.storage_dir.mkdir()
+        settings.upload_dir.mkdir()
+        settings.asr_cache_enabled = False
+        settings.asr_workers = 1
+        settings.asr_language_pinning = "off"
+        settings.pipeline_streaming = args.streaming
+
+        # Warm up so lazy imports and first-call overhead don't land on the first length
+        asyncio.run(run_meeting(1, args, workdir))
+
+        runs = []
+        for minutes in args.minutes:
+            run = asyncio.run(run_meeting(minutes, args, workdir))
+            print_run(run)
+            runs.append(run)
+
+    results = {
+        "benchmark": "pipeline_offline",
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {
+            "asr_mode": args.asr_mode or settings.asr_mode,
+            "pipeline_streaming": settings.pipeline_streaming,
+            "pipeline_checkpointing": settings.pipeline_checkpointing,
+            "diarization_mode": settings.diarization_mode,
+            "vad_enabled": settings.vad_enabled,
+            "asr_pack_segments": settings.asr_pack_segments,
+            "summary_hierarchical": settings.summary_hierarchical,
+            "speakers": args.speakers,
+            "seed": args.seed,
+            "stub_costs": {
+                "diarization_rtf": args.diarization_rtf,
+                "asr_rtf": args.asr_rtf,
+                "embedding_ms": args.embedding_ms,
+                "llm_latency": args.llm_latency,
+            },
+        },
+        "runs": runs,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nWrote results to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        print_comparison(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Concurrent Q&A load benchmark.
+Processes a synthetic meeting with stub models, then sends bursts of
+concurrent questions (a mix of repeats and near-duplicates, as frontend
+users ask) through MeetingPipeline.answer_question and reports throughput
+and latency percentiles with the query-embedding cache and micro-batching
+off and on. Needs no models.
+
+Usage:
+    python benchmarks/qa_load.py
+    python benchmarks/qa_load.py --requests 2000 --concurrency 64 --embedding-call-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings require a Hugging Face token, which the stub models never use
+os.environ.setdefault("HUGGINGFACE_TOKEN", "offline-benchmark")
+
+from app.config import settings
+from app.services.pipeline import get_pipeline
+from benchmarks.pipeline_offline import QUESTIONS, percentile
+from benchmarks.stubs import StubCosts, install_stubs
+from benchmarks.synthetic import make_meeting, write_wav
+
+# (query_cache_size, query_batch_max_size) per configuration
+CONFIGS = {
+    "baseline": (0, 1),
+    "cache": (1024, 1),
+    "batch": (0, 32),
+    "cache+batch": (1024, 32),
+}
+
+
+def make_questions(count: int, distinct: int, seed: int) -> list[str]:
+    """Questions drawn from `distinct` variants, some differing only in spacing or width."""
+    rng = np.random.default_rng(seed)
+    variants = []
+    for idx in range(distinct):
+        question = f"{QUESTIONS[idx % len(QUESTIONS)]} (item {idx})"
+        if idx % 3 == 1:
+            question = "  " + question.replace(" ", "  ")
+        elif idx % 3 == 2:
+            question = question.replace("?", "？")
+        variants.append(question)
+    # Popular questions are asked far more often (Zipf-like)
+    weights = 1 / np.arange(1, distinct + 1)
+    picks = rng.choice(distinct, size=count, p=weights / weights.sum())
+    return [variants[idx] for idx in picks]
+
+
+async def run_load(rag_index, questions: list[str], concurrency: int) -> dict:
+    """Answer all questions with `concurrency` clients; returns throughput and latencies."""
+    pipeline = get_pipeline()
+    queue = list(reversed(questions))
+    latencies: list[float] = []
+
+    async def client():
+        while queue:
+            question = queue.pop()
+            start = time.perf_counter()
+            await pipeline.answer_question(rag_index, question)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_second": round(len(questions) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+
+
+async def run_config(name: str, args: argparse.Namespace, workdir: Path) -> dict:
+    """Process the meeting and run the load with one cache/batching configuration."""
+    cache_size, batch_size = CONFIGS[name]
+    settings.query_cache_size = cache_size
+    settings.query_batch_max_size = batch_size
+    settings.query_batch_wait_ms = args.batch_wait_ms
+
+    waveform, segments = make_meeting(args.minutes * 60, seed=args.seed)
+    audio_path = workdir / "meeting.wav"
+    write_wav(audio_path, waveform)
+    install_stubs(
+        segments,
+        StubCosts(embedding_ms=args.embedding_ms, embedding_call_ms=args.embedding_call_ms),
+    )
+    pipeline = get_pipeline()
+    _, rag_index = await pipeline.process_meeting_audio(audio_path)
+
+    questions = make_questions(args.requests, args.distinct, args.seed)
+    result = await run_load(rag_index, questions, args.concurrency)
+    result["config"] = name
+    return result
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Concurrent Q&A load benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=200, help="Distinct questions asked")
+    parser.add_argument("--minutes", type=float, default=30, help="Synthetic meeting length")
+    parser.add_argument("--embedding-call-ms", type=float, default=10.0, help="Cost per call")
+    parser.add_argument("--embedding-ms", type=float, default=1.0, help="Cost per question")
+    parser.add_argument("--batch-wait-ms", type=float, default=settings.query_batch_wait_ms)
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="qa-load-") as tmp:
+        workdir = Path(tmp)
+        # Keep benchmark meetings and cache entries out of the real data dirs
+        settings.storage_dir = workdir / "storage"
+        settings.upload_dir = workdir / "uploads"
+        settings.storage_dir.mkdir()
+        settings.upload_dir.mkdir()
+        settings.asr_cache_enabled = False
+        settings.asr_workers = 1
+
+        runs = []
+        for name in args.configs:
+            run = asyncio.run(run_config(name, args, workdir))
+            print(
+                f"{name:>12}  {run['requests_per_second']:>8.1f} req/s  "
+                f"p50 {run['p50_ms']:>8.2f}ms  p99 {run['p99_ms']:>8.2f}ms"
+            )
+            runs.append(run)
+
+    if args.output:
+        options = {key: value for key, value in vars(args).items() if key != "output"}
+        results = {"benchmark": "qa_load", "options": options, "runs": runs}
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the cross-meeting search index.
+Fills a GlobalSearchIndex with synthetic meetings (clustered random
+embeddings, as topic-structured transcripts produce) and measures build
+time, query latency and recall against exact search. Needs no models.
+
+Usage:
+    python benchmarks/search_global.py
+    python benchmarks/search_global.py --chunks 100000 200000 --ef-search 32 64 128
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings require a Hugging Face token, which this benchmark never uses
+os.environ.setdefault("HUGGINGFACE_TOKEN", "offline-benchmark")
+
+from app.config import settings
+from app.models.schemas import TranscriptChunk
+from app.services.search import GlobalSearchIndex
+
+DIMENSION = 384
+
+
+def make_corpus(num_chunks: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clustered unit vectors and held-out queries near the same clusters.
+
+    Returns:
+        Tuple of (chunk embeddings, query embeddings)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(16, num_chunks // 200), DIMENSION)).astype(np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        vectors = centers[rng.integers(len(centers), size=count)]
+        vectors = vectors + 0.6 * rng.standard_normal((count, DIMENSION)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    return sample(num_chunks), sample(200)
+
+
+def fill_index(
+    search_index: GlobalSearchIndex, embeddings: np.ndarray, chunks_per_meeting: int
+) -> float:
+    """Add the corpus meeting by meeting; returns seconds taken."""
+    start = time.perf_counter()
+    for meeting, offset in enumerate(range(0, len(embeddings), chunks_per_meeting)):
+        vectors = embeddings[offset : offset + chunks_per_meeting]
+        chunks = [
+            TranscriptChunk(
+                chunk_id=f"chunk_{idx:04d}",
+                speaker_label="SPEAKER_00",
+                start_time=idx * 10.0,
+                end_time=idx * 10.0 + 9.0,
+                text="",
+            )
+            for idx in range(len(vectors))
+        ]
+        search_index.add_meeting(f"meeting_{meeting:012x}", chunks, vectors, persist=False)
+    return time.perf_counter() - start
+
+
+def measure(search_index: GlobalSearchIndex, queries: np.ndarray, top_k: int) -> dict:
+    """Query latency percentiles in milliseconds, and the results for recall."""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = search_index.search(query, top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({(hit.meeting_id, hit.chunk.chunk_id) for hit in hits})
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 3),
+        "results": results,
+    }
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Global search index benchmark")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--chunks-per-meeting", type=int, default=300)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    args = parser.parse_args()
+
+    runs = []
+    for num_chunks in args.chunks:
+        embeddings, queries = make_corpus(num_chunks)
+        with tempfile.TemporaryDirectory(prefix="search-bench-") as tmp:
+            # Exact baseline
+            settings.search_hnsw_threshold = num_chunks + 1
+            exact = GlobalSearchIndex(Path(tmp) / "flat", Path(tmp))
+            fill_index(exact, embeddings, args.chunks_per_meeting)
+            baseline = measure(exact, queries, args.top_k)
+            del exact
+
+            settings.search_hnsw_threshold = 1
+            hnsw = GlobalSearchIndex(Path(tmp) / "hnsw", Path(tmp))
+            build_seconds = fill_index(hnsw, embeddings, args.chunks_per_meeting)
+
+            run = {
+                "chunks": num_chunks,
+                "flat": {key: baseline[key] for key in ("p50_ms", "p95_ms")},
+                "hnsw_build_seconds": round(build_seconds, 2),
+                "hnsw": [],
+            }
+            for ef_search in args.ef_search:
+                settings.search_hnsw_ef_search = ef_search
+                hnsw.index.hnsw.efSearch = ef_search
+                result = measure(hnsw, queries, args.top_k)
+                recall = statistics.mean(
+                    len(found & truth) / len(truth)
+                    for found, truth in zip(result["results"], baseline["results"])
+                )
+                run["hnsw"].append(
+                    {
+                        "ef_search": ef_search,
+                        "p50_ms": result["p50_ms"],
+                        "p95_ms": result["p95_ms"],
+                        f"recall_at_{args.top_k}": round(recall, 4),
+                    }
+                )
+            del hnsw
+        runs.append(run)
+
+        print(
+            f"{num_chunks:>8} chunks  flat p50 {run['flat']['p50_ms']:.2f}ms "
+            f"p95 {run['flat']['p95_ms']:.2f}ms  HNSW build {run['hnsw_build_seconds']:.1f}s"
+        )
+        for entry in run["hnsw"]:
+            print(
+                f"          efSearch {entry['ef_search']:>4}  p50 {entry['p50_ms']:.2f}ms  "
+                f"p95 {entry['p95_ms']:.2f}ms  recall@{args.top_k} "
+                f"{entry[f'recall_at_{args.top_k}']:.3f}"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps({"benchmark": "search_global", "runs": runs}, indent=2))
+        print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
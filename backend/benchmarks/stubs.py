@@ -0,0 +1,216 @@
+"""
+Deterministic stand-ins for the model-backed services.
+They replace pyannote, Whisper, the sentence-transformer and the LLM
+provider behind the existing `get_*()` factories, so the real pipeline,
+batching, indexing and storage code runs on a CPU box without model
+downloads or network access. Model cost can be simulated per second of
+audio or per call.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.config import settings
+from app.models.schemas import MeetingTranscript, SpeakerSegment, SummaryResponse
+from app.services import asr, diarization, llm, pipeline, query_encoder, rag
+from app.services.asr import ASRService
+from app.services.audio import DecodedAudio
+from app.services.diarization import DiarizationService
+from app.services.rag import RAGService
+
+# Words the stub ASR "hears": English and Cantonese, for language detection
+ENGLISH_WORDS = (
+    "budget timeline launch review customer feature design release team plan "
+    "deadline risk metric quarter report action decision follow meeting update"
+).split()
+CANTONESE_WORDS = list("我哋今日要討論預算時間表發佈客戶功能設計團隊計劃風險報告跟進會議決定")
+
+EMBEDDING_DIMENSION = 384
+
+
+@dataclass
+class StubCosts:
+    """Simulated model cost; zero measures pipeline overhead only."""
+
+    diarization_rtf: float = 0.0
+    asr_rtf: float = 0.0
+    embedding_ms: float = 0.0
+    # Fixed cost of one embedding call (tokenization, dispatch), whatever its batch size
+    embedding_call_ms: float = 0.0
+    llm_latency: float = 0.0
+
+
+def _stub_text(seconds: float, seed: int) -> list[str]:
+    """Deterministic words for `seconds` of speech (about 2.5 words per second)."""
+    rng = np.random.default_rng(seed)
+    count = max(1, int(seconds * 2.5))
+    if rng.random() < 0.5:
+        return [" " + ENGLISH_WORDS[idx] for idx in rng.integers(len(ENGLISH_WORDS), size=count)]
+    return [CANTONESE_WORDS[idx] for idx in rng.integers(len(CANTONESE_WORDS), size=count)]
+
+
+def _clip_seed(samples: np.ndarray) -> int:
+    """Seed derived from a clip's content, so the same audio gives the same text."""
+    return int.from_bytes(hashlib.blake2b(samples[:4096].tobytes(), digest_size=4).digest(), "big")
+
+
+class StubWhisperPipeline:
+    """Callable with the interface of the transformers ASR pipeline."""
+
+    def __init__(self, costs: StubCosts):
+        self.costs = costs
+
+    def __call__(self, inputs, return_timestamps=False, return_language=False, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        outputs = [self._transcribe(item, return_timestamps, return_language) for item in batch]
+        return outputs if isinstance(inputs, list) else outputs[0]
+
+    def _transcribe(self, item: dict, return_timestamps, return_language) -> dict:
+        samples = item["raw"]
+        seconds = len(samples) / item["sampling_rate"]
+        time.sleep(seconds * self.costs.asr_rtf)
+
+        words = _stub_text(seconds, _clip_seed(samples))
+        output = {"text": "".join(words)}
+        language = {"language": "english" if words[0].startswith(" ") else "cantonese"}
+        if return_timestamps:
+            step = seconds / len(words)
+            output["chunks"] = [
+                {"text": word, "timestamp": (idx * step, (idx + 1) * step)}
+                | (language if return_language else {})
+                for idx, word in enumerate(words)
+            ]
+        elif return_language:
+            output["chunks"] = [{"text": output["text"]} | language]
+        return output
+
+
+class StubASRService(ASRService):
+    """ASR service whose Whisper pipeline is a stub."""
+
+    def __init__(self, costs: StubCosts):
+        super().__init__()
+        self.pipe = StubWhisperPipeline(costs)
+        self._initialized = True
+
+
+class StubDiarizationService(DiarizationService):
+    """Diarization service that returns the synthetic meeting's true speaker turns."""
+
+    def __init__(self, segments: list[SpeakerSegment], costs: StubCosts):
+        super().__init__()
+        self.segments = segments
+        self.costs = costs
+        self._initialized = True
+
+    def run_diarization(self, audio: DecodedAudio) -> list[SpeakerSegment]:
+        time.sleep(audio.duration * self.costs.diarization_rtf)
+        return [segment.model_copy() for segment in self.segments]
+
+    def iter_diarization(
+        self, audio: DecodedAudio, window: float | None = None, overlap: float | None = None
+    ) -> Iterator[SpeakerSegment]:
+        window = window or settings.diarization_window
+        window_start = 0.0
+        while window_start < audio.duration:
+            window_end = window_start + window
+            time.sleep(min(window, audio.duration - window_start) * self.costs.diarization_rtf)
+            for segment in self.segments:
+                if window_start <= segment.start_time < window_end:
+                    yield segment.model_copy()
+            window_start = window_end
+
+
+class HashingEncoder:
+    """Sentence-transformer stand-in: hashed bag of words, L2-normalized."""
+
+    def __init__(self, costs: StubCosts, dimension: int = EMBEDDING_DIMENSION):
+        self.costs = costs
+        self.dimension = dimension
+        # One model on one device: concurrent calls run one at a time
+        self._device = threading.Lock()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts: list[str], **kwargs) -> np.ndarray:
+        with self._device:
+            time.sleep((self.costs.embedding_call_ms + len(texts) * self.costs.embedding_ms) / 1000)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # Whitespace words plus single CJK characters
+            for token in text.split() + [char for char in text if ord(char) > 0x2E80]:
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                vectors[row, int.from_bytes(digest, "big") % self.dimension] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class StubRAGService(RAGService):
+    """RAG service with the hashing encoder in place of the embedding model."""
+
+    def __init__(self, costs: StubCosts):
+        super().__init__()
+        self.embedding_model = HashingEncoder(costs)
+        self._initialized = True
+
+
+class StubLLMClient:
+    """LLM client that answers instantly (or after a fixed latency) without a provider."""
+
+    def __init__(self, costs: StubCosts):
+        self.costs = costs
+
+    async def summarize_meeting(self, transcript: MeetingTranscript) -> SummaryResponse:
+        await asyncio.sleep(self.costs.llm_latency)
+        return self._summary(transcript.get_full_text())
+
+    async def answer_question(self, transcript_context: str, question: str) -> str:
+        await asyncio.sleep(self.costs.llm_latency)
+        first_line = transcript_context.split("\n", 1)[0]
+        return f"Based on the transcript: {first_line[:200]}"
+
+    async def summarize_section(self, text: str, label: str) -> str:
+        await asyncio.sleep(self.costs.llm_latency)
+        lines = text.splitlines()
+        return "\n".join(f"- {line[:120]}" for line in lines[:: max(1, len(lines) // 10)])
+
+    async def merge_summaries(
+        self, notes: str, speaker_info: dict[str, int], duration: float
+    ) -> SummaryResponse:
+        await asyncio.sleep(self.costs.llm_latency)
+        return self._summary(notes)
+
+    @staticmethod
+    def _summary(text: str) -> SummaryResponse:
+        lines = [line for line in text.splitlines() if line.strip()]
+        return SummaryResponse(
+            summary=" ".join(lines[:3])[:500] or "Empty meeting.",
+            action_items=lines[3:6],
+            key_decisions=lines[6:8],
+            topics=lines[8:10],
+        )
+
+
+def install_stubs(segments: list[SpeakerSegment], costs: StubCosts):
+    """
+    Install stub services behind the `get_*()` factories.
+
+    Also resets the global pipeline so its next initialization picks them up.
+
+    Args:
+        segments: Ground-truth speaker turns the stub diarization returns
+        costs: Simulated model cost
+    """
+    diarization._diarization_service = StubDiarizationService(segments, costs)
+    asr._asr_service = StubASRService(costs)
+    rag._rag_service = StubRAGService(costs)
+    query_encoder._query_encoder = None
+    llm._llm_client = StubLLMClient(costs)
+    pipeline._pipeline = None
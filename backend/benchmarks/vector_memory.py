@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark for compressed vector storage.
+Builds per-meeting RAG indexes and the global HNSW search index with each
+RAG_INDEX_TYPE over synthetic clustered embeddings, and reports resident
+index memory per 10k chunks and recall@k against exact search, with and
+without exact re-ranking. Needs no models.
+
+Usage:
+    python benchmarks/vector_memory.py
+    python benchmarks/vector_memory.py --chunks 5000 --global-chunks 0 --rerank-factor 2 4 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings require a Hugging Face token, which this benchmark never uses
+os.environ.setdefault("HUGGINGFACE_TOKEN", "offline-benchmark")
+
+from app.config import settings
+from app.models.schemas import TranscriptChunk
+from app.services.rag import RagIndex, create_index
+from app.services.search import GlobalSearchIndex
+from benchmarks.search_global import fill_index, make_corpus
+
+INDEX_TYPES = ["flat", "fp16", "sq8", "pq"]
+
+
+def index_bytes(index) -> int:
+    """Serialized size of a FAISS index, which is what it keeps in memory."""
+    import faiss
+
+    return faiss.serialize_index(index).nbytes
+
+
+def per_10k(num_bytes: int, num_chunks: int) -> float:
+    """Megabytes per 10k chunks."""
+    return round(num_bytes / num_chunks * 10000 / 1e6, 2)
+
+
+def recall(found: list[set], truth: list[set]) -> float:
+    """Mean fraction of the exact top-k found."""
+    return round(statistics.mean(len(f & t) / len(t) for f, t in zip(found, truth)), 4)
+
+
+def bench_meeting(
+    embeddings: np.ndarray, queries: np.ndarray, top_k: int, factors: list[int]
+) -> list[dict]:
+    """One RagIndex over the whole corpus per index type."""
+    chunks = [
+        TranscriptChunk(
+            chunk_id=f"chunk_{idx:06d}",
+            speaker_label="SPEAKER_00",
+            start_time=float(idx),
+            end_time=idx + 1.0,
+            text="",
+        )
+        for idx in range(len(embeddings))
+    ]
+    truth = None
+    rows = []
+    for index_type in INDEX_TYPES:
+        start = time.perf_counter()
+        index, used_type = create_index(index_type, embeddings)
+        build_seconds = time.perf_counter() - start
+        rag_index = RagIndex(chunks, embeddings, index, used_type)
+
+        row = {
+            "index_type": used_type,
+            "build_seconds": round(build_seconds, 2),
+            "mb_per_10k": per_10k(index_bytes(index), len(embeddings)),
+            "recall": {},
+        }
+        for factor in [1] + [f for f in factors if f > 1 and index_type != "flat"]:
+            settings.rag_rerank_factor = factor
+            found = [
+                {chunk.chunk_id for chunk in rag_index.query(query, top_k)} for query in queries
+            ]
+            if truth is None:
+                truth = found
+            row["recall"][f"rerank_{factor}"] = recall(found, truth)
+        rows.append(row)
+    return rows
+
+
+def bench_global(
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    top_k: int,
+    factors: list[int],
+    chunks_per_meeting: int,
+) -> list[dict]:
+    """The global HNSW index per storage type, re-ranking from saved embeddings."""
+    rows = []
+    truth = None
+    with tempfile.TemporaryDirectory(prefix="vector-bench-") as tmp:
+        storage_dir = Path(tmp)
+        # Saved meeting embeddings, as written by RagIndex.save, for exact re-ranking
+        for meeting, offset in enumerate(range(0, len(embeddings), chunks_per_meeting)):
+            index_dir = storage_dir / f"meeting_{meeting:012x}" / "rag_index"
+            index_dir.mkdir(parents=True)
+            np.save(index_dir / "embeddings.npy", embeddings[offset : offset + chunks_per_meeting])
+
+        # Exact baseline
+        settings.search_hnsw_threshold = len(embeddings) + 1
+        exact = GlobalSearchIndex(storage_dir / "flat", storage_dir)
+        fill_index(exact, embeddings, chunks_per_meeting)
+        truth = [
+            {(hit.meeting_id, hit.chunk.chunk_id) for hit in exact.search(query, top_k)}
+            for query in queries
+        ]
+        del exact
+
+        # Build HNSW in one pass once the last meeting crosses the threshold
+        settings.search_hnsw_threshold = len(embeddings)
+        for index_type in INDEX_TYPES:
+            settings.rag_index_type = index_type
+            search_index = GlobalSearchIndex(storage_dir / index_type, storage_dir)
+            build_seconds = fill_index(search_index, embeddings, chunks_per_meeting)
+
+            row = {
+                "index_type": search_index.storage,
+                "build_seconds": round(build_seconds, 2),
+                "mb_per_10k": per_10k(index_bytes(search_index.index), len(embeddings)),
+                "recall": {},
+            }
+            for factor in [1] + [f for f in factors if f > 1 and index_type != "flat"]:
+                settings.rag_rerank_factor = factor
+                found = [
+                    {(hit.meeting_id, hit.chunk.chunk_id) for hit in search_index.search(q, top_k)}
+                    for q in queries
+                ]
+                row["recall"][f"rerank_{factor}"] = recall(found, truth)
+            rows.append(row)
+            del search_index
+    return rows
+
+
+def print_rows(title: str, rows: list[dict], top_k: int):
+    """Print one table of results."""
+    print(f"\n{title}")
+    for row in rows:
+        recalls = "  ".join(
+            f"{name.replace('rerank_', 'x')} {value:.3f}" for name, value in row["recall"].items()
+        )
+        print(
+            f"  {row['index_type']:>5}  {row['mb_per_10k']:>6.2f} MB/10k  "
+            f"build {row['build_seconds']:>6.2f}s  recall@{top_k} {recalls}"
+        )
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Compressed vector storage benchmark")
+    parser.add_argument("--chunks", type=int, default=10000, help="Chunks in the meeting index")
+    parser.add_argument(
+        "--global-chunks", type=int, default=20000, help="Chunks in the global index (0 skips)"
+    )
+    parser.add_argument("--chunks-per-meeting", type=int, default=300)
+    parser.add_argument(
+        "--rerank-factor", type=int, nargs="+", default=[settings.rag_rerank_factor]
+    )
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    args = parser.parse_args()
+
+    embeddings, queries = make_corpus(args.chunks)
+    results = {
+        "benchmark": "vector_memory",
+        "pq_bytes": settings.rag_pq_bytes,
+        "meeting": bench_meeting(embeddings, queries, args.top_k, args.rerank_factor),
+    }
+    print_rows(f"Meeting index, {args.chunks} chunks", results["meeting"], args.top_k)
+
+    if args.global_chunks:
+        embeddings, queries = make_corpus(args.global_chunks, seed=1)
+        results["global"] = bench_global(
+            embeddings, queries, args.top_k, args.rerank_factor, args.chunks_per_meeting
+        )
+        print_rows(
+            f"Global HNSW index, {args.global_chunks} chunks", results["global"], args.top_k
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Upgrade saved meetings' RAG indexes to the current on-disk format.
+Legacy indexes are also upgraded on first load, but that re-encodes every
+chunk during a Q&A request; run this once after upgrading to pay that cost
+up front.
+
+Usage:
+    python scripts/migrate_rag_indexes.py
+    python scripts/migrate_rag_indexes.py --dry-run
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.rag import RagIndex, get_rag_service
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def find_legacy_indexes(storage_dir: Path) -> list[Path]:
+    """Index directories of saved meetings that have no meta.json yet."""
+    return sorted(
+        index_dir
+        for index_dir in storage_dir.glob("*/rag_index")
+        if (index_dir / "faiss.index").exists() and not (index_dir / "meta.json").exists()
+    )
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Upgrade saved RAG indexes to the current format")
+    parser.add_argument(
+        "--storage-dir", type=Path, default=settings.storage_dir, help="Meeting storage directory"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="List indexes without upgrading")
+    args = parser.parse_args()
+
+    legacy = find_legacy_indexes(args.storage_dir)
+    print(f"Found {len(legacy)} legacy RAG indexes in {args.storage_dir}")
+    if args.dry_run or not legacy:
+        for index_dir in legacy:
+            print(f"  {index_dir.parent.name}")
+        return
+
+    embedding_model = get_rag_service().embedding_model
+    failed = 0
+    for index_dir in legacy:
+        try:
+            RagIndex.load(index_dir, embedding_model)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Failed to migrate {index_dir}: {e}")
+            continue
+        if (index_dir / "meta.json").exists():
+            print(f"✅ {index_dir.parent.name}")
+        else:
+            failed += 1
+            print(f"❌ {index_dir.parent.name} (could not write the upgraded files)")
+
+    print(f"\nUpgraded {len(legacy) - failed} of {len(legacy)} indexes")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
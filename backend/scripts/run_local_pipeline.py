@@ -7,6 +7,7 @@ Usage:
     python scripts/run_local_pipeline.py path/to/audio.wav
     python scripts/run_local_pipeline.py path/to/audio.wav --meeting-id my-meeting
     python scripts/run_local_pipeline.py path/to/audio.wav --no-summary
+    python scripts/run_local_pipeline.py path/to/audio.wav --asr-mode full
 """
 
 import argparse
@@ -36,6 +37,7 @@ async def process_local_audio(
     meeting_id: str | None = None,
     save_results: bool = True,
     test_qa: bool = False,
+    asr_mode: str | None = None,
 ):
     """
     Process an audio file through the meeting pipeline.
@@ -45,6 +47,7 @@ async def process_local_audio(
         meeting_id: Optional meeting ID
         save_results: Whether to save results to disk
         test_qa: Whether to run test Q&A
+        asr_mode: Optional ASR strategy ("segment" or "full")
     """
     if not audio_path.exists():
         logger.error(f"Audio file not found: {audio_path}")
@@ -59,7 +62,9 @@ async def process_local_audio(
         pipeline = get_pipeline()
 
         # Process meeting
-        result, rag_index = await pipeline.process_meeting_audio(audio_path, meeting_id)
+        result, rag_index = await pipeline.process_meeting_audio(
+            audio_path, meeting_id, asr_mode=asr_mode
+        )
 
         logger.info("\n" + "=" * 80)
         logger.info("PROCESSING COMPLETE")
@@ -162,6 +167,9 @@ Examples:
 
   # Process and test Q&A
   python scripts/run_local_pipeline.py audio.wav --test-qa
+
+  # Transcribe the whole recording in one pass, then align to speakers
+  python scripts/run_local_pipeline.py audio.wav --asr-mode full
         """,
     )
 
@@ -186,6 +194,13 @@ Examples:
         help="Run test questions after processing",
     )
 
+    parser.add_argument(
+        "--asr-mode",
+        choices=["segment", "full"],
+        default=None,
+        help="ASR strategy: per speaker segment or single full-audio pass (default: settings)",
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -206,6 +221,7 @@ Examples:
             meeting_id=args.meeting_id,
             save_results=not args.no_save,
             test_qa=args.test_qa,
+            asr_mode=args.asr_mode,
         )
     )
 
@@ -0,0 +1,6 @@
+"""Shared test setup."""
+
+import os
+
+# Settings require a Hugging Face token, which no test uses
+os.environ.setdefault("HUGGINGFACE_TOKEN", "test")
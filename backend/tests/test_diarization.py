@@ -0,0 +1,42 @@
+"""Tests for stitching speakers across diarization windows."""
+
+import numpy as np
+
+from app.services.diarization import SpeakerRegistry
+
+
+def test_matches_speakers_across_windows():
+    registry = SpeakerRegistry(threshold=0.7)
+
+    assert registry.assign(np.array([[1.0, 0.0], [0.0, 1.0]]), 2) == [0, 1]
+    assert registry.assign(np.array([[0.1, 1.0], [1.0, 0.1]]), 2) == [1, 0]
+    assert registry.assign(np.array([[0.7, -0.7]]), 1) == [2]
+
+
+def test_speaker_without_embedding_takes_overlapping_label():
+    registry = SpeakerRegistry(threshold=0.7)
+    registry.assign(np.array([[1.0, 0.0], [0.0, 1.0]]), 2)
+
+    embeddings = np.array([[1.0, 0.0], [np.nan, np.nan]])
+    shared = [{0: 4.0}, {0: 0.5, 1: 3.0}]
+    assert registry.assign(embeddings, 2, shared) == [0, 1]
+    assert len(registry.centroids) == 2
+
+
+def test_speaker_without_embedding_never_becomes_new_speaker():
+    registry = SpeakerRegistry(threshold=0.7)
+    registry.assign(np.array([[1.0, 0.0], [0.0, 1.0]]), 2)
+    registry.assign(np.array([[0.0, 1.0]]), 1)
+
+    # No overlap evidence: fall back to the best-established speaker
+    assert registry.assign(np.array([[np.nan, np.nan], [0.0, 0.0]]), 2) == [1, 1]
+    # Fewer embedding rows than speakers
+    assert registry.assign(np.empty((0, 2)), 1) == [1]
+    assert len(registry.centroids) == 2
+
+
+def test_first_window_without_embeddings_shares_one_label():
+    registry = SpeakerRegistry(threshold=0.7)
+
+    assert registry.assign(np.full((2, 2), np.nan), 2) == [0, 0]
+    assert registry.assign(np.array([[1.0, 0.0]]), 1) == [1]
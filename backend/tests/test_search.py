@@ -0,0 +1,68 @@
+"""Tests for the cross-meeting search index."""
+
+import shutil
+
+import numpy as np
+
+from app.models.schemas import TranscriptChunk
+from app.services.search import GlobalSearchIndex
+
+
+def _chunks(count: int) -> list[TranscriptChunk]:
+    return [
+        TranscriptChunk(
+            chunk_id=f"chunk_{idx:04d}",
+            speaker_label="SPEAKER_00",
+            start_time=float(idx),
+            end_time=idx + 1.0,
+            text=f"chunk {idx}",
+        )
+        for idx in range(count)
+    ]
+
+
+def _save_meeting_dir(storage_dir, meeting_id):
+    # sync() treats a meeting as saved when its RAG index metadata exists
+    index_dir = storage_dir / meeting_id / "rag_index"
+    index_dir.mkdir(parents=True)
+    (index_dir / "meta.json").write_text("{}")
+
+
+def test_removing_last_meeting_empties_index(tmp_path):
+    index = GlobalSearchIndex(tmp_path / "_search", tmp_path)
+    rng = np.random.default_rng(0)
+    index.add_meeting("meeting_a", _chunks(3), rng.random((3, 8), dtype=np.float32))
+    index.add_meeting("meeting_b", _chunks(2), rng.random((2, 8), dtype=np.float32))
+
+    index.remove_meeting("meeting_a")
+    index.remove_meeting("meeting_b")
+
+    assert index.num_chunks == 0
+    assert index.index.ntotal == 0
+    assert index.search(np.zeros(8, dtype=np.float32)) == []
+
+    # The emptied index is saved, so it loads empty rather than stale
+    loaded = GlobalSearchIndex.load(tmp_path / "_search", tmp_path)
+    assert loaded.num_chunks == 0
+    assert not loaded.has_meeting("meeting_a")
+
+    index.add_meeting("meeting_c", _chunks(2), rng.random((2, 8), dtype=np.float32))
+    assert [result.meeting_id for result in index.search(np.zeros(8), top_k=5)] == [
+        "meeting_c",
+        "meeting_c",
+    ]
+
+
+def test_sync_with_every_meeting_deleted_empties_index(tmp_path):
+    rng = np.random.default_rng(0)
+    index = GlobalSearchIndex(tmp_path / "_search", tmp_path)
+    for meeting_id in ("meeting_a", "meeting_b"):
+        _save_meeting_dir(tmp_path, meeting_id)
+        index.add_meeting(meeting_id, _chunks(4), rng.random((4, 8), dtype=np.float32))
+
+    for meeting_id in ("meeting_a", "meeting_b"):
+        shutil.rmtree(tmp_path / meeting_id)
+    index.sync()
+
+    assert index.num_chunks == 0
+    assert GlobalSearchIndex.load(tmp_path / "_search", tmp_path).num_chunks == 0
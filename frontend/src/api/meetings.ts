@@ -3,10 +3,16 @@
  */
 
 import apiClient from './client';
-import type { UploadResponse, QARequest, QAResponse, MeetingResult } from '../types/meeting';
+import type {
+  UploadResponse,
+  QARequest,
+  QAResponse,
+  MeetingResult,
+  JobInfo,
+} from '../types/meeting';
 
 /**
- * Upload a meeting audio file for processing
+ * Upload a meeting audio file and queue it for processing
  */
 export async function uploadMeeting(file: File): Promise<UploadResponse> {
   const formData = new FormData();
@@ -21,6 +27,37 @@ export async function uploadMeeting(file: File): Promise<UploadResponse> {
   return response.data;
 }
 
+/**
+ * Get the status of a processing job
+ */
+export async function getJob(jobId: string): Promise<JobInfo> {
+  const response = await apiClient.get<JobInfo>(`/jobs/${jobId}`);
+  return response.data;
+}
+
+/**
+ * Poll a processing job until it completes or fails
+ */
+export async function waitForJob(
+  jobId: string,
+  onProgress?: (job: JobInfo) => void,
+  intervalMs: number = 2000
+): Promise<JobInfo> {
+  for (;;) {
+    const job = await getJob(jobId);
+    onProgress?.(job);
+
+    if (job.status === 'completed') {
+      return job;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Failed to process meeting');
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 /**
  * Ask a question about a specific meeting
  */
@@ -3,28 +3,52 @@ import { useNavigate } from 'react-router-dom';
 import Layout from '../components/Layout';
 import FileUpload from '../components/FileUpload';
 import MeetingList from '../components/MeetingList';
-import { uploadMeeting } from '../api/meetings';
+import { uploadMeeting, waitForJob } from '../api/meetings';
+import type { JobInfo } from '../types/meeting';
 
 interface Meeting {
   id: string;
   timestamp: Date;
 }
 
+const STAGE_LABELS: Record<string, string> = {
+  diarization: 'Identifying speakers',
+  transcription: 'Transcribing',
+  transcript: 'Building transcript',
+  indexing: 'Indexing for Q&A',
+  summary: 'Generating summary',
+};
+
+function runningStage(job: JobInfo): string {
+  const running = job.stages.filter((stage) => stage.status === 'running');
+  if (running.length === 0) {
+    return 'Processing';
+  }
+  return running.map((stage) => STAGE_LABELS[stage.name] ?? stage.name).join(' & ');
+}
+
 export default function Home() {
   const [meetings, setMeetings] = useState<Meeting[]>([]);
   const [isUploading, setIsUploading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [job, setJob] = useState<JobInfo | null>(null);
   const navigate = useNavigate();
 
   const handleUpload = async (file: File) => {
     setIsUploading(true);
     setError(null);
+    setJob(null);
 
     try {
       console.log('Uploading file:', file.name);
       const result = await uploadMeeting(file);
       
-      console.log('Upload successful:', result);
+      console.log('Upload queued:', result);
+
+      // Processing runs in the background; poll until the meeting is ready
+      if (result.job_id) {
+        await waitForJob(result.job_id, setJob);
+      }
 
       // Add to meetings list
       const newMeeting: Meeting = {
@@ -124,7 +148,11 @@ export default function Home() {
               <div>
                 <p className="font-semibold text-white text-lg">Processing your meeting...</p>
                 <p className="text-gray-300 mt-1">
-                  This may take several minutes. Please don't close this page.
+                  {job?.status === 'queued'
+                    ? 'Waiting in the processing queue...'
+                    : job?.status === 'running'
+                      ? `${runningStage(job)} (${Math.round(job.progress * 100)}% complete)`
+                      : "This may take several minutes. Please don't close this page."}
                 </p>
               </div>
             </div>
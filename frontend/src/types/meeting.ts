@@ -9,6 +9,7 @@ export interface TranscriptSegment {
   end_time: number;
   text: string;
   language?: string | null;
+  language_probability?: number | null;
   confidence?: number;
 }
 
@@ -37,10 +38,33 @@ export interface MeetingResult {
 export interface UploadResponse {
   meeting_id: string;
   message: string;
+  job_id?: string | null;
   transcript_preview?: string;
   summary?: SummaryResponse;
 }
 
+export type JobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface JobStage {
+  name: string;
+  status: 'pending' | 'running' | 'completed';
+  started_at?: string | null;
+  completed_at?: string | null;
+}
+
+export interface JobInfo {
+  job_id: string;
+  meeting_id: string;
+  filename: string;
+  status: JobStatus;
+  stages: JobStage[];
+  progress: number;
+  error?: string | null;
+  created_at: string;
+  started_at?: string | null;
+  completed_at?: string | null;
+}
+
 export interface QARequest {
   question: string;
   top_k?: number;